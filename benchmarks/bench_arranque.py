@@ -0,0 +1,57 @@
+"""Mide cuánto cuesta importar lo necesario para mostrar el menú, usando python -X importtime.
+
+Compara el arranque actual (solo main.py, que carga cada ventana al usarla) con importar de entrada
+los módulos de todas las ventanas, que era lo que hacía main.py antes. Cada caso corre en un proceso
+nuevo varias veces y se informa la mediana del tiempo de import y los módulos más costosos.
+
+Uso: python benchmarks/bench_arranque.py --repeticiones 5 --top 10
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+carpeta_src = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../src')
+
+CASOS = {
+    "menu": "import main",
+    "todas las ventanas": "import main, registroDocente, materias, horarios, asistencia, reporte_mensual",
+}
+
+def medir_imports(codigo):
+    """Ejecuta el código con -X importtime y devuelve {módulo de primer nivel: microsegundos acumulados}
+    junto con el conjunto de todos los módulos importados."""
+    salida = subprocess.run([sys.executable, "-X", "importtime", "-c", codigo], cwd=carpeta_src,
+                            capture_output=True, text=True, check=True).stderr
+    tiempos = {}
+    importados = set()
+    for linea in salida.splitlines():
+        if not linea.startswith("import time:") or "|" not in linea:
+            continue
+        _, acumulado, modulo = linea[len("import time:"):].split("|")
+        if not acumulado.strip().isdigit():
+            continue  # Encabezado de la tabla
+        importados.add(modulo.strip())
+        # Los imports anidados vienen con sangría; solo se suman los de primer nivel
+        if modulo.startswith(" ") and not modulo.startswith("  "):
+            tiempos[modulo.strip()] = int(acumulado)
+    return tiempos, importados
+
+def main():
+    parser = argparse.ArgumentParser(description="Mide el tiempo de import al arrancar main.py.")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="Cantidad de módulos más costosos a mostrar")
+    args = parser.parse_args()
+
+    for nombre, codigo in CASOS.items():
+        mediciones = [medir_imports(codigo) for _ in range(args.repeticiones)]
+        totales = [sum(tiempos.values()) for tiempos, _ in mediciones]
+        ultima, importados = mediciones[-1]
+        print(f"{nombre}: mediana {statistics.median(totales) / 1000:.1f} ms en imports "
+              f"({len(ultima)} módulos de primer nivel, openpyxl {'cargado' if 'openpyxl' in importados else 'no cargado'})")
+        for modulo, microsegundos in sorted(ultima.items(), key=lambda item: -item[1])[:args.top]:
+            print(f"    {microsegundos / 1000:>8.1f} ms  {modulo}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Mide cuántos reportes por segundo genera el exportador con datos sintéticos en memoria.
+
+Compara leer la plantilla en cada reporte (como se hacía antes) con reutilizar el prototipo en memoria
+del ExportadorReportes. Los reportes se escriben en una carpeta temporal.
+
+Uso: python benchmarks/bench_exportacion.py --reportes 200
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../src'))
+
+from bench_reporte import datos_sinteticos
+from exportador import ExportadorReportes, plantilla_excel
+
+MES, YEAR = 3, 2025
+
+def medir(nombre, cantidad, datos, carpeta, exportador_de):
+    """Exporta los reportes de los primeros docentes y muestra reportes por segundo."""
+    cis = list(datos["docentes"])[:cantidad]
+    inicio = time.perf_counter()
+    for ci in cis:
+        exportador_de().exportar(ci, MES, YEAR, os.path.join(carpeta, f"{ci}.xlsx"), datos)
+    duracion = time.perf_counter() - inicio
+    print(f"{nombre:<28} {len(cis)} reportes en {duracion:.2f} s ({len(cis) / duracion:.1f} reportes/s)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Mide la velocidad de exportación de reportes a Excel.")
+    parser.add_argument("--reportes", type=int, default=200)
+    args = parser.parse_args()
+
+    datos = datos_sinteticos(args.reportes, MES, YEAR)
+    prototipo = ExportadorReportes(plantilla_excel)
+    with tempfile.TemporaryDirectory() as carpeta:
+        medir("plantilla leída cada vez", args.reportes, datos, carpeta, lambda: ExportadorReportes(plantilla_excel))
+        medir("prototipo en memoria", args.reportes, datos, carpeta, lambda: prototipo)
+
+if __name__ == "__main__":
+    main()
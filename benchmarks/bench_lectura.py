@@ -0,0 +1,77 @@
+"""Compara la lectura completa de openpyxl con la lectura en modo de solo lectura (streaming).
+
+Genera un asistencia.xlsx sintético con la cantidad de filas indicada y mide, en un proceso
+separado por cada caso, el tiempo y el pico de memoria (RSS) de cada forma de leerlo.
+
+Uso: python benchmarks/bench_lectura.py --filas 100000 1000000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../src'))
+
+import openpyxl
+
+def generar_asistencia(ruta, cantidad_filas):
+    """Escribe un archivo de asistencia con el mismo formato que usa la aplicación."""
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(["C.I.", "Nombre", "Fecha", "Hora Entrada", "Hora Salida"])
+    inicio = datetime(2021, 1, 1)
+    for numero in range(cantidad_filas):
+        fecha = inicio + timedelta(days=numero // 400)
+        ws.append([str(1000000 + numero % 400), f"Docente {numero % 400}", fecha.strftime("%Y-%m-%d"),
+                   "08:03:00", "10:01:00"])
+    wb.save(ruta)
+
+def pico_memoria_kb():
+    """Pico de memoria residente del proceso actual en KB (None si el sistema no lo informa)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico // 1024 if sys.platform == "darwin" else pico
+
+def medir(modo, ruta):
+    """Lee el archivo con el modo indicado e imprime tiempo y memoria como JSON."""
+    from cache_libros import leer_filas_sin_cache
+    inicio = time.perf_counter()
+    if modo == "completo":
+        wb = openpyxl.load_workbook(ruta)
+        filas = [tuple(row) for row in wb.active.iter_rows(min_row=2, values_only=True)]
+    else:
+        filas = leer_filas_sin_cache(ruta)
+    duracion = time.perf_counter() - inicio
+    print(json.dumps({"modo": modo, "filas": len(filas), "segundos": round(duracion, 2),
+                      "rss_kb": pico_memoria_kb()}))
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara la lectura completa y en streaming de asistencia.xlsx.")
+    parser.add_argument("--filas", type=int, nargs="+", default=[100000, 1000000])
+    parser.add_argument("--medir", nargs=2, metavar=("MODO", "RUTA"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.medir:
+        medir(*args.medir)
+        return
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        for cantidad in args.filas:
+            ruta = os.path.join(carpeta, f"asistencia_{cantidad}.xlsx")
+            generar_asistencia(ruta, cantidad)
+            for modo in ("completo", "streaming"):
+                salida = subprocess.run([sys.executable, __file__, "--medir", modo, ruta],
+                                        capture_output=True, text=True, check=True).stdout
+                resultado = json.loads(salida)
+                print(f"{cantidad:>9} filas  {modo:<10} {resultado['segundos']:>7.2f} s  "
+                      f"pico RSS: {resultado['rss_kb'] or '?'} KB")
+
+if __name__ == "__main__":
+    main()
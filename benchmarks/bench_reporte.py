@@ -0,0 +1,62 @@
+"""Mide el tiempo de generar_reporte con datos sintéticos en memoria.
+
+Uso: python benchmarks/bench_reporte.py --docentes 10000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../src'))
+
+from calculo_reporte import generar_reporte
+
+DIAS = ["lunes", "martes", "miércoles", "jueves", "viernes"]
+
+def datos_sinteticos(cantidad_docentes, mes, year, semilla=1):
+    """Arma datos con el formato de cargar_datos_mes: dos clases por semana y asistencia casi completa."""
+    aleatorio = random.Random(semilla)
+    datos = {"docentes": {}, "horarios": {}, "asistencia": {}}
+    for numero in range(cantidad_docentes):
+        ci = str(1000000 + numero)
+        datos["docentes"][ci] = (f"Docente {numero}", 20.0)
+        horario = {}
+        for dia in aleatorio.sample(DIAS, 2):
+            inicio = aleatorio.choice(["08:00", "10:00", "14:00", "16:00"])
+            fin = f"{int(inicio[:2]) + 2:02d}:00"
+            horario[dia] = [("MATERIA", inicio, fin)]
+        datos["horarios"][ci] = horario
+
+        filas = []
+        fecha = date(year, mes, 1)
+        while fecha.month == mes:
+            dia = DIAS[fecha.weekday()] if fecha.weekday() < 5 else None
+            if dia in horario and aleatorio.random() < 0.9:
+                inicio = horario[dia][0][1]
+                entrada = f"{int(inicio[:2]):02d}:{aleatorio.randint(0, 15):02d}:00"
+                salida = f"{int(inicio[:2]) + 2:02d}:00:00"
+                filas.append((ci, f"Docente {numero}", fecha.strftime("%Y-%m-%d"), entrada, salida))
+            fecha += timedelta(days=1)
+        datos["asistencia"][ci] = filas
+    return datos
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docentes", type=int, default=10000)
+    args = parser.parse_args()
+
+    datos = datos_sinteticos(args.docentes, 3, 2025)
+    filas = sum(len(filas) for filas in datos["asistencia"].values())
+
+    inicio = time.perf_counter()
+    for ci in datos["docentes"]:
+        generar_reporte(ci, 3, 2025, datos)
+    duracion = time.perf_counter() - inicio
+
+    print(f"{args.docentes} docentes, {filas} filas de asistencia: {duracion:.2f} s "
+          f"({duracion / args.docentes * 1000:.3f} ms por reporte)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""Mide las operaciones sin interfaz gráfica sobre datos sintéticos de distintos tamaños.
+
+Para cada escenario (cantidad de docentes y años de asistencia) genera los archivos Excel con
+generar_datos.py y, en un proceso separado que usa esa carpeta como ECOS_DATOS, mide cada operación
+varias veces: registro de asistencia (también en ráfaga por la cola del kiosco), generar_reporte, exportar_a_excel, obtener_anios_disponibles,
+lecturas de las listas, etc. Muestra los percentiles de latencia y el pico de memoria de cada operación,
+y guarda los resultados en benchmarks/resultados.jsonl para compararlos con la corrida anterior.
+
+Uso: python benchmarks/bench_suite.py --docentes 50 500 5000 --anios 1 5 --repeticiones 20
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../src'))
+
+from generar_datos import generar, rango_fechas
+from bench_lectura import pico_memoria_kb
+
+archivo_resultados = os.path.join(os.path.dirname(__file__), 'resultados.jsonl')
+UMBRAL_REGRESION = 0.2  # Se marca la operación si su mediana empeora más de un 20 %
+
+def percentil(valores, porcentaje):
+    """Percentil por rango más cercano de una lista de valores."""
+    ordenados = sorted(valores)
+    posicion = max(0, min(len(ordenados) - 1, round(porcentaje / 100 * len(ordenados) + 0.5) - 1))
+    return ordenados[posicion]
+
+def medir_operacion(nombre, funcion, repeticiones, preparar=None, memoria=True):
+    """Ejecuta funcion() repeticiones veces y devuelve percentiles en ms y el pico de memoria en KB.
+    preparar() se llama antes de cada ejecución y no cuenta en el tiempo (por ejemplo, vaciar la caché).
+    Con memoria=False no se repite la operación para medir la memoria (operaciones que no se pueden repetir)."""
+    tiempos = []
+    for _ in range(repeticiones):
+        if preparar:
+            preparar()
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    # La memoria se mide en una ejecución aparte porque tracemalloc hace más lento el código
+    pico = None
+    if memoria:
+        if preparar:
+            preparar()
+        tracemalloc.start()
+        funcion()
+        pico = tracemalloc.get_traced_memory()[1] // 1024
+        tracemalloc.stop()
+    return {"operacion": nombre, "repeticiones": repeticiones,
+            "p50_ms": round(percentil(tiempos, 50), 3), "p90_ms": round(percentil(tiempos, 90), 3),
+            "p99_ms": round(percentil(tiempos, 99), 3), "max_ms": round(max(tiempos), 3),
+            "pico_kb": pico}
+
+def medir_escenario(repeticiones):
+    """Mide todas las operaciones con los datos de ECOS_DATOS; se ejecuta en un proceso aparte."""
+    import cache_libros
+    from almacenamiento import obtener_backend
+    from almacen_asistencia import AlmacenAsistencia
+    from calculo_reporte import cargar_datos_mes, generar_reporte, obtener_anios_disponibles
+    from cola_escaneos import ColaEscaneos
+    from exportador import exportar_a_excel, plantilla_excel
+    from indice_docentes import IndiceDocentes
+
+    aleatorio = random.Random(1)
+    backend = obtener_backend()
+    hasta = rango_fechas(1)[1]
+    mes, year = hasta.month, hasta.year
+    resultados = []
+
+    def medir(nombre, funcion, preparar=None, veces=repeticiones, memoria=True):
+        resultado = medir_operacion(nombre, funcion, veces, preparar, memoria)
+        resultados.append(resultado)
+        print(f"  {nombre}: p50 {resultado['p50_ms']} ms", file=sys.stderr)
+
+    def frio():
+        cache_libros.invalidar()
+
+    medir("leer asistencia (frío)", lambda: backend.leer("asistencia"), frio)
+    medir("obtener_anios_disponibles (frío)", obtener_anios_disponibles, frio)
+    medir("obtener_anios_disponibles (caché)", obtener_anios_disponibles)
+    medir("lista de docentes (frío)", lambda: backend.leer("docentes"), frio)
+    medir("lista de horarios (frío)", lambda: backend.leer("horarios"), frio)
+
+    def borrar_horario():
+        id_fila, fila = aleatorio.choice(backend.leer_con_id("horarios"))
+        backend.eliminar_id("horarios", id_fila, fila)
+
+    # Las borradas quedan marcadas; el archivo se reescribe recién cuando pasan del umbral de compactación
+    medir("borrar horario", borrar_horario, veces=min(repeticiones, 5), memoria=False)
+    medir("índice de docentes", lambda: IndiceDocentes(backend.leer("docentes")))
+    medir("cargar_datos_mes (frío)", lambda: cargar_datos_mes(mes, year), frio)
+
+    datos = cargar_datos_mes(mes, year)
+    docentes = list(datos["docentes"])
+    medir("generar_reporte (datos cargados)", lambda: generar_reporte(aleatorio.choice(docentes), mes, year, datos))
+    medir("generar_reporte (un docente)", lambda: generar_reporte(aleatorio.choice(docentes), mes, year))
+    # Volver a ver el mismo reporte o exportarlo usa el resultado guardado mientras los datos no cambien
+    medir("generar_reporte (repetido)", lambda: generar_reporte(docentes[0], mes, year))
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        salida = os.path.join(carpeta, "reporte.xlsx")
+        medir("exportar_a_excel", lambda: exportar_a_excel(aleatorio.choice(docentes), mes, year, plantilla_excel,
+                                                           salida, datos))
+
+    # El almacén guarda en segundo plano; con un intervalo largo solo se mide el registro en memoria y el diario
+    almacenes = []
+
+    def cerrar_y_enfriar():
+        # Solo un almacén a la vez puede tener abierto el diario
+        while almacenes:
+            almacenes.pop().cerrar()
+        frio()
+
+    medir("cargar almacén de asistencia", lambda: almacenes.append(AlmacenAsistencia(intervalo=3600)),
+          preparar=cerrar_y_enfriar, veces=1)
+    almacen = almacenes[-1]
+    nombres = {ci: datos["docentes"][ci][0] for ci in docentes}
+
+    def registrar():
+        ci = aleatorio.choice(docentes)
+        almacen.registrar(ci, nombres[ci])
+
+    medir("registrar (escaneo)", registrar)
+
+    def rafaga():
+        # 50 docentes escanean seguidos en el kiosco: tiempo hasta que la cola registra el último
+        cola = ColaEscaneos(lambda ci: almacen.registrar(ci, nombres[ci]), espera_repetido=0)
+        for ci in aleatorio.sample(docentes, min(50, len(docentes))):
+            cola.escanear(ci)
+        cola.cerrar()
+
+    medir("cola del kiosco (ráfaga de 50)", rafaga)
+    medir("totales del mes (agregados)", lambda: almacen.totales(aleatorio.choice(docentes), mes, year, 20.0))
+    hoy = datetime.now().strftime("%Y-%m-%d")
+    medir("lista de asistencia de hoy", lambda: almacen.filas_entre(hoy, hoy))
+    medir("guardar registros pendientes", almacen.guardar, veces=1, memoria=False)
+    almacen.cerrar()
+
+    print(json.dumps({"resultados": resultados, "rss_kb": pico_memoria_kb()}))
+
+def version_actual():
+    """Commit actual del repositorio, para saber con qué versión se obtuvo cada resultado."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "desconocida"
+
+def leer_anteriores(ruta):
+    """Devuelve el último resultado guardado de cada (docentes, años, operación)."""
+    anteriores = {}
+    if not os.path.exists(ruta):
+        return anteriores
+    with open(ruta, encoding="utf-8") as archivo:
+        for linea in archivo:
+            if linea.strip():
+                resultado = json.loads(linea)
+                anteriores[(resultado["docentes"], resultado["anios"], resultado["operacion"])] = resultado
+    return anteriores
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks de las operaciones sin interfaz con datos sintéticos.")
+    parser.add_argument("--docentes", type=int, nargs="+", default=[50, 500])
+    parser.add_argument("--anios", type=int, nargs="+", default=[1])
+    parser.add_argument("--repeticiones", type=int, default=20)
+    parser.add_argument("--resultados", default=archivo_resultados, help="Archivo JSONL donde se acumulan los resultados")
+    parser.add_argument("--etiqueta", default=None, help="Versión con la que se guardan los resultados (por defecto el commit)")
+    parser.add_argument("--no-guardar", action="store_true", help="Solo muestra los resultados")
+    parser.add_argument("--medir", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.medir:
+        medir_escenario(args.medir)
+        return
+
+    anteriores = leer_anteriores(args.resultados)
+    version = args.etiqueta or version_actual()
+    for anios in args.anios:
+        for cantidad in args.docentes:
+            with tempfile.TemporaryDirectory() as carpeta:
+                filas = generar(carpeta, cantidad, anios)
+                print(f"\n{cantidad} docentes, {anios} años ({filas['asistencia']} filas de asistencia)")
+                entorno = dict(os.environ, ECOS_DATOS=carpeta)
+                salida = subprocess.run([sys.executable, __file__, "--medir", str(args.repeticiones)], env=entorno,
+                                        capture_output=True, text=True, check=True).stdout
+            medicion = json.loads(salida.strip().splitlines()[-1])
+
+            print(f"{'operación':<36}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'máx ms':>10}{'pico KB':>10}  cambio")
+            nuevos = []
+            for resultado in medicion["resultados"]:
+                anterior = anteriores.get((cantidad, anios, resultado["operacion"]))
+                cambio = ""
+                if anterior and anterior["p50_ms"] > 0:
+                    variacion = resultado["p50_ms"] / anterior["p50_ms"] - 1
+                    cambio = f"{variacion:+.0%} vs {anterior['version']}"
+                    if variacion > UMBRAL_REGRESION:
+                        cambio += "  REGRESIÓN"
+                print(f"{resultado['operacion']:<36}{resultado['p50_ms']:>10}{resultado['p90_ms']:>10}"
+                      f"{resultado['p99_ms']:>10}{resultado['max_ms']:>10}{resultado['pico_kb'] or '-':>10}  {cambio}")
+                nuevos.append(dict(resultado, fecha=datetime.now().isoformat(timespec="seconds"), version=version,
+                                   docentes=cantidad, anios=anios, filas_asistencia=filas["asistencia"],
+                                   rss_kb=medicion["rss_kb"]))
+            print(f"Pico de memoria del proceso: {medicion['rss_kb'] or '?'} KB")
+
+            if not args.no_guardar:
+                with open(args.resultados, "a", encoding="utf-8") as archivo:
+                    for resultado in nuevos:
+                        archivo.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+
+if __name__ == "__main__":
+    main()
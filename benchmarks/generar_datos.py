@@ -0,0 +1,98 @@
+"""Genera archivos de datos sintéticos (docentes, materias, horarios, feriados y asistencia) con el mismo
+formato que usa la aplicación, para medirla a la escala que se quiera.
+
+Cada docente tiene dos clases por semana y asiste al 90 % de ellas, con algunos minutos de retraso.
+La asistencia cubre los últimos años completos hasta el mes anterior al actual.
+
+Uso: python benchmarks/generar_datos.py --docentes 500 --anios 2 --carpeta /tmp/datos_ecos
+     ECOS_DATOS=/tmp/datos_ecos python src/main.py
+"""
+import argparse
+import os
+import random
+import sys
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../src'))
+
+import openpyxl
+from almacenamiento import TABLAS
+
+DIAS = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado"]
+INICIOS = ["07:00", "08:00", "10:00", "14:00", "16:00", "18:00"]
+MATERIAS = [f"MATERIA {numero}" for numero in range(1, 41)]
+
+def escribir(ruta, encabezados, filas):
+    """Escribe una hoja en modo de solo escritura, sin cargar todas las celdas en memoria."""
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(encabezados)
+    cantidad = 0
+    for fila in filas:
+        ws.append(fila)
+        cantidad += 1
+    wb.save(ruta)
+    return cantidad
+
+def rango_fechas(anios, hoy=None):
+    """Devuelve (desde, hasta): los últimos años completos que terminan en el último día del mes anterior."""
+    hoy = hoy or date.today()
+    hasta = hoy.replace(day=1) - timedelta(days=1)
+    if hasta.month == 12:
+        return date(hasta.year - anios + 1, 1, 1), hasta
+    return date(hasta.year - anios, hasta.month + 1, 1), hasta
+
+def generar(carpeta, cantidad_docentes, anios, semilla=1):
+    """Escribe los archivos en la carpeta y devuelve la cantidad de filas de cada tabla."""
+    aleatorio = random.Random(semilla)
+    os.makedirs(carpeta, exist_ok=True)
+
+    def ruta(tabla):
+        return os.path.join(carpeta, os.path.basename(TABLAS[tabla]["archivo"]))
+
+    docentes = [(str(3000000 + numero), f"Docente Sintético {numero}") for numero in range(cantidad_docentes)]
+    horarios = []
+    for ci, nombre in docentes:
+        for dia in aleatorio.sample(DIAS, 2):
+            inicio = aleatorio.choice(INICIOS)
+            fin = f"{int(inicio[:2]) + 2:02d}:00"
+            horarios.append([ci, nombre, aleatorio.choice(MATERIAS), dia, inicio, fin, "2.0"])
+    clases = {}
+    for fila in horarios:
+        clases.setdefault(DIAS.index(fila[3]), []).append(fila)
+
+    def filas_asistencia():
+        desde, hasta = rango_fechas(anios)
+        fecha = desde
+        while fecha <= hasta:
+            for ci, nombre, _, _, inicio, fin, _ in clases.get(fecha.weekday(), []):
+                if aleatorio.random() < 0.9:
+                    entrada = f"{inicio}:{aleatorio.randint(0, 59):02d}"
+                    if aleatorio.random() < 0.3:
+                        entrada = f"{inicio[:3]}{aleatorio.randint(1, 25):02d}:00"
+                    yield [ci, nombre, fecha.isoformat(), entrada, f"{fin}:00"]
+            fecha += timedelta(days=1)
+
+    cantidades = {
+        "docentes": escribir(ruta("docentes"), TABLAS["docentes"]["encabezados"],
+                             ([ci, nombre, "General", 20.0 + numero % 5, f"7{numero:07d}"]
+                              for numero, (ci, nombre) in enumerate(docentes))),
+        "materias": escribir(ruta("materias"), TABLAS["materias"]["encabezados"], ([materia] for materia in MATERIAS)),
+        "horarios": escribir(ruta("horarios"), TABLAS["horarios"]["encabezados"], horarios),
+        "feriados": escribir(ruta("feriados"), TABLAS["feriados"]["encabezados"], []),
+        "asistencia": escribir(ruta("asistencia"), TABLAS["asistencia"]["encabezados"], filas_asistencia()),
+    }
+    return cantidades
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera archivos Excel sintéticos para los benchmarks.")
+    parser.add_argument("--docentes", type=int, default=50)
+    parser.add_argument("--anios", type=int, default=1)
+    parser.add_argument("--carpeta", required=True)
+    parser.add_argument("--semilla", type=int, default=1)
+    args = parser.parse_args()
+    for tabla, cantidad in generar(args.carpeta, args.docentes, args.anios, args.semilla).items():
+        print(f"{tabla}: {cantidad} filas")
+
+if __name__ == "__main__":
+    main()
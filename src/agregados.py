@@ -0,0 +1,209 @@
+import json
+import os
+import threading
+from datetime import datetime
+from almacenamiento import obtener_backend, texto, carpeta_datos
+from calendario import obtener_calendario
+from calculo_reporte import calcular_asistencia, convertir_hora
+from indice_docentes import normalizar_ci
+import historico
+
+archivo_agregados = os.path.join(carpeta_datos, 'agregados.json')
+
+def _vacio():
+    return {
+        "filas": 0,  # Filas de asistencia ya sumadas (en el orden del almacén)
+        "ultima": None,  # Firma de la última fila sumada, para detectar cambios hechos fuera de la aplicación
+        "abiertas": [],  # Índices de filas sumadas que todavía no tienen hora de salida
+        "versiones": {},  # "AAAA-MM" -> versiones de horarios y feriados con las que se calculó el mes
+        "meses": {},  # "ci|AAAA|MM" -> totales del docente en el mes
+    }
+
+def _firma_fila(fila):
+    return [texto(fila[0]), texto(fila[2])[:10], texto(fila[3])]
+
+def _leer_fila(fila):
+    """Devuelve (ci, fecha, entrada, salida) de una fila de asistencia, con las horas como datetime."""
+    fecha = datetime.strptime(texto(fila[2])[:10], "%Y-%m-%d").date()
+    return normalizar_ci(fila[0]), fecha, convertir_hora(fecha, fila[3]), convertir_hora(fecha, fila[4])
+
+def _versiones_calendario():
+    backend = obtener_backend()
+    return json.loads(json.dumps([backend.version("horarios"), backend.version("feriados")]))
+
+class AgregadosAsistencia:
+    """Totales de asistencia por docente y mes (horas, retraso, deducciones, días asistidos) que se
+    actualizan con cada entrada y salida, con las mismas reglas que generar_reporte.
+
+    Se guardan en data/agregados.json junto con hasta qué fila de asistencia se sumó, así al abrir
+    la aplicación solo se suman las filas que faltan. Si el archivo de asistencia se modificó por fuera
+    o cambiaron los horarios del mes, los totales se recalculan desde las filas."""
+
+    def __init__(self, ruta=archivo_agregados):
+        self.ruta = ruta
+        self.lock = threading.Lock()
+        self.datos = self._leer()
+        self._modificado = False
+
+    def _leer(self):
+        try:
+            with open(self.ruta, encoding="utf-8") as archivo:
+                datos = json.load(archivo)
+            return dict(_vacio(), **datos)
+        except (OSError, ValueError):
+            return _vacio()
+
+    def _mes(self, ci, mes, year):
+        clave = f"{ci}|{year}|{mes:02d}"
+        if clave not in self.datos["meses"]:
+            self.datos["meses"][clave] = {"horas": 0.0, "retraso_minutos": 0, "deducciones": 0, "registros": 0,
+                                          "fechas": []}
+            self.datos["versiones"].setdefault(f"{year}-{mes:02d}", _versiones_calendario())
+        return self.datos["meses"][clave]
+
+    def _sumar(self, fila, entrada=True, salida=True):
+        """Suma la parte de entrada (retraso, deducción) y/o de salida (horas) de una fila."""
+        try:
+            ci, fecha, hora_entrada, hora_salida = _leer_fila(fila)
+        except ValueError as e:
+            print(f"Error al procesar la fila de asistencia {fila}: {e}")
+            return
+        sesiones = obtener_calendario(fecha.month, fecha.year).sesiones_del_dia(ci, fecha)
+        if not sesiones or hora_entrada is None:
+            return  # Día sin clases programadas o feriado: no cuenta, igual que en el reporte
+        horas, retraso_minutos, deduccion = calcular_asistencia(fecha, hora_entrada, hora_salida if salida else None,
+                                                                [sesion[4] for sesion in sesiones])
+        totales = self._mes(ci, fecha.month, fecha.year)
+        if entrada:
+            totales["retraso_minutos"] += retraso_minutos
+            totales["deducciones"] += deduccion
+            totales["registros"] += 1
+            if fecha.isoformat() not in totales["fechas"]:
+                totales["fechas"].append(fecha.isoformat())
+        if salida:
+            totales["horas"] += horas
+        self._modificado = True
+
+    def registrar_entrada(self, indice, fila):
+        """Suma una entrada recién registrada en la fila indice del almacén."""
+        with self.lock:
+            self._sumar(fila, salida=False)
+            self.datos["filas"] = max(self.datos["filas"], indice + 1)
+            self.datos["ultima"] = _firma_fila(fila)
+            self.datos["abiertas"].append(indice)
+
+    def registrar_salida(self, indice, fila):
+        """Suma las horas de una salida recién registrada."""
+        with self.lock:
+            if indice in self.datos["abiertas"]:
+                self.datos["abiertas"].remove(indice)
+                self._sumar(fila, entrada=False)
+
+    def sincronizar(self, filas):
+        """Suma las filas y salidas que no estaban en los agregados guardados (o recalcula todo)."""
+        with self.lock:
+            sumadas = self.datos["filas"]
+            if sumadas > len(filas) or (sumadas and self.datos["ultima"] != _firma_fila(filas[sumadas - 1])):
+                print("Los agregados no coinciden con el archivo de asistencia; se recalculan.")
+                self._recalcular(filas)
+                return
+            abiertas = []
+            for indice in self.datos["abiertas"]:
+                if filas[indice][4] is None or filas[indice][4] == "":
+                    abiertas.append(indice)
+                else:
+                    self._sumar(filas[indice], entrada=False)
+            for indice in range(sumadas, len(filas)):
+                self._sumar(filas[indice])
+                if filas[indice][4] is None or filas[indice][4] == "":
+                    abiertas.append(indice)
+            self._marcar(filas, abiertas)
+
+    def _marcar(self, filas, abiertas):
+        if len(filas) != self.datos["filas"] or abiertas != self.datos["abiertas"]:
+            self._modificado = True
+        self.datos["filas"] = len(filas)
+        self.datos["ultima"] = _firma_fila(filas[-1]) if filas else None
+        self.datos["abiertas"] = abiertas
+
+    def _recalcular(self, filas, mes=None, year=None):
+        """Vuelve a sumar desde las filas todos los meses, o solo el indicado.
+
+        Los meses del archivo histórico ya no están en las filas: al recalcular todo se conservan y al
+        recalcular uno de ellos se suma su partición."""
+        archivados = {f"{year_archivado}|{mes_archivado:02d}" for year_archivado, mes_archivado in historico.particiones()}
+        if mes is None:
+            self.datos["meses"] = {clave: valor for clave, valor in self.datos["meses"].items()
+                                   if clave.split("|", 1)[1] in archivados}
+            self.datos["versiones"] = {clave: valor for clave, valor in self.datos["versiones"].items()
+                                       if clave.replace("-", "|") in archivados}
+        else:
+            sufijo = f"|{year}|{mes:02d}"
+            self.datos["meses"] = {clave: valor for clave, valor in self.datos["meses"].items()
+                                   if not clave.endswith(sufijo)}
+            self.datos["versiones"][f"{year}-{mes:02d}"] = _versiones_calendario()
+        sumadas = set()
+        for fila in filas:
+            if mes is None or texto(fila[2])[:7] == f"{year}-{mes:02d}":
+                self._sumar(fila)
+                sumadas.add(historico.firma_fila(fila))
+        if mes is not None and f"{year}|{mes:02d}" in archivados:
+            for fila in historico.leer_mes(mes, year):
+                if historico.firma_fila(fila) not in sumadas:
+                    self._sumar(fila)
+        self._marcar(filas, [indice for indice, fila in enumerate(filas) if fila[4] is None or fila[4] == ""])
+        self._modificado = True
+
+    def recalcular(self, filas, mes=None, year=None):
+        """Recalcula los totales desde cero a partir de las filas de asistencia (para auditorías)."""
+        with self.lock:
+            self._recalcular(filas, mes, year)
+
+    def totales(self, ci, mes, year, pago_por_hora, filas=None, hoy=None):
+        """Devuelve los totales del docente en el mes como los muestra el reporte, más retraso y sesiones.
+        Si cambiaron los horarios o feriados del mes desde que se sumó, se recalcula el mes con las filas dadas."""
+        with self.lock:
+            clave_mes = f"{year}-{mes:02d}"
+            if filas is not None:
+                if clave_mes in self.datos["versiones"]:
+                    desactualizado = self.datos["versiones"][clave_mes] != _versiones_calendario()
+                else:
+                    # Mes archivado que nunca se sumó (por ejemplo, archivado antes de existir los agregados)
+                    desactualizado = historico.esta_archivado(mes, year)
+                if desactualizado:
+                    self._recalcular(filas, mes, year)
+            totales = dict(self.datos["meses"].get(f"{ci}|{year}|{mes:02d}") or
+                           {"horas": 0.0, "retraso_minutos": 0, "deducciones": 0, "registros": 0, "fechas": []})
+
+        calendario = obtener_calendario(mes, year)
+        hoy = hoy or datetime.now().date()
+        sesiones = calendario.sesiones_docente(ci)
+        asistidas = sum(len(calendario.sesiones_del_dia(ci, datetime.strptime(fecha, "%Y-%m-%d").date()))
+                        for fecha in totales["fechas"])
+        pasadas = sum(1 for sesion in sesiones if sesion[0] <= hoy)
+        total_horas = round(totales["horas"], 2)
+        total_ganado = round(total_horas * pago_por_hora, 2)
+        deducciones = round(totales["deducciones"], 2)
+        return {
+            "total_horas": total_horas,
+            "total_ganado": total_ganado,
+            "deducciones": deducciones,
+            "neto_ganado": round(total_ganado - deducciones, 2),
+            "retraso_minutos": totales["retraso_minutos"],
+            "registros": totales["registros"],
+            "sesiones_programadas": len(sesiones),
+            "sesiones_asistidas": asistidas,
+            "sesiones_faltadas": max(0, pasadas - asistidas),
+        }
+
+    def guardar(self):
+        """Guarda los agregados si cambiaron, reemplazando el archivo de una vez."""
+        with self.lock:
+            if not self._modificado:
+                return
+            contenido = json.dumps(self.datos, ensure_ascii=False)
+            self._modificado = False
+        temporal = self.ruta + ".tmp"
+        with open(temporal, "w", encoding="utf-8") as archivo:
+            archivo.write(contenido)
+        os.replace(temporal, self.ruta)
@@ -0,0 +1,241 @@
+import threading
+import atexit
+from datetime import datetime
+from almacenamiento import obtener_backend, texto
+from diario_asistencia import DiarioAsistencia
+from agregados import AgregadosAsistencia
+from indice_docentes import obtener_indice, normalizar_ci
+import historico
+
+# Cada registro queda seguro en el diario al instante; el almacenamiento se compacta cada cierto tiempo
+INTERVALO_GUARDADO = 10.0  # Segundos entre cada compactación en segundo plano
+
+def normalizar_fecha(valor):
+    """Devuelve la fecha como texto YYYY-MM-DD sin importar cómo esté guardada en el Excel."""
+    if isinstance(valor, datetime):
+        return valor.strftime("%Y-%m-%d")
+    return str(valor).strip() if valor is not None else ""
+
+def obtener_nombres_docentes():
+    """Devuelve un diccionario C.I. -> nombre para validar los registros."""
+    return obtener_indice().nombres()
+
+class AlmacenAsistencia:
+    """Mantiene en memoria los registros de asistencia, los anota en el diario y los compacta
+    en el almacenamiento en segundo plano."""
+
+    def __init__(self, backend=None, diario=None, intervalo=INTERVALO_GUARDADO, agregados=None):
+        self.backend = backend or obtener_backend()
+        self.diario = diario or DiarioAsistencia()
+        self.agregados = agregados or AgregadosAsistencia()
+        self.intervalo = intervalo
+        self.filas = []
+        self.abiertas = {}  # (C.I., fecha) -> índice de la fila que aún no tiene hora de salida
+        self.pendientes = set()  # Índices de filas modificadas que todavía no se guardaron
+        self.guardadas = 0  # Cantidad de filas que ya existen en el almacenamiento
+        self.lock = threading.Lock()
+        self._lock_guardado = threading.Lock()  # Evita dos guardados simultáneos del mismo libro
+        self._despertar = threading.Event()
+        self._detener = threading.Event()
+        try:
+            self._cargar()
+        except BaseException:
+            self.diario.cerrar()
+            raise
+        self.agregados.sincronizar(self.filas)
+        self._hilo = threading.Thread(target=self._guardar_periodicamente, daemon=True)
+        self._hilo.start()
+
+    def _cargar(self):
+        """Lee la asistencia una sola vez y arma el índice de entradas abiertas."""
+        self.backend.verificar("asistencia")
+        for row in self.backend.leer("asistencia"):
+            fila = list(row[:5]) + [None] * (5 - len(row[:5]))
+            self.filas.append(fila)
+            if fila[4] is None or fila[4] == "":
+                clave = (normalizar_ci(fila[0]), normalizar_fecha(fila[2]))
+                self.abiertas[clave] = len(self.filas) - 1
+        self.guardadas = len(self.filas)
+
+        # Recuperar los eventos del diario que no llegaron a compactarse antes de cerrar la aplicación
+        existentes = {(normalizar_ci(fila[0]), texto(fila[2]), texto(fila[3])) for fila in self.filas}
+        recuperados = 0
+        for evento in self.diario.leer():
+            if evento["tipo"] == "entrada" and (normalizar_ci(evento["ci"]), evento["fecha"], evento["hora"]) in existentes:
+                continue
+            if self._aplicar_evento(evento) is not None:
+                recuperados += 1
+        if recuperados:
+            print(f"Se recuperaron {recuperados} registros del diario de asistencia.")
+            self._despertar.set()
+
+    def entrada_abierta(self, ci, fecha=None):
+        """Devuelve el índice de la entrada sin salida del docente en la fecha dada (hoy por defecto)."""
+        fecha = fecha or datetime.now().strftime("%Y-%m-%d")
+        return self.abiertas.get((normalizar_ci(ci), fecha))
+
+    def _aplicar_evento(self, evento):
+        """Aplica un evento del diario a las filas en memoria. Se llama con el candado tomado."""
+        clave = (normalizar_ci(evento["ci"]), evento["fecha"])
+        if evento["tipo"] == "entrada":
+            self.filas.append([evento["ci"], evento["nombre"], evento["fecha"], evento["hora"], None])
+            indice = len(self.filas) - 1
+            self.abiertas[clave] = indice
+        else:
+            indice = self.abiertas.pop(clave, None)
+            if indice is None:
+                return None
+            self.filas[indice][4] = evento["hora"]
+        self.pendientes.add(indice)
+        return indice
+
+    def registrar_entrada(self, ci, nombre):
+        """Anota la hora de entrada en el diario y la deja pendiente de compactar."""
+        ahora = datetime.now()
+        evento = {"tipo": "entrada", "ci": normalizar_ci(ci), "nombre": nombre,
+                  "fecha": ahora.strftime("%Y-%m-%d"), "hora": ahora.strftime("%H:%M:%S")}
+        with self.lock:
+            self.diario.anotar(evento)
+            indice = self._aplicar_evento(evento)
+            self.agregados.registrar_entrada(indice, self.filas[indice])
+        self._despertar.set()
+        return indice
+
+    def registrar_salida(self, ci, fecha=None):
+        """Completa la hora de salida de la entrada abierta del docente. Devuelve None si no hay entrada."""
+        fecha = fecha or datetime.now().strftime("%Y-%m-%d")
+        evento = {"tipo": "salida", "ci": normalizar_ci(ci), "fecha": fecha, "hora": datetime.now().strftime("%H:%M:%S")}
+        with self.lock:
+            if (normalizar_ci(ci), fecha) not in self.abiertas:
+                return None
+            self.diario.anotar(evento)
+            indice = self._aplicar_evento(evento)
+            self.agregados.registrar_salida(indice, self.filas[indice])
+        self._despertar.set()
+        return indice
+
+    def registrar(self, ci, nombre):
+        """Registra la salida si el docente tiene una entrada abierta hoy, si no registra la entrada."""
+        indice = self.registrar_salida(ci)
+        if indice is not None:
+            return "salida", indice
+        return "entrada", self.registrar_entrada(ci, nombre)
+
+    def obtener_fila(self, indice):
+        """Devuelve una copia de la fila en la posición dada."""
+        with self.lock:
+            return list(self.filas[indice])
+
+    def obtener_filas(self):
+        """Devuelve una copia de las filas en memoria."""
+        with self.lock:
+            return [list(fila) for fila in self.filas]
+
+    def filas_entre(self, desde, hasta):
+        """Devuelve [(índice, fila)] de los registros con fecha entre desde y hasta (texto YYYY-MM-DD).
+        Los registros de meses archivados se leen de su partición y su índice es negativo (-1, -2, ...), así no
+        se confunde con las posiciones del almacén. Si otro proceso archivó meses mientras este almacén estaba
+        abierto, esas filas siguen en memoria: se omiten para no listarlas dos veces."""
+        archivadas = []
+        firmas = set()
+        for year, mes in historico.particiones():
+            if desde[:7] <= f"{year}-{mes:02d}" <= hasta[:7]:
+                for fila in historico.leer_mes(mes, year):
+                    if desde <= normalizar_fecha(fila[2]) <= hasta:
+                        archivadas.append((-len(archivadas) - 1, fila))
+                        firmas.add(historico.firma_fila(fila))
+        with self.lock:
+            return archivadas + [(indice, list(fila)) for indice, fila in enumerate(self.filas)
+                                 if desde <= normalizar_fecha(fila[2]) <= hasta
+                                 and not (firmas and historico.firma_fila(fila) in firmas)]
+
+    def totales(self, ci, mes, year, pago_por_hora):
+        """Devuelve los totales del mes del docente desde los agregados, sin recorrer la asistencia."""
+        with self.lock:
+            # Las filas solo se recorren si cambiaron los horarios del mes y hay que recalcularlo
+            return self.agregados.totales(ci, mes, year, pago_por_hora, self.filas)
+
+    def recalcular_agregados(self, mes=None, year=None):
+        """Recalcula los agregados desde las filas de asistencia, para auditorías."""
+        with self.lock:
+            self.agregados.recalcular(self.filas, mes, year)
+        self.agregados.guardar()
+
+    def guardar(self):
+        """Compacta en el almacenamiento todas las filas pendientes en un solo guardado."""
+        with self._lock_guardado:
+            guardadas = self._guardar_lote()
+            self.agregados.guardar()
+            return guardadas
+
+    def _guardar_lote(self):
+        with self.lock:
+            if not self.pendientes:
+                return 0
+            lote = {indice: list(self.filas[indice]) for indice in self.pendientes}
+            self.pendientes.clear()
+            guardadas = self.guardadas
+
+        # Las filas nuevas se agregan; las que ya estaban guardadas solo reciben la hora de salida
+        nuevas = [fila for indice, fila in sorted(lote.items()) if indice >= guardadas]
+        salidas = [({"ci": fila[0], "fecha": fila[2], "hora_entrada": fila[3], "hora_salida": None},
+                    {"hora_salida": fila[4]})
+                   for indice, fila in sorted(lote.items()) if indice < guardadas]
+        try:
+            self.backend.aplicar_cambios("asistencia", agregar=nuevas, actualizar=salidas)
+        except Exception as e:
+            # El archivo puede estar abierto en Excel, a medio escribir o editado por otro programa;
+            # las filas vuelven a quedar pendientes y se reintenta en el próximo ciclo
+            print(f"No se pudo guardar la asistencia: {e}")
+            with self.lock:
+                self.pendientes.update(lote)
+            self._despertar.set()
+            return 0
+        with self.lock:
+            self.guardadas = max(self.guardadas, max(lote) + 1)
+            # Sin pendientes, todo lo anotado en el diario ya está en el almacenamiento
+            if not self.pendientes:
+                self.diario.vaciar()
+        print(f"Asistencia guardada: {len(lote)} filas.")
+        return len(lote)
+
+    def _guardar_periodicamente(self):
+        """Hilo de fondo que agrupa los cambios y los guarda cada cierto intervalo."""
+        while not self._detener.is_set():
+            self._despertar.wait()
+            self._despertar.clear()
+            if self._detener.is_set():
+                break
+            # Esperar un poco para juntar en un solo guardado los registros que llegan seguidos;
+            # al cerrar no se espera el intervalo completo
+            self._detener.wait(self.intervalo)
+            try:
+                self.guardar()
+            except Exception as e:
+                # Un error inesperado (por ejemplo, al guardar los agregados) no debe detener el hilo
+                print(f"Error al guardar la asistencia en segundo plano: {e}")
+                self._despertar.set()
+
+    def cerrar(self):
+        """Detiene el hilo de guardado y guarda lo que quede pendiente."""
+        self._detener.set()
+        self._despertar.set()
+        self._hilo.join(timeout=self.intervalo + 1)
+        self.guardar()
+        self.diario.cerrar()
+
+_almacen = None
+
+def obtener_almacen():
+    """Devuelve el almacén de asistencia compartido, cargándolo la primera vez que se usa."""
+    global _almacen
+    if _almacen is None:
+        _almacen = AlmacenAsistencia()
+        atexit.register(_almacen.cerrar)
+    return _almacen
+
+def guardar_pendientes():
+    """Guarda ya en el almacenamiento los registros pendientes del almacén, si este proceso lo abrió.
+    No abre el almacén: un proceso que no lo usa no tiene registros sin guardar."""
+    if _almacen is not None:
+        _almacen.guardar()
@@ -0,0 +1,473 @@
+import openpyxl
+import os
+import sqlite3
+import sys
+import threading
+from datetime import datetime, date, time
+import cache_libros
+from bloqueo import BloqueoArchivo
+from borrados import leer_borrados, guardar_borrados, firma_borrados, ids_filas, agregar_huecos
+
+# ECOS_DATOS permite usar otra carpeta de datos (por ejemplo, los datos sintéticos de los benchmarks)
+carpeta_datos = os.environ.get("ECOS_DATOS") or os.path.join(os.path.dirname(__file__), '../data')
+archivo_sqlite = os.path.join(carpeta_datos, 'ecos.db')
+
+# Backend usado por toda la aplicación: "excel" (por defecto) o "sqlite"
+BACKEND = os.environ.get("ECOS_ALMACENAMIENTO", "excel")
+
+# Veces que se reaplica un cambio si otro proceso guardó el mismo archivo mientras tanto
+REINTENTOS_ESCRITURA = 5
+
+# El archivo Excel se reescribe sin las filas borradas cuando estas pasan de esta proporción de la tabla
+UMBRAL_COMPACTACION = 0.25
+
+# Cada tabla tiene su archivo Excel, los encabezados de la hoja y los nombres de columna en SQLite
+TABLAS = {
+    "docentes": {
+        "archivo": os.path.join(carpeta_datos, 'docentes.xlsx'),
+        "encabezados": ["C.I.", "Nombre", "Especialidad", "Pago por Hora", "Celular"],
+        "columnas": ["ci", "nombre", "especialidad", "pago_hora", "celular"],
+        "indices": [["ci"], ["nombre"]],
+    },
+    "materias": {
+        "archivo": os.path.join(carpeta_datos, 'materias.xlsx'),
+        "encabezados": ["Materia"],
+        "columnas": ["materia"],
+        "indices": [["materia"]],
+    },
+    "horarios": {
+        "archivo": os.path.join(carpeta_datos, 'horarios.xlsx'),
+        "encabezados": ["C.I.", "Nombre", "Materia", "Día", "Hora Inicio", "Hora Fin", "Horas Trabajadas"],
+        "columnas": ["ci", "nombre", "materia", "dia", "hora_inicio", "hora_fin", "horas_trabajadas"],
+        "indices": [["ci", "dia"], ["dia"]],
+    },
+    "asistencia": {
+        "archivo": os.path.join(carpeta_datos, 'asistencia.xlsx'),
+        "encabezados": ["C.I.", "Nombre", "Fecha", "Hora Entrada", "Hora Salida"],
+        "columnas": ["ci", "nombre", "fecha", "hora_entrada", "hora_salida"],
+        "indices": [["ci", "fecha"], ["fecha"]],
+    },
+    "feriados": {
+        "archivo": os.path.join(carpeta_datos, 'feriados.xlsx'),
+        "encabezados": ["Fecha", "Descripción"],
+        "columnas": ["fecha", "descripcion"],
+        "indices": [["fecha"]],
+    },
+}
+
+def texto(valor):
+    """Convierte un valor de celda a texto comparable (fechas YYYY-MM-DD y horas HH:MM:SS)."""
+    if valor is None:
+        return ""
+    if isinstance(valor, datetime):
+        if valor.time() == time(0, 0):
+            return valor.strftime("%Y-%m-%d")
+        return valor.strftime("%Y-%m-%d %H:%M:%S")
+    if isinstance(valor, date):
+        return valor.strftime("%Y-%m-%d")
+    if isinstance(valor, time):
+        return valor.strftime("%H:%M:%S")
+    return str(valor).strip()
+
+def _coincide(fila, posiciones, filtro):
+    """Indica si la fila cumple el filtro {columna: valor}; None coincide con celdas vacías."""
+    return all(texto(fila[posiciones[columna]]) == texto(valor) for columna, valor in filtro.items())
+
+def _huella(fila):
+    """Contenido de la fila como texto, sin las celdas vacías del final, para reconocerla aunque se lea
+    de otra forma (modo de solo lectura, SQLite o los valores de una tabla de la ventana)."""
+    valores = [texto(valor) for valor in fila]
+    while valores and valores[-1] == "":
+        valores.pop()
+    return valores
+
+def _esta_borrada(borrados, id_fila, fila):
+    """Indica si la fila con ese id está marcada como borrada."""
+    contenido = borrados.get(id_fila)
+    return contenido is not None and contenido == _huella(fila)
+
+def _filas_de_datos(ws):
+    """Filas de datos no vacías de la hoja, en el mismo orden y posición que les dan los lectores."""
+    return [fila for fila in ws.iter_rows(min_row=2, values_only=True) if any(valor is not None for valor in fila)]
+
+def guardar_libro(wb, ruta):
+    """Guarda el libro en un archivo temporal y lo reemplaza de una vez, para que un corte
+    a mitad del guardado no deje el archivo original dañado."""
+    temporal = ruta + ".tmp"
+    wb.save(temporal)
+    os.replace(temporal, ruta)
+    cache_libros.invalidar(ruta)
+
+def escribir_libro(ruta, modificar, reintentos=REINTENTOS_ESCRITURA, despues=None):
+    """Abre el libro, aplica modificar(wb) y lo guarda sin pisar lo que otro proceso guardó mientras tanto.
+    El libro se lee y se modifica sin candado; al guardar se comprueba, con el candado tomado, que el archivo
+    siga en la misma versión. Si cambió se vuelve a leer y se aplican otra vez los cambios sobre lo nuevo,
+    así que modificar debe poder repetirse sobre un libro recién leído. despues() se llama justo después de
+    guardar, todavía con el candado tomado."""
+    for intento in range(reintentos):
+        version = cache_libros.firma(ruta)
+        wb = openpyxl.load_workbook(ruta)
+        modificar(wb)
+        with BloqueoArchivo(ruta):
+            if cache_libros.firma(ruta) == version:
+                guardar_libro(wb, ruta)
+                if despues:
+                    despues()
+                return
+        print(f"{os.path.basename(ruta)} cambió mientras se guardaba, se reaplica el cambio (intento {intento + 1}).")
+    # Demasiados choques seguidos: se hace todo con el candado tomado
+    with BloqueoArchivo(ruta):
+        wb = openpyxl.load_workbook(ruta)
+        modificar(wb)
+        guardar_libro(wb, ruta)
+        if despues:
+            despues()
+
+class AlmacenamientoExcel:
+    """Guarda cada tabla en su archivo Excel, como lo hizo siempre la aplicación.
+
+    Las filas borradas no se quitan del archivo en el momento: se marcan en el archivo de marcas de la tabla
+    (ver borrados.py) y el archivo se compacta cuando pasan de UMBRAL_COMPACTACION. El id de cada fila no
+    cambia al agregar, borrar ni compactar."""
+
+    def verificar(self, tabla):
+        """Crea el archivo de la tabla con encabezados si no existe."""
+        definicion = TABLAS[tabla]
+        if os.path.exists(definicion["archivo"]):
+            return
+        with BloqueoArchivo(definicion["archivo"]):
+            if not os.path.exists(definicion["archivo"]):  # Otro proceso pudo crearlo mientras se esperaba
+                wb = openpyxl.Workbook()
+                ws = wb.active
+                ws.append(definicion["encabezados"])
+                guardar_libro(wb, definicion["archivo"])
+                guardar_borrados(definicion["archivo"], {})  # Marcas que quedaron de un archivo anterior
+
+    def leer(self, tabla):
+        """Devuelve todas las filas de la tabla sin el encabezado ni las filas borradas (desde la caché si el
+        archivo no cambió)."""
+        archivo = TABLAS[tabla]["archivo"]
+        filas = cache_libros.leer_filas(archivo)
+        borrados, huecos = leer_borrados(archivo)
+        if not borrados:
+            return filas
+        return [fila for id_fila, fila in zip(ids_filas(len(filas), huecos), filas)
+                if not _esta_borrada(borrados, id_fila, fila)]
+
+    def leer_con_id(self, tabla):
+        """Devuelve [(id, fila)] de las filas no borradas, para poder borrarlas después con eliminar_id."""
+        archivo = TABLAS[tabla]["archivo"]
+        filas = cache_libros.leer_filas(archivo)
+        borrados, huecos = leer_borrados(archivo)
+        return [(id_fila, fila) for id_fila, fila in zip(ids_filas(len(filas), huecos), filas)
+                if not _esta_borrada(borrados, id_fila, fila)]
+
+    def version(self, tabla):
+        """Identifica la versión de la tabla; cambia cada vez que se guarda su archivo o se borra una fila."""
+        archivo = TABLAS[tabla]["archivo"]
+        return cache_libros.firma(archivo) + firma_borrados(archivo) if os.path.exists(archivo) else None
+
+    def agregar(self, tabla, filas):
+        """Agrega varias filas con un solo guardado del archivo y devuelve sus ids."""
+        return self.aplicar_cambios(tabla, agregar=filas)
+
+    def actualizar(self, tabla, filtro, valores):
+        """Actualiza la primera fila que cumple el filtro con los valores {columna: valor}."""
+        self.aplicar_cambios(tabla, actualizar=[(filtro, valores)])
+
+    def eliminar(self, tabla, filtro):
+        """Marca como borrada la primera fila que cumple el filtro."""
+        posiciones = {columna: i for i, columna in enumerate(TABLAS[tabla]["columnas"])}
+        self._marcar_borrada(tabla, lambda id_fila, fila: _coincide(fila, posiciones, filtro))
+
+    def eliminar_id(self, tabla, id_fila, fila=None):
+        """Marca como borrada la fila con ese id. Si se pasa la fila y el id ya no le corresponde (el archivo
+        se editó fuera de la aplicación después de leerla), se borra la primera fila con el mismo contenido."""
+        if fila is None:
+            self._marcar_borrada(tabla, lambda id_actual, actual: id_actual == id_fila)
+            return
+        esperada = _huella(fila)
+        if not self._marcar_borrada(tabla, lambda id_actual, actual: id_actual == id_fila and _huella(actual) == esperada):
+            self._marcar_borrada(tabla, lambda id_actual, actual: _huella(actual) == esperada)
+
+    def _marcar_borrada(self, tabla, elegir):
+        """Marca la primera fila no borrada para la que elegir(id, fila) es verdadero, sin reescribir el
+        archivo; lo compacta si las filas borradas pasan del umbral. Devuelve False si no encontró la fila."""
+        archivo = TABLAS[tabla]["archivo"]
+        with BloqueoArchivo(archivo):
+            filas = cache_libros.leer_filas(archivo)
+            borrados, huecos = leer_borrados(archivo)
+            borrados = dict(borrados)
+            for id_fila, fila in zip(ids_filas(len(filas), huecos), filas):
+                if not _esta_borrada(borrados, id_fila, fila) and elegir(id_fila, fila):
+                    borrados[id_fila] = _huella(fila)
+                    guardar_borrados(archivo, borrados, huecos)
+                    break
+            else:
+                return False
+        if len(borrados) > UMBRAL_COMPACTACION * len(filas):
+            self.compactar(tabla)
+        return True
+
+    def compactar(self, tabla):
+        """Reescribe el archivo sin las filas borradas y devuelve cuántas quitó."""
+        if not leer_borrados(TABLAS[tabla]["archivo"])[0]:
+            return 0
+        return self._reescribir(tabla)
+
+    def eliminar_filas(self, tabla, condicion):
+        """Elimina todas las filas para las que condicion(fila) es verdadera, con un solo guardado."""
+        self._reescribir(tabla, condicion)
+
+    def _reescribir(self, tabla, condicion=None):
+        """Reescribe el archivo sin las filas borradas ni las que cumplen condicion(fila). Los ids de las filas
+        quitadas pasan a ser huecos, así las demás filas conservan el suyo. Devuelve cuántas filas quitó."""
+        archivo = TABLAS[tabla]["archivo"]
+        quitadas = []  # Ids de las filas que se quitaron del archivo
+        usados = {}  # Marcas que se tuvieron en cuenta al reescribir
+
+        def modificar(wb):
+            ws = wb.active
+            borrados, huecos = leer_borrados(archivo)
+            usados.clear()
+            usados.update(borrados)
+            quitadas.clear()
+            conservadas = []
+            filas = _filas_de_datos(ws)
+            for id_fila, fila in zip(ids_filas(len(filas), huecos), filas):
+                if _esta_borrada(borrados, id_fila, fila) or (condicion is not None and condicion(fila)):
+                    quitadas.append(id_fila)
+                else:
+                    conservadas.append(fila)
+            ws.delete_rows(2, ws.max_row)
+            for fila in conservadas:
+                ws.append(list(fila))
+
+        def despues():
+            # Se conservan solo las marcas agregadas mientras se reescribía; las usadas y las que ya no
+            # correspondían a ninguna fila se descartan
+            borrados, huecos = leer_borrados(archivo)
+            nuevas = {id_fila: contenido for id_fila, contenido in borrados.items() if usados.get(id_fila) != contenido}
+            guardar_borrados(archivo, nuevas, agregar_huecos(huecos, quitadas))
+
+        escribir_libro(archivo, modificar, despues=despues)
+        return len(quitadas)
+
+    def aplicar_cambios(self, tabla, agregar=(), actualizar=()):
+        """Aplica altas y modificaciones en una sola apertura y guardado del archivo. Devuelve los ids de las
+        filas agregadas."""
+        definicion = TABLAS[tabla]
+        posiciones = {columna: i for i, columna in enumerate(definicion["columnas"])}
+        nuevos = []
+
+        def modificar(wb):
+            ws = wb.active
+            borrados, huecos = leer_borrados(definicion["archivo"])
+            if actualizar:
+                pendientes = list(actualizar)
+                posicion = -1
+                ids = ids_filas(ws.max_row, huecos)
+                for row in ws.iter_rows(min_row=2):
+                    if not pendientes:
+                        break
+                    valores_fila = [cell.value for cell in row]
+                    if all(valor is None for valor in valores_fila):
+                        continue
+                    posicion += 1
+                    if _esta_borrada(borrados, ids[posicion], valores_fila):
+                        continue
+                    for cambio in pendientes:
+                        filtro, valores = cambio
+                        if _coincide(valores_fila, posiciones, filtro):
+                            for columna, valor in valores.items():
+                                row[posiciones[columna]].value = valor
+                            pendientes.remove(cambio)
+                            break
+            if agregar:
+                # Los huecos son ids de filas anteriores, así que las nuevas van después de todos ellos
+                siguiente = len(_filas_de_datos(ws)) + sum(fin - inicio for inicio, fin in huecos)
+                nuevos[:] = range(siguiente, siguiente + len(agregar))
+            for fila in agregar:
+                ws.append(list(fila))
+
+        escribir_libro(definicion["archivo"], modificar)
+        return nuevos
+
+class AlmacenamientoSQLite:
+    """Guarda todas las tablas en una base SQLite con índices por C.I., fecha y día."""
+
+    def __init__(self, ruta=archivo_sqlite):
+        self.ruta = ruta
+        self.lock = threading.Lock()
+        self.conexion = sqlite3.connect(ruta, check_same_thread=False)
+        self.conexion.execute("PRAGMA journal_mode=WAL")
+        with self.conexion:
+            # Contador de cambios por tabla, se incrementa en la misma transacción que cada escritura
+            self.conexion.execute("CREATE TABLE IF NOT EXISTS versiones (tabla TEXT PRIMARY KEY, version INTEGER)")
+        for tabla in TABLAS:
+            self.verificar(tabla)
+
+    def verificar(self, tabla):
+        """Crea la tabla y sus índices si no existen."""
+        definicion = TABLAS[tabla]
+        columnas = ", ".join(f"{columna} TEXT" for columna in definicion["columnas"])
+        with self.lock, self.conexion:
+            self.conexion.execute(f"CREATE TABLE IF NOT EXISTS {tabla} ({columnas})")
+            for indice in definicion["indices"]:
+                nombre = f"idx_{tabla}_{'_'.join(indice)}"
+                self.conexion.execute(f"CREATE INDEX IF NOT EXISTS {nombre} ON {tabla} ({', '.join(indice)})")
+
+    def leer(self, tabla):
+        """Devuelve todas las filas de la tabla en el orden en que se agregaron."""
+        with self.lock:
+            return self.conexion.execute(f"SELECT * FROM {tabla} ORDER BY rowid").fetchall()
+
+    def leer_con_id(self, tabla):
+        """Devuelve [(id, fila)] con el rowid de cada fila."""
+        with self.lock:
+            filas = self.conexion.execute(f"SELECT rowid, * FROM {tabla} ORDER BY rowid").fetchall()
+        return [(fila[0], fila[1:]) for fila in filas]
+
+    def version(self, tabla):
+        """Identifica la versión de la tabla; cambia con cada escritura, también de otros procesos."""
+        with self.lock:
+            fila = self.conexion.execute("SELECT version FROM versiones WHERE tabla = ?", (tabla,)).fetchone()
+        return fila[0] if fila else 0
+
+    def _cambio(self, tabla):
+        """Incrementa la versión de la tabla; se llama dentro de la transacción de la escritura."""
+        self.conexion.execute("INSERT INTO versiones VALUES (?, 1) "
+                              "ON CONFLICT(tabla) DO UPDATE SET version = version + 1", (tabla,))
+
+    def agregar(self, tabla, filas):
+        """Agrega varias filas en una sola transacción y devuelve sus ids."""
+        return self.aplicar_cambios(tabla, agregar=filas)
+
+    def actualizar(self, tabla, filtro, valores):
+        """Actualiza la primera fila que cumple el filtro con los valores {columna: valor}."""
+        self.aplicar_cambios(tabla, actualizar=[(filtro, valores)])
+
+    def eliminar(self, tabla, filtro):
+        """Elimina la primera fila que cumple el filtro."""
+        condicion, parametros = self._condicion(filtro)
+        with self.lock, self.conexion:
+            self.conexion.execute(
+                f"DELETE FROM {tabla} WHERE rowid = (SELECT rowid FROM {tabla} WHERE {condicion} LIMIT 1)",
+                parametros)
+            self._cambio(tabla)
+
+    def eliminar_id(self, tabla, id_fila, fila=None):
+        """Elimina la fila con ese rowid; si se pasa la fila y no coincide, la primera con el mismo contenido."""
+        with self.lock, self.conexion:
+            actual = self.conexion.execute(f"SELECT * FROM {tabla} WHERE rowid = ?", (id_fila,)).fetchone()
+            if actual is not None and (fila is None or _huella(actual) == _huella(fila)):
+                self.conexion.execute(f"DELETE FROM {tabla} WHERE rowid = ?", (id_fila,))
+                self._cambio(tabla)
+                return
+        if fila is not None:
+            self.eliminar(tabla, dict(zip(TABLAS[tabla]["columnas"], fila)))
+
+    def compactar(self, tabla):
+        """SQLite borra las filas en el momento, no hay nada que compactar."""
+        return 0
+
+    def eliminar_filas(self, tabla, condicion):
+        """Elimina todas las filas para las que condicion(fila) es verdadera, en una sola transacción."""
+        with self.lock, self.conexion:
+            filas = self.conexion.execute(f"SELECT rowid, * FROM {tabla}").fetchall()
+            self.conexion.executemany(f"DELETE FROM {tabla} WHERE rowid = ?",
+                                      [(fila[0],) for fila in filas if condicion(fila[1:])])
+            self._cambio(tabla)
+
+    def aplicar_cambios(self, tabla, agregar=(), actualizar=()):
+        """Aplica altas y modificaciones dentro de una misma transacción. Devuelve los ids de las filas
+        agregadas."""
+        columnas = TABLAS[tabla]["columnas"]
+        marcadores = ", ".join("?" for _ in columnas)
+        with self.lock, self.conexion:
+            for filtro, valores in actualizar:
+                condicion, parametros = self._condicion(filtro)
+                asignaciones = ", ".join(f"{columna} = ?" for columna in valores)
+                self.conexion.execute(
+                    f"UPDATE {tabla} SET {asignaciones} WHERE rowid = "
+                    f"(SELECT rowid FROM {tabla} WHERE {condicion} LIMIT 1)",
+                    [self._valor(v) for v in valores.values()] + parametros)
+            self.conexion.executemany(
+                f"INSERT INTO {tabla} VALUES ({marcadores})",
+                [[self._valor(v) for v in list(fila)[:len(columnas)]] for fila in agregar])
+            ids = []
+            if agregar:
+                ultimo = self.conexion.execute(f"SELECT max(rowid) FROM {tabla}").fetchone()[0]
+                ids = list(range(ultimo - len(agregar) + 1, ultimo + 1))
+            self._cambio(tabla)
+        return ids
+
+    def _condicion(self, filtro):
+        """Arma la cláusula WHERE para un filtro {columna: valor}."""
+        partes = []
+        parametros = []
+        for columna, valor in filtro.items():
+            if valor is None or valor == "":
+                partes.append(f"({columna} IS NULL OR {columna} = '')")
+            else:
+                partes.append(f"{columna} = ?")
+                parametros.append(texto(valor))
+        return " AND ".join(partes) or "1", parametros
+
+    def _valor(self, valor):
+        """Los valores se guardan como texto normalizado para que los filtros coincidan."""
+        return None if valor is None or valor == "" else texto(valor)
+
+    def vaciar(self, tabla):
+        """Elimina todas las filas de la tabla."""
+        with self.lock, self.conexion:
+            self.conexion.execute(f"DELETE FROM {tabla}")
+            self._cambio(tabla)
+
+_backend = None
+
+def obtener_backend():
+    """Devuelve el backend de almacenamiento configurado, creándolo la primera vez."""
+    global _backend
+    if _backend is None:
+        if BACKEND == "sqlite":
+            _backend = AlmacenamientoSQLite()
+        else:
+            _backend = AlmacenamientoExcel()
+    return _backend
+
+def importar_excel_a_sqlite(ruta=archivo_sqlite):
+    """Copia el contenido de los archivos Excel a la base SQLite, reemplazando lo que hubiera."""
+    excel = AlmacenamientoExcel()
+    base = AlmacenamientoSQLite(ruta)
+    for tabla, definicion in TABLAS.items():
+        if not os.path.exists(definicion["archivo"]):
+            continue
+        filas = [fila for fila in excel.leer(tabla) if any(valor is not None for valor in fila)]
+        base.vaciar(tabla)
+        base.agregar(tabla, filas)
+        print(f"{tabla}: {len(filas)} filas importadas.")
+
+def exportar_sqlite_a_excel(ruta=archivo_sqlite):
+    """Reescribe los archivos Excel con el contenido de la base SQLite."""
+    base = AlmacenamientoSQLite(ruta)
+    for tabla, definicion in TABLAS.items():
+        filas = base.leer(tabla)
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.append(definicion["encabezados"])
+        for fila in filas:
+            ws.append(list(fila))
+        with BloqueoArchivo(definicion["archivo"]):
+            guardar_libro(wb, definicion["archivo"])
+            guardar_borrados(definicion["archivo"], {})
+        print(f"{tabla}: {len(filas)} filas exportadas.")
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2 or sys.argv[1] not in ("importar", "exportar"):
+        print("Uso: python almacenamiento.py importar|exportar")
+        sys.exit(1)
+    if sys.argv[1] == "importar":
+        importar_excel_a_sqlite()
+    else:
+        exportar_sqlite_a_excel()
@@ -1,70 +1,83 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import openpyxl
-import os
-from datetime import datetime
-
-archivo_asistencia = os.path.join(os.path.dirname(__file__), '../data/asistencia.xlsx')
-archivo_docentes = os.path.join(os.path.dirname(__file__), '../data/docentes.xlsx')
+from datetime import datetime, time
+from almacen_asistencia import obtener_almacen, normalizar_fecha
+from indice_docentes import obtener_indice, normalizar_ci
+from tabla_virtual import TablaVirtual
+from tareas import obtener_ejecutor
+from almacenamiento import obtener_backend
+from cliente_asistencia import obtener_cliente
+from calendario import describir_clase
 
 def verificar_archivo_asistencia():
     """Verifica si el archivo de asistencia existe, si no lo crea vacío con encabezados."""
-    if not os.path.exists(archivo_asistencia):
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.append(["C.I.", "Nombre", "Fecha", "Hora Entrada", "Hora Salida"])
-        wb.save(archivo_asistencia)
-        print("Archivo de asistencia creado con encabezados.")
-
-def actualizar_lista_asistencia(tree):
-    """Actualiza la tabla de asistencia en la ventana."""
-    for row in tree.get_children():
-        tree.delete(row)
-
-    wb = openpyxl.load_workbook(archivo_asistencia)
-    ws = wb.active
-    for row in ws.iter_rows(min_row=2, values_only=True):
-        values = list(row)
-        if values[4] is None or values[4] == "":
-            values[4] = "En Proceso"
-            tag = 'in_progress'
-        else:
-            tag = ''
-
-        if isinstance(values[2], datetime):
-            values[2] = values[2].strftime("%Y-%m-%d")
-        if isinstance(values[3], datetime):
-            values[3] = values[3].strftime("%H:%M:%S")
-        if isinstance(values[4], datetime):
-            values[4] = values[4].strftime("%H:%M:%S")
-
-        tree.insert("", "end", values=values, tags=(tag,))
-    print("Lista de asistencia actualizada en la tabla.", values)
+    obtener_backend().verificar("asistencia")
+
+def formatear_fila_asistencia(values):
+    """Prepara una fila de asistencia para mostrarla en la tabla y devuelve también su etiqueta."""
+    values = list(values)
+    if values[4] is None or values[4] == "":
+        values[4] = "En Proceso"
+        tag = 'in_progress'
+    else:
+        tag = ''
+
+    if isinstance(values[2], datetime):
+        values[2] = values[2].strftime("%Y-%m-%d")
+    if isinstance(values[3], (datetime, time)):
+        values[3] = values[3].strftime("%H:%M:%S")
+    if isinstance(values[4], (datetime, time)):
+        values[4] = values[4].strftime("%H:%M:%S")
+    return values, tag
+
+def origen_asistencia():
+    """Devuelve el cliente del servidor de asistencia si está configurado (ECOS_SERVIDOR), si no el almacén local."""
+    return obtener_cliente() or obtener_almacen()
+
+def leer_asistencia(desde=None, hasta=None):
+    """Devuelve [(índice, fila)] de los registros entre las fechas dadas (hoy por defecto)."""
+    hoy = datetime.now().strftime("%Y-%m-%d")
+    return origen_asistencia().filas_entre(desde or hoy, hasta or hoy)
+
+def actualizar_lista_asistencia(tabla, desde=None, hasta=None, registros=None):
+    """Actualiza la tabla de asistencia en la ventana con los registros entre las fechas dadas (hoy por defecto),
+    o con los registros ya leídos si se pasan."""
+    if registros is None:
+        registros = leer_asistencia(desde, hasta)
+
+    filas, etiquetas, claves = [], [], []
+    for indice, fila in registros:
+        values, tag = formatear_fila_asistencia(fila)
+        filas.append(values)
+        etiquetas.append(tag)
+        claves.append(indice)
+
+    # Las claves de la tabla son las posiciones en el almacén, así un registro nuevo solo toca su fila
+    tabla.cargar(filas, etiquetas, claves, mostrar_final=True)
+    print(f"Lista de asistencia actualizada en la tabla: {len(filas)} registros.")
+
+def mostrar_registro(tabla, indice, fila=None):
+    """Agrega o actualiza en la tabla solo la fila del registro indicado."""
+    values, tag = formatear_fila_asistencia(fila if fila is not None else origen_asistencia().obtener_fila(indice))
+    if indice in tabla.posiciones:
+        tabla.actualizar_fila(indice, values, tag)
+    else:
+        tabla.agregar_fila(values, tag, clave=indice)
 
 def registrar_entrada(ci, nombre):
     """Registra la hora de entrada del docente."""
-    fecha = datetime.now().strftime("%Y-%m-%d")
-    hora_entrada = datetime.now().strftime("%H:%M:%S")
-    wb = openpyxl.load_workbook(archivo_asistencia)
-    ws = wb.active
-    ws.append([ci, nombre, fecha, hora_entrada, None])
-    wb.save(archivo_asistencia)
+    origen_asistencia().registrar_entrada(ci, nombre)
     print(f"Hora de entrada registrada para {ci} - {nombre}")
 
 def registrar_salida(ci):
     """Registra la hora de salida del docente."""
-    wb = openpyxl.load_workbook(archivo_asistencia)
-    ws = wb.active
-    for row in ws.iter_rows(min_row=2):
-        if row[0].value == ci and (row[4].value is None or row[4].value == ""):
-            row[4].value = datetime.now().strftime("%H:%M:%S")
-            break
-    wb.save(archivo_asistencia)
+    origen_asistencia().registrar_salida(ci)
     print(f"Hora de salida registrada para {ci}")
 
 def abrir_registro_asistencia(root_menu):
     """Abre la ventana para registrar la asistencia de los docentes."""
-    verificar_archivo_asistencia()
+    if obtener_cliente() is None:
+        verificar_archivo_asistencia()
 
     # Evitar múltiples ventanas abiertas
     if hasattr(abrir_registro_asistencia, "ventana") and abrir_registro_asistencia.ventana.winfo_exists():
@@ -91,18 +104,38 @@ def abrir_registro_asistencia(root_menu):
     frame_table = tk.Frame(frame_main, bg='#e0e0e0')
     frame_table.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
 
+    # Filtro por rango de fechas (por defecto solo el día de hoy)
+    hoy = datetime.now().strftime("%Y-%m-%d")
+    filtro_frame = tk.Frame(frame_table, bg='#e0e0e0')
+    filtro_frame.pack(pady=5, anchor='w')
+
+    tk.Label(filtro_frame, text="Desde (AAAA-MM-DD):", bg='#e0e0e0', font=('Arial', 10)).pack(side=tk.LEFT, padx=5)
+    entry_desde = tk.Entry(filtro_frame, width=12)
+    entry_desde.insert(0, hoy)
+    entry_desde.pack(side=tk.LEFT, padx=5)
+    tk.Label(filtro_frame, text="Hasta:", bg='#e0e0e0', font=('Arial', 10)).pack(side=tk.LEFT, padx=5)
+    entry_hasta = tk.Entry(filtro_frame, width=12)
+    entry_hasta.insert(0, hoy)
+    entry_hasta.pack(side=tk.LEFT, padx=5)
+    tk.Button(filtro_frame, text="Filtrar", command=lambda: filtrar(), bg='#212121', fg='white').pack(side=tk.LEFT, padx=5)
+
     # Tabla de asistencia
     columns = ["C.I.", "Nombre", "Fecha", "Hora Entrada", "Hora Salida"]
-    tree = ttk.Treeview(frame_table, columns=columns, show="headings", height=10)
-    
-    for col in columns:
-        tree.heading(col, text=col)
-        tree.column(col, width=110, anchor="center")
-    
-    tree.tag_configure('in_progress', background='lightgoldenrodyellow')
-    tree.pack(pady=10, fill=tk.BOTH, expand=True)
+    tabla = TablaVirtual(frame_table, columns)
+    tabla.tree.tag_configure('in_progress', background='lightgoldenrodyellow')
+
+    lbl_estado = tk.Label(frame_table, text="", bg='#e0e0e0', font=('Arial', 10))
+    lbl_estado.pack(anchor="w")
 
-    actualizar_lista_asistencia(tree)
+    ejecutor = obtener_ejecutor(root_menu)
+    # Con un servidor de asistencia configurado los registros se hacen en el servidor, que valida el C.I.
+    remoto = obtener_cliente() is not None
+
+    def filtrar():
+        """Lee en segundo plano los registros del rango de fechas y los muestra."""
+        ejecutor.ejecutar(leer_asistencia, entry_desde.get().strip(), entry_hasta.get().strip(), estado=lbl_estado,
+                          mensaje="Cargando asistencia...",
+                          al_terminar=lambda registros: actualizar_lista_asistencia(tabla, registros=registros))
 
     # Botón para volver al menú
     tk.Button(root, text="Volver al Menú", command=lambda: volver_al_menu(root, root_menu), 
@@ -131,41 +164,39 @@ def abrir_registro_asistencia(root_menu):
 
         def registrar_asistencia(event=None):
             """Registra la asistencia del docente."""
-            ci = entry_ci.get().strip()
+            ci = normalizar_ci(entry_ci.get())
 
             if not ci:
                 messagebox.showwarning("Campo incompleto", "El campo C.I. es obligatorio.", parent=modal)
                 return
 
-            wb_docentes = openpyxl.load_workbook(archivo_docentes)
-            ws_docentes = wb_docentes.active
-            docentes_dict = {str(row[0]).strip(): str(row[1]).strip() for row in ws_docentes.iter_rows(min_row=2, values_only=True)}
-
-            if ci not in docentes_dict:
+            # El índice de docentes ya se leyó al abrir la ventana; solo se relee si el archivo cambió
+            nombre = None if remoto else obtener_indice().nombre(ci)
+            if not remoto and nombre is None:
                 messagebox.showerror("C.I. no encontrado", "El C.I. ingresado no corresponde a ningún docente.", parent=modal)
                 return
 
-            nombre = docentes_dict[ci]
-            wb = openpyxl.load_workbook(archivo_asistencia)
-            ws = wb.active
+            # Si ya se registró la entrada hoy sin salida se registra la salida
+            ejecutor.ejecutar(registrar_y_leer, ci, nombre, estado=lbl_estado, mensaje="Registrando...",
+                              al_terminar=mostrar_resultado,
+                              al_fallar=lambda e: messagebox.showerror("Error", str(e), parent=modal))
 
-            # Verificar si ya se registró la entrada hoy sin salida
-            entrada_registrada = False
-            for row in ws.iter_rows(min_row=2):
-                if row[0].value == ci and row[2].value == datetime.now().strftime("%Y-%m-%d") and (row[4].value is None or row[4].value == ""):
-                    entrada_registrada = True
-                    row[4].value = datetime.now().strftime("%H:%M:%S")
-                    print(f"Hora de salida registrada para {ci} - {nombre}")
-                    break
+        def registrar_y_leer(ci, nombre):
+            """Registra la asistencia (en el almacén local o en el servidor) y devuelve también la fila registrada
+            y la clase en curso o la próxima del docente."""
+            origen = origen_asistencia()
+            tipo, indice = origen.registrar(ci, nombre)
+            aviso = "" if remoto else describir_clase(ci)
+            return tipo, indice, origen.obtener_fila(indice), aviso
 
-            if not entrada_registrada:
-                registrar_entrada(ci, nombre)
-                messagebox.showinfo("Éxito", "Hora de entrada registrada correctamente.", parent=modal)
-            else:
-                wb.save(archivo_asistencia)
-                messagebox.showinfo("Éxito", "Hora de salida registrada correctamente.", parent=modal)
+        def mostrar_resultado(resultado):
+            tipo, indice, fila, aviso = resultado
+            print(f"Hora de {tipo} registrada para {fila[0]} - {fila[1]}")
+            messagebox.showinfo("Éxito", f"Hora de {tipo} registrada correctamente.\n{aviso}".strip(), parent=modal)
 
-            actualizar_lista_asistencia(tree)
+            # Solo se agrega o modifica la fila registrada si entra en el rango de fechas mostrado
+            if entry_desde.get().strip() <= normalizar_fecha(fila[2]) <= entry_hasta.get().strip():
+                mostrar_registro(tabla, indice, fila)
 
             entry_ci.delete(0, tk.END)
 
@@ -182,7 +213,18 @@ def abrir_registro_asistencia(root_menu):
         y = (modal.winfo_screenheight() // 2) - (height // 2)
         modal.geometry(f'{width}x{height}+{x}+{y}')
 
-    root.after(500, mostrar_modal)
+    def cargar_datos():
+        """Carga el almacén de asistencia (solo la primera vez), el índice de docentes y los registros de hoy
+        fuera del hilo de la ventana."""
+        if not remoto:
+            obtener_indice()
+        return leer_asistencia()
+
+    def mostrar_datos(registros):
+        actualizar_lista_asistencia(tabla, registros=registros)
+        mostrar_modal()
+
+    ejecutor.ejecutar(cargar_datos, estado=lbl_estado, mensaje="Cargando asistencia...", al_terminar=mostrar_datos)
     root.mainloop()
 
 def volver_al_menu(root_actual, root_menu):
@@ -0,0 +1,77 @@
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+TIEMPO_ESPERA = 10.0  # Segundos máximos esperando a que otro proceso suelte el archivo
+INTERVALO_REINTENTO = 0.05
+
+# Candados entre hilos del mismo proceso, uno por archivo
+_candados = {}
+_lock = threading.Lock()
+
+def _candado_local(ruta):
+    with _lock:
+        return _candados.setdefault(ruta, threading.Lock())
+
+def _bloquear(archivo):
+    """Intenta tomar el candado del sistema operativo sin esperar; lanza OSError si está tomado."""
+    if fcntl is not None:
+        fcntl.flock(archivo.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    else:
+        archivo.seek(0)
+        msvcrt.locking(archivo.fileno(), msvcrt.LK_NBLCK, 1)
+
+def _desbloquear(archivo):
+    if fcntl is not None:
+        fcntl.flock(archivo.fileno(), fcntl.LOCK_UN)
+    else:
+        archivo.seek(0)
+        msvcrt.locking(archivo.fileno(), msvcrt.LK_UNLCK, 1)
+
+class BloqueoArchivo:
+    """Candado exclusivo sobre un archivo de datos, entre hilos y entre procesos (también de otras PCs
+    si el disco compartido respeta los candados). Se toma sobre ruta + ".lock" porque el archivo de datos
+    se reemplaza en cada guardado.
+
+    Uso: with BloqueoArchivo(ruta): ..."""
+
+    def __init__(self, ruta, tiempo_espera=TIEMPO_ESPERA):
+        self.ruta = os.path.abspath(ruta)
+        self.tiempo_espera = tiempo_espera
+        self.archivo = None
+
+    def __enter__(self):
+        limite = time.monotonic() + self.tiempo_espera
+        self._local = _candado_local(self.ruta)
+        if not self._local.acquire(timeout=self.tiempo_espera):
+            raise TimeoutError(f"El archivo {self.ruta} está ocupado.")
+        try:
+            self.archivo = open(self.ruta + ".lock", "a+b")
+            while True:
+                try:
+                    _bloquear(self.archivo)
+                    return self
+                except OSError:
+                    if time.monotonic() >= limite:
+                        raise TimeoutError(f"El archivo {self.ruta} está ocupado por otro proceso.") from None
+                    time.sleep(INTERVALO_REINTENTO)
+        except BaseException:
+            if self.archivo is not None:
+                self.archivo.close()
+                self.archivo = None
+            self._local.release()
+            raise
+
+    def __exit__(self, *excepcion):
+        try:
+            _desbloquear(self.archivo)
+        finally:
+            self.archivo.close()
+            self.archivo = None
+            self._local.release()
@@ -0,0 +1,84 @@
+"""Marcas de borrado de las tablas Excel.
+
+Borrar una fila con ws.delete_rows obliga a cargar todo el libro, correr las filas siguientes y volver a
+guardarlo. En su lugar, la fila se marca como borrada en un archivo al lado del Excel (materias.xlsx.borrados)
+y los lectores la saltan; el archivo solo se reescribe al compactar. La marca guarda también el contenido de
+la fila, así una marca que ya no corresponde (porque el archivo se editó a mano) se ignora.
+
+Cada fila tiene un id que no cambia: las filas del archivo se numeran en orden saltando los huecos, que son
+los ids de las filas que ya se quitaron al compactar. Así el id de una fila es igual a su posición hasta la
+primera compactación, y las filas agregadas al final reciben ids nuevos.
+"""
+import json
+import os
+import threading
+import cache_libros
+
+# Marcas ya leídas: ruta del archivo de marcas -> (firma, (borrados, huecos))
+_cache = {}
+_lock = threading.Lock()
+
+def ruta_borrados(ruta):
+    return ruta + ".borrados"
+
+def firma_borrados(ruta):
+    """Versión del archivo de marcas, o () si no hay filas borradas."""
+    marcas = ruta_borrados(ruta)
+    return cache_libros.firma(marcas) if os.path.exists(marcas) else ()
+
+def leer_borrados(ruta):
+    """Devuelve (borrados, huecos): {id: contenido} de las filas marcadas como borradas y los rangos
+    [inicio, fin) de ids de las filas ya quitadas del archivo (desde la caché si no cambió)."""
+    marcas = ruta_borrados(os.path.abspath(ruta))
+    if not os.path.exists(marcas):
+        return {}, []
+    firma_actual = cache_libros.firma(marcas)
+    with _lock:
+        guardado = _cache.get(marcas)
+        if guardado is not None and guardado[0] == firma_actual:
+            return guardado[1]
+    with open(marcas, encoding="utf-8") as archivo:
+        datos = json.load(archivo)
+    borrados = {int(id_fila): contenido for id_fila, contenido in datos.get("borrados", {}).items()}
+    huecos = [tuple(rango) for rango in datos.get("huecos", [])]
+    with _lock:
+        _cache[marcas] = (firma_actual, (borrados, huecos))
+    return borrados, huecos
+
+def guardar_borrados(ruta, borrados, huecos=()):
+    """Reemplaza las marcas y los huecos de la tabla; si no queda nada se elimina el archivo de marcas.
+    Se llama con el candado del archivo de la tabla tomado."""
+    marcas = ruta_borrados(os.path.abspath(ruta))
+    if not borrados and not huecos:
+        if os.path.exists(marcas):
+            os.remove(marcas)
+        return
+    temporal = marcas + ".tmp"
+    with open(temporal, "w", encoding="utf-8") as archivo:
+        json.dump({"huecos": [list(rango) for rango in huecos],
+                   "borrados": {str(id_fila): contenido for id_fila, contenido in sorted(borrados.items())}},
+                  archivo, ensure_ascii=False)
+    os.replace(temporal, marcas)
+
+def ids_filas(cantidad, huecos):
+    """Devuelve los ids de las primeras cantidad filas del archivo, saltando los huecos."""
+    ids = []
+    siguiente = 0
+    for inicio, fin in huecos:
+        if len(ids) >= cantidad:
+            break
+        ids.extend(range(siguiente, min(inicio, siguiente + cantidad - len(ids))))
+        siguiente = fin
+    ids.extend(range(siguiente, siguiente + cantidad - len(ids)))
+    return ids
+
+def agregar_huecos(huecos, ids):
+    """Devuelve los huecos con los ids quitados agregados, como rangos ordenados y unidos."""
+    rangos = sorted(list(huecos) + [(id_fila, id_fila + 1) for id_fila in ids])
+    unidos = []
+    for inicio, fin in rangos:
+        if unidos and inicio <= unidos[-1][1]:
+            unidos[-1] = (unidos[-1][0], max(unidos[-1][1], fin))
+        else:
+            unidos.append((inicio, fin))
+    return unidos
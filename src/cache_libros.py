@@ -0,0 +1,54 @@
+import openpyxl
+import os
+import threading
+
+# Filas ya leídas de cada archivo Excel: ruta -> (firma del archivo, filas)
+_cache = {}
+_lock = threading.Lock()
+_contadores = {"aciertos": 0, "fallos": 0}
+
+def firma(ruta):
+    """Identifica la versión del archivo por su fecha de modificación y tamaño."""
+    estado = os.stat(ruta)
+    return (estado.st_mtime_ns, estado.st_size)
+
+def leer_filas(ruta):
+    """Devuelve las filas de la hoja activa sin el encabezado, reutilizando la lectura anterior
+    si el archivo no cambió desde entonces."""
+    ruta = os.path.abspath(ruta)
+    firma_actual = firma(ruta)
+    with _lock:
+        guardado = _cache.get(ruta)
+        if guardado is not None and guardado[0] == firma_actual:
+            _contadores["aciertos"] += 1
+            return list(guardado[1])
+        _contadores["fallos"] += 1
+
+    filas = leer_filas_sin_cache(ruta)
+    with _lock:
+        _cache[ruta] = (firma_actual, filas)
+    return list(filas)
+
+def leer_filas_sin_cache(ruta):
+    """Lee la hoja en modo de solo lectura: openpyxl recorre el XML fila por fila sin crear un objeto
+    por celda ni cargar toda la hoja en memoria. Se omiten las filas completamente vacías."""
+    wb = openpyxl.load_workbook(ruta, read_only=True, data_only=True)
+    try:
+        ws = wb.active
+        return [tuple(row) for row in ws.iter_rows(min_row=2, values_only=True)
+                if any(valor is not None for valor in row)]
+    finally:
+        wb.close()
+
+def invalidar(ruta=None):
+    """Descarta las filas guardadas de un archivo (o de todos) después de escribirlo desde la aplicación."""
+    with _lock:
+        if ruta is None:
+            _cache.clear()
+        else:
+            _cache.pop(os.path.abspath(ruta), None)
+
+def estadisticas():
+    """Devuelve los contadores de aciertos y fallos de la caché."""
+    with _lock:
+        return dict(_contadores, archivos=len(_cache))
@@ -0,0 +1,18 @@
+from datetime import datetime
+
+def calcular_horas_trabajadas(hora_inicio, hora_fin):
+    """Calcula las horas trabajadas dada la hora de inicio y la hora de fin."""
+    formato = "%H:%M"
+    h_inicio = datetime.strptime(hora_inicio, formato)
+    h_fin = datetime.strptime(hora_fin, formato)
+    diferencia = h_fin - h_inicio
+    horas_trabajadas = diferencia.total_seconds() / 3600
+    return horas_trabajadas
+
+def validar_hora(hora):
+    """Valida que la hora esté en el formato HH:MM."""
+    try:
+        datetime.strptime(hora, "%H:%M")
+        return True
+    except ValueError:
+        return False
@@ -0,0 +1,226 @@
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, time
+from almacenamiento import obtener_backend
+from indice_docentes import obtener_indice, normalizar_ci
+import historico
+from calendario import (CalendarioMes, obtener_calendario, obtener_horarios, obtener_feriados,
+                        convertir_hora_programada, fechas_del_dia)
+
+# Diccionario para mapear los nombres de los meses en español a números
+meses_espanol = {
+    "Enero": 1,
+    "Febrero": 2,
+    "Marzo": 3,
+    "Abril": 4,
+    "Mayo": 5,
+    "Junio": 6,
+    "Julio": 7,
+    "Agosto": 8,
+    "Septiembre": 9,
+    "Octubre": 10,
+    "Noviembre": 11,
+    "Diciembre": 12
+}
+
+# Reportes ya calculados: (C.I., mes, año, versiones de los datos) -> resultado de generar_reporte.
+# Se descarta el usado hace más tiempo cuando hay más de TAMANO_CACHE_REPORTES.
+TAMANO_CACHE_REPORTES = 128
+_reportes = OrderedDict()
+_lock_reportes = threading.Lock()
+
+def verificar_archivo_asistencia():
+    """Verifica si el archivo de asistencia existe, si no lo crea vacío con encabezados."""
+    obtener_backend().verificar("asistencia")
+
+def obtener_docentes():
+    """Obtiene los docentes como C.I. -> (nombre, pago por hora) desde el índice de docentes."""
+    return obtener_indice().docentes()
+
+def obtener_horario(ci):
+    """Obtiene el horario del docente del archivo de horarios."""
+    return obtener_horarios().get(ci, {})
+
+def obtener_asistencia_mes(mes, year, ci=None):
+    """Agrupa por C.I. las filas del mes: las de la partición del archivo histórico, si el mes está archivado,
+    y las del archivo de asistencia en uso, que se recorre una sola vez."""
+    asistencia = {}
+    archivadas = set()
+    for row in historico.leer_mes(mes, year, ci):
+        asistencia.setdefault(row[0], []).append(row)
+        archivadas.add(historico.firma_fila(row))
+    for row in obtener_backend().leer("asistencia"):
+        if row[0] is None or row[2] is None:
+            continue
+        fecha = row[2]
+        if isinstance(fecha, str):
+            fecha = datetime.strptime(fecha.strip(), '%Y-%m-%d')
+        ci_fila = normalizar_ci(row[0])
+        if fecha.month == mes and fecha.year == year and (ci is None or ci_fila == ci):
+            if archivadas and historico.firma_fila(row) in archivadas:
+                continue  # Fila que quedó en el archivo en uso aunque ya se archivó
+            asistencia.setdefault(ci_fila, []).append(row)
+    return asistencia
+
+def guardar_asistencia_pendiente():
+    """Los registros nuevos quedan unos segundos solo en memoria y en el diario antes de llegar al archivo de
+    asistencia: se guardan antes de leerlo para que el reporte coincida con los totales de los agregados."""
+    from almacen_asistencia import guardar_pendientes  # almacen_asistencia importa este módulo vía agregados
+    guardar_pendientes()
+
+def cargar_datos_mes(mes, year, ci=None):
+    """Lee una sola vez docentes, horarios y asistencia del mes para generar uno o varios reportes."""
+    guardar_asistencia_pendiente()
+    return {
+        "docentes": obtener_docentes(),
+        "horarios": obtener_horarios(),
+        "asistencia": obtener_asistencia_mes(mes, year, ci),
+        "feriados": obtener_feriados(),
+        "calendario": obtener_calendario(mes, year),
+    }
+
+def obtener_dias_mes(year, month, dia):
+    """Obtiene todos los días específicos (e.g., lunes) de un mes y año dados."""
+    return [fecha.strftime("%Y-%m-%d") for fecha in fechas_del_dia(year, month, dia)]
+
+def obtener_anios_disponibles():
+    """Obtiene los años disponibles: los del archivo histórico salen de los nombres de las particiones
+    y solo se recorre el archivo de asistencia en uso."""
+    obtener_backend().verificar("asistencia")
+    anios = set(historico.anios_archivados())
+
+    for row in obtener_backend().leer("asistencia"):
+        try:
+            fecha = row[2]
+            if isinstance(fecha, str):
+                fecha = datetime.strptime(fecha, "%Y-%m-%d")
+            anios.add(fecha.year)
+        except Exception as e:
+            print(f"Error procesando la fecha {row[2]}: {e}")
+
+    return sorted(anios)
+
+def convertir_hora(fecha, hora):
+    """Combina la fecha con la hora, que puede venir como time o como texto HH:MM:SS."""
+    if isinstance(hora, str) and hora.strip():
+        hora = datetime.strptime(hora.strip(), "%H:%M:%S").time()
+    if isinstance(hora, time):
+        return datetime.combine(fecha, hora)
+    return hora or None
+
+def calcular_retraso(entrada, hora_programada):
+    if isinstance(entrada, str):
+        entrada = datetime.strptime(entrada, "%H:%M:%S")
+
+    if isinstance(hora_programada, str):
+        hora_programada = datetime.strptime(hora_programada, "%H:%M:%S")
+
+    if entrada.time() > hora_programada.time():
+        retraso = (entrada - hora_programada).seconds // 60
+    else:
+        retraso = 0
+    return retraso
+
+def calcular_deduccion(retraso_minutos):
+    """Calcula la deducción en función de los minutos de retraso."""
+    if retraso_minutos <= 5:
+        return 5
+    else:
+        return 10
+
+def calcular_asistencia(fecha, hora_entrada, hora_salida, horas_programadas):
+    """Aplica las reglas del reporte a un registro de asistencia de un día con clases.
+    Devuelve (horas trabajadas, minutos de retraso, deducción)."""
+    retraso_minutos = sum(calcular_retraso(hora_entrada, datetime.combine(fecha, hora_programada))
+                          for hora_programada in horas_programadas)
+    deduccion = calcular_deduccion(retraso_minutos)
+    if hora_salida is None:
+        horas_trabajadas = 0
+    else:
+        horas_trabajadas = round((hora_salida - hora_entrada).seconds / 3600, 2)
+    return horas_trabajadas, retraso_minutos, deduccion
+
+def formatear_retraso(retraso_minutos):
+    """Formatea el retraso en formato HH:MM:SS."""
+    horas, minutos = divmod(retraso_minutos, 60)
+    return f"{horas:02}:{minutos:02}:00"
+
+def versiones_datos(mes, year):
+    """Versiones de todo lo que usa el reporte de un mes; si cambia alguna, el reporte se vuelve a calcular."""
+    backend = obtener_backend()
+    return (tuple(backend.version(tabla) for tabla in ("asistencia", "horarios", "docentes", "feriados"))
+            + (historico.version_mes(mes, year),))
+
+def _copiar_reporte(resultado):
+    registros, *totales = resultado
+    return ([list(registro) for registro in registros], *totales)
+
+def generar_reporte(ci, mes, year, datos=None):
+    """Genera el reporte de horas trabajadas y deducciones para un docente y mes específico.
+    Si se pasan los datos ya cargados con cargar_datos_mes no se vuelve a leer ningún archivo; si no, se
+    reutiliza el último reporte calculado del docente y mes mientras no cambien los datos."""
+    if datos is None:
+        guardar_asistencia_pendiente()
+        # Las versiones se toman antes de leer: si los datos cambian mientras tanto, el reporte queda
+        # guardado con las versiones viejas y no se vuelve a usar
+        clave = (ci, mes, year, versiones_datos(mes, year))
+        with _lock_reportes:
+            guardado = _reportes.get(clave)
+            if guardado is not None:
+                _reportes.move_to_end(clave)
+                return _copiar_reporte(guardado)
+        resultado = generar_reporte(ci, mes, year, cargar_datos_mes(mes, year, ci))
+        with _lock_reportes:
+            _reportes[clave] = resultado
+            _reportes.move_to_end(clave)
+            while len(_reportes) > TAMANO_CACHE_REPORTES:
+                _reportes.popitem(last=False)
+        return _copiar_reporte(resultado)
+
+    total_horas = 0
+    deducciones = 0
+    registros = []
+    total_retrasos = timedelta()
+
+    # Las sesiones esperadas del mes salen del calendario, que se arma una sola vez para todos los docentes
+    calendario = datos.get("calendario")
+    if calendario is None:
+        calendario = CalendarioMes(mes, year, {ci: datos["horarios"].get(ci, {})}, datos.get("feriados"))
+
+    registros_por_fecha = {}  # fecha -> primer registro programado ese día
+    horas_programadas_por_fecha = {}
+    for fecha, _, dia, materia, hora_inicio, _ in calendario.sesiones_docente(ci):
+        registro = [fecha, dia, materia, 0, "00:00:00", 0, "PRESENCIAL"]
+        registros.append(registro)
+        registros_por_fecha.setdefault(fecha, registro)
+        horas_programadas_por_fecha.setdefault(fecha, []).append(hora_inicio)
+
+    # Actualizar los registros con los datos de asistencia (las filas ya vienen filtradas por C.I., mes y año)
+    for row in datos["asistencia"].get(ci, []):
+        fecha = row[2]
+        if isinstance(fecha, str):
+            fecha = datetime.strptime(fecha.strip(), '%Y-%m-%d')  # Convierte a datetime si es un string
+        if isinstance(fecha, datetime):
+            fecha = fecha.date()  # Solo extrae la fecha (sin hora)
+
+        registro = registros_por_fecha.get(fecha)
+        hora_entrada = convertir_hora(fecha, row[3])
+        if registro is None or hora_entrada is None:
+            continue  # Asistencia en un día sin clases programadas o feriado
+        hora_salida = convertir_hora(fecha, row[4])
+
+        horas_trabajadas, retraso_minutos, deduccion = calcular_asistencia(
+            fecha, hora_entrada, hora_salida, horas_programadas_por_fecha[fecha])
+        total_horas += horas_trabajadas
+        deducciones += deduccion
+        total_retrasos += timedelta(minutes=retraso_minutos)
+
+        registro[3] = horas_trabajadas
+        registro[4] = formatear_retraso(retraso_minutos)
+        registro[5] = deduccion
+
+    # Los registros ya vienen ordenados por fecha desde el calendario
+    pago_por_hora = datos["docentes"][ci][1]
+    total_ganado = round(total_horas * pago_por_hora, 2)
+    neto_ganado = round(total_ganado - deducciones, 2)
+    return registros, round(total_horas, 2), total_ganado, round(deducciones, 2), neto_ganado
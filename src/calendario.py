@@ -0,0 +1,146 @@
+import threading
+from calendar import monthrange
+from datetime import date, datetime, time
+from almacenamiento import obtener_backend
+from indice_docentes import normalizar_ci
+
+DIAS_SEMANA = {'lunes': 0, 'martes': 1, 'miércoles': 2, 'jueves': 3, 'viernes': 4, 'sábado': 5, 'domingo': 6}
+
+# Días que se pueden elegir al cargar un horario
+DIAS_CLASE = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado"]
+
+# Calendarios ya armados: (mes, año) -> (versiones de horarios y feriados, calendario)
+_cache = {}
+_lock = threading.Lock()
+
+def fechas_del_dia(year, mes, dia):
+    """Devuelve las fechas del mes que caen en el día de la semana dado ('lunes', 'sábado', ...)."""
+    primero = date(year, mes, 1)
+    desplazamiento = (DIAS_SEMANA[dia.lower()] - primero.weekday()) % 7
+    return [date(year, mes, dia_mes) for dia_mes in range(1 + desplazamiento, monthrange(year, mes)[1] + 1, 7)]
+
+def convertir_hora_programada(hora):
+    """Convierte la hora de inicio del horario (texto HH:MM o time) a time."""
+    if isinstance(hora, time):
+        return hora
+    if isinstance(hora, datetime):
+        return hora.time()
+    return datetime.strptime(str(hora).strip()[:5], "%H:%M").time()
+
+def obtener_horarios():
+    """Obtiene el horario de todos los docentes en una sola lectura, agrupado por C.I."""
+    horarios = {}
+    obtener_backend().verificar("horarios")
+    for row in obtener_backend().leer("horarios"):
+        if row[0] is None or row[3] is None:
+            continue
+        ci = normalizar_ci(row[0])
+        materia = row[2]
+        dia = row[3].lower()  # Asegurarse de que el día esté en minúsculas
+        hora_inicio = row[4]
+        hora_fin = row[5]
+        horario = horarios.setdefault(ci, {})
+        if dia not in horario:
+            horario[dia] = []
+        horario[dia].append((materia, hora_inicio, hora_fin))
+    return horarios
+
+def obtener_feriados():
+    """Lee los feriados del archivo de feriados como {fecha: descripción}. Si el archivo no existe no hay
+    feriados: generar un reporte no crea archivos de datos."""
+    backend = obtener_backend()
+    feriados = {}
+    if backend.version("feriados") is None:  # El backend Excel devuelve None si el archivo no existe
+        return feriados
+    for row in backend.leer("feriados"):
+        fecha = row[0]
+        if fecha is None:
+            continue
+        try:
+            if isinstance(fecha, str):
+                fecha = datetime.strptime(fecha.strip()[:10], "%Y-%m-%d")
+            if isinstance(fecha, datetime):
+                fecha = fecha.date()
+            feriados[fecha] = row[1] if len(row) > 1 and row[1] is not None else ""
+        except ValueError as e:
+            print(f"Error al procesar el feriado {row}: {e}")
+    return feriados
+
+class CalendarioMes:
+    """Sesiones de clase esperadas en un mes para todos los docentes, ya expandidas a fechas.
+
+    Cada sesión es una tupla (fecha, ci, dia, materia, hora_inicio, hora_fin) con las horas como time.
+    Las sesiones quedan ordenadas por fecha y, dentro de un día, en el orden del archivo de horarios.
+    Los feriados no tienen sesiones."""
+
+    def __init__(self, mes, year, horarios, feriados=None):
+        self.mes = mes
+        self.year = year
+        self.feriados = {fecha: descripcion for fecha, descripcion in (feriados or {}).items()
+                         if fecha.year == year and fecha.month == mes}
+        sesiones = []
+        for ci, horario in horarios.items():
+            for dia, materias in horario.items():
+                fechas = [fecha for fecha in fechas_del_dia(year, mes, dia) if fecha not in self.feriados]
+                for materia, hora_inicio, hora_fin in materias:
+                    inicio = convertir_hora_programada(hora_inicio)
+                    fin = convertir_hora_programada(hora_fin)
+                    sesiones.extend((fecha, ci, dia.lower(), materia, inicio, fin) for fecha in fechas)
+        sesiones.sort(key=lambda sesion: sesion[0])  # Orden estable: conserva el orden del horario en cada día
+        self.sesiones = sesiones
+
+        self.por_ci = {}  # ci -> [sesiones del mes]
+        self.por_ci_fecha = {}  # (ci, fecha) -> [sesiones de ese día]
+        for sesion in sesiones:
+            self.por_ci.setdefault(sesion[1], []).append(sesion)
+            self.por_ci_fecha.setdefault((sesion[1], sesion[0]), []).append(sesion)
+
+    def sesiones_docente(self, ci):
+        """Devuelve las sesiones del mes del docente, ordenadas por fecha."""
+        return self.por_ci.get(ci, [])
+
+    def sesiones_del_dia(self, ci, fecha):
+        """Devuelve las sesiones del docente en la fecha dada."""
+        return self.por_ci_fecha.get((ci, fecha), [])
+
+    def es_feriado(self, fecha):
+        return fecha in self.feriados
+
+    def proxima_clase(self, ci, momento):
+        """Devuelve la sesión en curso o la siguiente del docente a partir del momento dado (o None)."""
+        hoy, ahora = momento.date(), momento.time()
+        candidatas = [sesion for sesion in self.sesiones_docente(ci)
+                      if sesion[0] > hoy or (sesion[0] == hoy and sesion[5] > ahora)]
+        return min(candidatas, key=lambda sesion: (sesion[0], sesion[4]), default=None)
+
+def obtener_calendario(mes, year):
+    """Devuelve el calendario del mes, armándolo de nuevo solo si cambiaron los horarios o los feriados."""
+    backend = obtener_backend()
+    versiones = (backend.version("horarios"), backend.version("feriados"))
+    with _lock:
+        guardado = _cache.get((mes, year))
+        if guardado is not None and guardado[0] == versiones:
+            return guardado[1]
+    calendario = CalendarioMes(mes, year, obtener_horarios(), obtener_feriados())
+    with _lock:
+        _cache[(mes, year)] = (versiones, calendario)
+    return calendario
+
+def describir_clase(ci, momento=None):
+    """Texto para el registro de asistencia con la clase en curso o la próxima del docente."""
+    momento = momento or datetime.now()
+    sesion = obtener_calendario(momento.month, momento.year).proxima_clase(ci, momento)
+    if sesion is None:
+        siguiente_mes = (momento.month % 12 + 1, momento.year + (momento.month == 12))
+        sesion = obtener_calendario(*siguiente_mes).proxima_clase(ci, momento)
+    if sesion is None:
+        return "No tiene clases programadas."
+    fecha, _, dia, materia, inicio, fin = sesion
+    if fecha != momento.date():
+        return f"Próxima clase: {materia}, {dia} {fecha:%d/%m} a las {inicio:%H:%M}."
+    texto = f"Clase: {materia} de {inicio:%H:%M} a {fin:%H:%M}."
+    if momento.time() > inicio:
+        retraso = (momento - datetime.combine(fecha, inicio)).seconds // 60
+        if retraso > 0:
+            texto += f" Retraso: {retraso} min."
+    return texto
@@ -0,0 +1,235 @@
+"""Uso sin ventanas del sistema de asistencia, para tareas programadas (cron) y lectores de credenciales.
+
+Ejemplos:
+    python -m src.cli report --month 3 --year 2025 --all
+    python -m src.cli report --month 3 --year 2025 --ci 6018008
+    python -m src.cli totals --month 3 --year 2025 --audit
+    python -m src.cli scan 6018008
+    python -m src.cli archive --hasta 2025-06
+    python -m src.cli conflicts
+    python -m src.cli bulk horarios horarios_nuevos.csv --validar
+    python -m src.cli import
+    python -m src.cli export
+
+Este módulo no importa tkinter: cada comando carga solo los módulos de cálculo que necesita.
+"""
+import argparse
+import os
+import sys
+
+# Los módulos del proyecto se importan por nombre, como cuando se ejecuta main.py desde src
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+def comando_report(args):
+    """Genera los reportes del mes: todos a Excel, uno en pantalla o los totales de cada docente."""
+    from calculo_reporte import cargar_datos_mes, generar_reporte
+    from exportador import exportar_reportes_mes, carpeta_reportes
+
+    if args.all:
+        rutas = exportar_reportes_mes(args.month, args.year, args.carpeta or carpeta_reportes, procesos=args.procesos)
+        for ruta in rutas:
+            print(ruta)
+        return 0
+
+    datos = cargar_datos_mes(args.month, args.year, args.ci)
+    if args.ci:
+        if args.ci not in datos["docentes"]:
+            print(f"El C.I. {args.ci} no corresponde a ningún docente.", file=sys.stderr)
+            return 1
+        registros, total_horas, total_ganado, deducciones, neto_ganado = generar_reporte(args.ci, args.month, args.year, datos)
+        print("Fecha\tDía\tMateria\tHoras\tRetraso\tDescuento\tModalidad")
+        for registro in registros:
+            print("\t".join(str(valor) for valor in registro))
+        print(f"Total Horas: {total_horas}\tTotal Ganado: Bs {total_ganado}\t"
+              f"Deducciones: Bs {deducciones}\tNeto Ganado: Bs {neto_ganado}")
+        return 0
+
+    print("C.I.\tNombre\tHoras\tGanado\tDeducciones\tNeto")
+    for ci, (nombre, _) in datos["docentes"].items():
+        _, total_horas, total_ganado, deducciones, neto_ganado = generar_reporte(ci, args.month, args.year, datos)
+        print(f"{ci}\t{nombre}\t{total_horas}\t{total_ganado}\t{deducciones}\t{neto_ganado}")
+    return 0
+
+def abrir_almacen():
+    """Devuelve el almacén de asistencia, o None si ya lo tiene abierto otro programa (la ventana, el kiosco o
+    el servidor): dos almacenes sobre el mismo diario guardarían dos veces los mismos registros."""
+    from almacen_asistencia import obtener_almacen
+    from diario_asistencia import DiarioOcupado
+
+    try:
+        return obtener_almacen()
+    except DiarioOcupado as e:
+        print(e, file=sys.stderr)
+        return None
+
+def comando_totals(args):
+    """Muestra los totales del mes desde los agregados; con --audit los compara con generar_reporte."""
+    from calculo_reporte import cargar_datos_mes, generar_reporte
+
+    almacen = abrir_almacen()
+    if almacen is None:
+        return 1
+    if args.recalcular:
+        almacen.recalcular_agregados(args.month, args.year)
+    datos = cargar_datos_mes(args.month, args.year)
+    diferencias = 0
+    print("C.I.\tNombre\tHoras\tGanado\tDeducciones\tNeto\tRetraso\tAsistidas\tFaltadas")
+    for ci, (nombre, pago_por_hora) in datos["docentes"].items():
+        totales = almacen.totales(ci, args.month, args.year, pago_por_hora)
+        valores = (totales["total_horas"], totales["total_ganado"], totales["deducciones"], totales["neto_ganado"])
+        print(f"{ci}\t{nombre}\t" + "\t".join(str(valor) for valor in valores) +
+              f"\t{totales['retraso_minutos']}\t{totales['sesiones_asistidas']}\t{totales['sesiones_faltadas']}")
+        if args.audit:
+            esperado = tuple(generar_reporte(ci, args.month, args.year, datos)[1:])
+            if esperado != valores:
+                diferencias += 1
+                print(f"Diferencia en {ci}: agregados {valores}, reporte {esperado}", file=sys.stderr)
+    almacen.cerrar()
+    return 1 if diferencias else 0
+
+def comando_scan(args):
+    """Registra la entrada o la salida de un docente, igual que el modal de Registro de Asistencia.
+    Con ECOS_SERVIDOR configurado el registro se hace en el servidor, que valida el C.I."""
+    from cliente_asistencia import obtener_cliente
+    from indice_docentes import obtener_indice, normalizar_ci
+
+    ci = normalizar_ci(args.ci)
+    cliente = obtener_cliente()
+    if cliente is not None:
+        try:
+            tipo, indice = cliente.registrar(ci)
+            fila = cliente.obtener_fila(indice)
+        except (ValueError, OSError) as e:
+            print(f"No se pudo registrar en el servidor: {e}", file=sys.stderr)
+            return 1
+        hora = fila[3] if tipo == "entrada" else fila[4]
+        print(f"{tipo}\t{ci}\t{fila[1]}\t{fila[2]}\t{hora}")
+        return 0
+
+    nombre = obtener_indice().nombre(ci)
+    if nombre is None:
+        print(f"El C.I. {ci} no corresponde a ningún docente.", file=sys.stderr)
+        return 1
+
+    almacen = abrir_almacen()
+    if almacen is None:
+        return 1
+    tipo, indice = almacen.registrar(ci, nombre)
+    fila = almacen.obtener_fila(indice)
+    hora = fila[3] if tipo == "entrada" else fila[4]
+    print(f"{tipo}\t{ci}\t{nombre}\t{fila[2]}\t{hora}")
+    # El registro ya está en el diario; al salir se guarda también en el almacenamiento
+    almacen.cerrar()
+    return 0
+
+def comando_archive(args):
+    """Pasa los meses cerrados del archivo de asistencia al archivo histórico particionado por año y mes."""
+    from datetime import datetime
+    from historico import archivar_meses
+
+    try:
+        hasta = datetime.strptime(args.hasta, "%Y-%m") if args.hasta else None
+    except ValueError:
+        print("El mes debe tener el formato AAAA-MM.", file=sys.stderr)
+        return 1
+    # Lo que quede en el diario se guarda en el archivo de asistencia antes de mover filas; con el almacén
+    # abierto en otro programa no se archiva, porque ese programa seguiría guardando las filas movidas
+    almacen = abrir_almacen()
+    if almacen is None:
+        return 1
+    almacen.cerrar()
+    try:
+        archivados = archivar_meses(hasta)
+    except RuntimeError as e:
+        print(e, file=sys.stderr)
+        return 1
+    if not archivados:
+        print("No hay meses cerrados para archivar.")
+    return 0
+
+def comando_conflicts(args):
+    """Lista los bloques de horario superpuestos del mismo docente el mismo día."""
+    from almacenamiento import obtener_backend
+    from intervalos import buscar_conflictos
+
+    conflictos = buscar_conflictos(obtener_backend().leer("horarios"))
+    for primero, segundo in conflictos:
+        print(f"{primero[0]}\t{primero[3]}\t{primero[2]} {primero[4]}-{primero[5]}\t{segundo[2]} {segundo[4]}-{segundo[5]}")
+    print(f"{len(conflictos)} conflictos encontrados.", file=sys.stderr)
+    return 1 if conflictos else 0
+
+def comando_bulk(args):
+    """Agrega docentes, materias u horarios desde un archivo CSV o Excel; las filas con errores se omiten."""
+    from importacion import importar, describir_errores
+
+    try:
+        aceptadas, errores = importar(args.tabla, args.archivo, guardar=not args.validar)
+    except OSError as e:
+        print(f"No se pudo leer el archivo: {e}", file=sys.stderr)
+        return 1
+    if errores:
+        print(describir_errores(errores, maximo=len(errores)), file=sys.stderr)
+    accion = "válidas" if args.validar else "importadas"
+    print(f"{len(aceptadas)} filas {accion}, {len(errores)} con errores.")
+    return 1 if errores else 0
+
+def comando_import(args):
+    """Copia los archivos Excel a la base SQLite."""
+    from almacenamiento import importar_excel_a_sqlite
+    importar_excel_a_sqlite()
+    return 0
+
+def comando_export(args):
+    """Reescribe los archivos Excel con el contenido de la base SQLite."""
+    from almacenamiento import exportar_sqlite_a_excel
+    exportar_sqlite_a_excel()
+    return 0
+
+def crear_parser():
+    parser = argparse.ArgumentParser(prog="cli", description="Sistema de asistencia docente sin interfaz gráfica.")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    report = subparsers.add_parser("report", help="Reporte mensual de horas, descuentos y neto")
+    report.add_argument("--month", "--mes", type=int, required=True, help="Mes del reporte (1-12)")
+    report.add_argument("--year", "--anio", type=int, required=True, help="Año del reporte")
+    quien = report.add_mutually_exclusive_group()
+    quien.add_argument("--all", action="store_true", help="Exporta a Excel los reportes de todos los docentes")
+    quien.add_argument("--ci", help="Muestra el reporte detallado de un docente")
+    report.add_argument("--procesos", type=int, default=None, help="Procesos en paralelo para --all")
+    report.add_argument("--carpeta", default=None, help="Carpeta de salida para --all")
+    report.set_defaults(funcion=comando_report)
+
+    totals = subparsers.add_parser("totals", help="Totales del mes desde los agregados de asistencia")
+    totals.add_argument("--month", "--mes", type=int, required=True, help="Mes (1-12)")
+    totals.add_argument("--year", "--anio", type=int, required=True, help="Año")
+    totals.add_argument("--audit", action="store_true", help="Compara los agregados con el reporte completo")
+    totals.add_argument("--recalcular", action="store_true", help="Recalcula el mes desde la asistencia antes de mostrarlo")
+    totals.set_defaults(funcion=comando_totals)
+
+    scan = subparsers.add_parser("scan", help="Registra la entrada o salida de un docente")
+    scan.add_argument("ci", help="C.I. del docente")
+    scan.set_defaults(funcion=comando_scan)
+
+    archive = subparsers.add_parser("archive", help="Archiva los meses cerrados de la asistencia en Parquet")
+    archive.add_argument("--hasta", default=None, help="Archiva los meses anteriores a este (AAAA-MM, por defecto el actual)")
+    archive.set_defaults(funcion=comando_archive)
+
+    conflicts = subparsers.add_parser("conflicts", help="Lista los bloques de horario superpuestos")
+    conflicts.set_defaults(funcion=comando_conflicts)
+
+    bulk = subparsers.add_parser("bulk", help="Agrega docentes, materias u horarios desde un archivo CSV o Excel")
+    bulk.add_argument("tabla", choices=["docentes", "materias", "horarios"])
+    bulk.add_argument("archivo", help="Archivo .csv o .xlsx")
+    bulk.add_argument("--validar", action="store_true", help="Solo valida el archivo, sin guardar nada")
+    bulk.set_defaults(funcion=comando_bulk)
+
+    subparsers.add_parser("import", help="Copia los archivos Excel a la base SQLite").set_defaults(funcion=comando_import)
+    subparsers.add_parser("export", help="Copia la base SQLite a los archivos Excel").set_defaults(funcion=comando_export)
+    return parser
+
+def main(argv=None):
+    args = crear_parser().parse_args(argv)
+    return args.funcion(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+import json
+import os
+from urllib import request, error
+from urllib.parse import urlencode
+
+# Dirección del servidor de asistencia (p. ej. http://192.168.1.10:8765); sin ella se usa el almacén local
+URL_SERVIDOR = os.environ.get("ECOS_SERVIDOR", "")
+TIEMPO_ESPERA = 5  # Segundos máximos por pedido
+
+class ErrorServidor(ValueError):
+    """Respuesta de error del servidor; estado es el código HTTP (404 C.I. desconocido, 409 conflicto, ...)."""
+
+    def __init__(self, mensaje, estado):
+        super().__init__(mensaje)
+        self.estado = estado
+
+class ClienteAsistencia:
+    """Habla con servidor_asistencia.py y ofrece los mismos métodos que AlmacenAsistencia que usa la ventana."""
+
+    def __init__(self, url=URL_SERVIDOR, tiempo_espera=TIEMPO_ESPERA):
+        self.url = url.rstrip("/")
+        self.tiempo_espera = tiempo_espera
+        self._filas = {}  # Filas devueltas por los registros, para no volver a pedirlas
+
+    def _pedir(self, metodo, ruta, datos=None):
+        """Hace el pedido y devuelve el JSON de la respuesta; los errores del servidor se lanzan como ErrorServidor."""
+        cuerpo = json.dumps(datos).encode("utf-8") if datos is not None else None
+        pedido = request.Request(self.url + ruta, data=cuerpo, method=metodo,
+                                 headers={"Content-Type": "application/json"})
+        try:
+            with request.urlopen(pedido, timeout=self.tiempo_espera) as respuesta:
+                return json.loads(respuesta.read().decode("utf-8"))
+        except error.HTTPError as e:
+            try:
+                mensaje = json.loads(e.read().decode("utf-8"))["error"]
+            except (ValueError, KeyError):
+                mensaje = str(e)
+            raise ErrorServidor(mensaje, e.code) from None
+
+    def _registrar(self, tipo, ci):
+        respuesta = self._pedir("POST", f"/{tipo}", {"ci": ci})
+        self._filas[respuesta["indice"]] = respuesta["fila"]
+        return respuesta
+
+    def registrar(self, ci, nombre=None):
+        """Registra la salida si hay una entrada abierta hoy, si no la entrada. El nombre lo pone el servidor."""
+        respuesta = self._registrar("scan", ci)
+        return respuesta["tipo"], respuesta["indice"]
+
+    def registrar_entrada(self, ci, nombre=None):
+        return self._registrar("entrada", ci)["indice"]
+
+    def registrar_salida(self, ci):
+        """Devuelve None solo si el docente no tiene una entrada abierta hoy; los demás errores se lanzan."""
+        try:
+            return self._registrar("salida", ci)["indice"]
+        except ErrorServidor as e:
+            if e.estado == 409:
+                return None
+            raise
+
+    def obtener_fila(self, indice):
+        """Devuelve la fila en la posición dada del almacén del servidor."""
+        fila = self._filas.pop(indice, None)
+        if fila is None:
+            fila = self._pedir("GET", f"/asistencia/{indice}")["fila"]
+        return fila
+
+    def filas_entre(self, desde, hasta):
+        """Devuelve [(índice, fila)] de los registros entre las fechas dadas."""
+        respuesta = self._pedir("GET", "/asistencia?" + urlencode({"desde": desde, "hasta": hasta}))
+        return [(item["indice"], item["fila"]) for item in respuesta["filas"]]
+
+_cliente = None
+
+def obtener_cliente():
+    """Devuelve el cliente del servidor si ECOS_SERVIDOR está configurado, si no None."""
+    global _cliente
+    if _cliente is None and URL_SERVIDOR:
+        _cliente = ClienteAsistencia()
+    return _cliente
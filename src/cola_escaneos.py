@@ -0,0 +1,96 @@
+import queue
+import threading
+import time
+from collections import deque
+
+ESPERA_REPETIDO = 5.0  # Segundos en los que un segundo escaneo del mismo C.I. se toma como repetido
+VENTANA_ESTADISTICAS = 60.0  # Segundos que se cuentan para los escaneos por minuto
+
+class ColaEscaneos:
+    """Cola de escaneos del modo kiosco: recibe los C.I. leídos sin esperar a que se registren,
+    descarta las lecturas repetidas de la misma credencial y los registra de a uno en un hilo de fondo.
+
+    registrar(ci) hace el registro y devuelve lo que se mostrará; si lanza una excepción el escaneo se
+    informa como error. Los resultados se retiran con obtener_resultados() desde el hilo de la ventana."""
+
+    def __init__(self, registrar, espera_repetido=ESPERA_REPETIDO):
+        self.registrar = registrar
+        self.espera_repetido = espera_repetido
+        self.cola = queue.Queue()
+        self.resultados = queue.Queue()
+        self.lock = threading.Lock()
+        self._ultimos = {}  # C.I. -> momento del último escaneo aceptado
+        self._terminados = deque()  # Momentos de los escaneos registrados en la última ventana
+        self._latencias = deque(maxlen=200)  # Milisegundos desde el escaneo hasta el resultado
+        self.repetidos = 0
+        self._hilo = threading.Thread(target=self._trabajar, daemon=True)
+        self._hilo.start()
+
+    def escanear(self, ci):
+        """Encola el escaneo y vuelve enseguida. Devuelve False si está vacío o es una lectura repetida."""
+        if not ci:
+            return False
+        ahora = time.monotonic()
+        with self.lock:
+            # Los C.I. escaneados hace más de espera_repetido ya no se descartan: se quitan, así el diccionario
+            # solo guarda los de los últimos segundos aunque el kiosco esté abierto todo el día
+            viejos = [otro for otro, momento in self._ultimos.items() if ahora - momento >= self.espera_repetido]
+            for otro in viejos:
+                del self._ultimos[otro]
+            ultimo = self._ultimos.get(ci)
+            if ultimo is not None and ahora - ultimo < self.espera_repetido:
+                self.repetidos += 1
+                return False
+            self._ultimos[ci] = ahora
+        self.cola.put((ci, ahora))
+        return True
+
+    def _trabajar(self):
+        while True:
+            escaneo = self.cola.get()
+            if escaneo is None:
+                break
+            ci, inicio = escaneo
+            try:
+                estado, resultado = "ok", self.registrar(ci)
+            except Exception as e:
+                estado, resultado = "error", e
+                with self.lock:
+                    self._ultimos.pop(ci, None)  # Un C.I. mal escrito se puede volver a intentar enseguida
+            fin = time.monotonic()
+            with self.lock:
+                self._terminados.append(fin)
+                self._latencias.append((fin - inicio) * 1000)
+            self.resultados.put((estado, ci, resultado, (fin - inicio) * 1000))
+
+    def obtener_resultados(self):
+        """Devuelve [(estado, ci, resultado, latencia_ms)] de los escaneos terminados desde la última llamada."""
+        terminados = []
+        while True:
+            try:
+                terminados.append(self.resultados.get_nowait())
+            except queue.Empty:
+                return terminados
+
+    def estadisticas(self):
+        """Escaneos por minuto, latencia del último escaneo y percentiles 50/95 en ms, pendientes y repetidos."""
+        ahora = time.monotonic()
+        with self.lock:
+            while self._terminados and ahora - self._terminados[0] > VENTANA_ESTADISTICAS:
+                self._terminados.popleft()
+            latencias = sorted(self._latencias)
+            ultima = self._latencias[-1] if self._latencias else None
+            por_minuto = len(self._terminados) * 60 / VENTANA_ESTADISTICAS
+        return {
+            "por_minuto": round(por_minuto),
+            "latencia_ms": ultima,
+            "p50_ms": latencias[len(latencias) // 2] if latencias else None,
+            "p95_ms": latencias[min(len(latencias) - 1, int(len(latencias) * 0.95))] if latencias else None,
+            "pendientes": self.cola.qsize(),
+            "repetidos": self.repetidos,
+        }
+
+    def cerrar(self):
+        """Termina de registrar lo que quede en la cola y detiene el hilo."""
+        self.cola.put(None)
+        self._hilo.join(timeout=10)
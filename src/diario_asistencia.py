@@ -0,0 +1,65 @@
+import json
+import os
+import threading
+from almacenamiento import carpeta_datos
+from bloqueo import BloqueoArchivo
+
+archivo_diario = os.path.join(carpeta_datos, 'asistencia.diario')
+
+class DiarioOcupado(RuntimeError):
+    """El diario ya está abierto por otro proceso (la ventana, el kiosco, el servidor o un comando)."""
+
+class DiarioAsistencia:
+    """Archivo de solo agregado con un evento de asistencia (entrada o salida) por línea.
+
+    Mientras está abierto se tiene el candado exclusivo del diario: otro proceso que lo leyera recuperaría
+    y vaciaría eventos que este proceso todavía no guardó, y quedarían registrados dos veces."""
+
+    def __init__(self, ruta=archivo_diario):
+        self.ruta = ruta
+        self.lock = threading.Lock()
+        self._bloqueo = BloqueoArchivo(ruta, tiempo_espera=0)
+        try:
+            self._bloqueo.__enter__()
+        except TimeoutError:
+            raise DiarioOcupado("La asistencia está abierta en otro programa (ventana de asistencia, kiosco o "
+                                "servidor). Ciérrelo o registre a través del servidor (ECOS_SERVIDOR).") from None
+        self._archivo = open(self.ruta, "a", encoding="utf-8")
+
+    def anotar(self, evento):
+        """Agrega el evento al final del diario y espera a que quede escrito en disco."""
+        linea = json.dumps(evento, ensure_ascii=False) + "\n"
+        with self.lock:
+            self._archivo.write(linea)
+            self._archivo.flush()
+            os.fsync(self._archivo.fileno())
+
+    def leer(self):
+        """Devuelve los eventos anotados, ignorando una última línea incompleta por un corte de luz."""
+        eventos = []
+        if not os.path.exists(self.ruta):
+            return eventos
+        with open(self.ruta, encoding="utf-8") as archivo:
+            for numero, linea in enumerate(archivo, start=1):
+                if not linea.strip():
+                    continue
+                try:
+                    eventos.append(json.loads(linea))
+                except json.JSONDecodeError:
+                    print(f"Línea {numero} del diario de asistencia dañada, se ignora.")
+        return eventos
+
+    def vaciar(self):
+        """Deja el diario vacío una vez que todos sus eventos fueron compactados al almacenamiento."""
+        with self.lock:
+            self._archivo.truncate(0)
+            self._archivo.flush()
+            os.fsync(self._archivo.fileno())
+
+    def cerrar(self):
+        """Cierra el archivo del diario y suelta su candado."""
+        with self.lock:
+            if self._archivo.closed:
+                return
+            self._archivo.close()
+            self._bloqueo.__exit__(None, None, None)
@@ -0,0 +1,158 @@
+import calendar
+import copy
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import openpyxl
+from calculo_reporte import cargar_datos_mes, generar_reporte, meses_espanol, obtener_horario
+from indice_docentes import obtener_indice
+
+plantilla_excel = os.path.join(os.path.dirname(__file__), '../plantilla/report.xlsx')
+carpeta_reportes = os.path.join(os.path.dirname(__file__), '../reportes')
+
+# Posiciones de la plantilla
+FILA_INICIO = 16  # Fila inicial para los datos de la tabla
+FILA_FIN = 31  # Fila final para los datos de la tabla; las demás se insertan antes de los totales
+COLUMNAS_TABLA = "BCDEFGH"
+FILA_DEDUCCIONES = 17  # Tabla de deducciones en las columnas J (fecha) y K (monto)
+COLUMNA_FECHA_DEDUCCION = 10
+COLUMNA_MONTO_DEDUCCION = 11
+
+class ExportadorReportes:
+    """Lee la plantilla de reporte una sola vez y genera muchos reportes a partir de ella.
+
+    Se guarda una copia de las celdas de la plantilla (el prototipo); antes de cada reporte la hoja
+    vuelve a ese estado copiando solo esas celdas, en lugar de volver a leer y descomprimir el archivo."""
+
+    def __init__(self, plantilla_path=plantilla_excel):
+        self.wb = openpyxl.load_workbook(plantilla_path)
+        self.ws = self.wb.active
+        self.prototipo = {posicion: copy.copy(celda) for posicion, celda in self.ws._cells.items()}
+        self.estilos_tabla = [self.ws[f"{col}{FILA_INICIO}"]._style for col in COLUMNAS_TABLA]
+        self.lock = threading.Lock()  # El libro en memoria se usa para un reporte a la vez
+
+    def _restaurar(self):
+        """Deja la hoja igual que la plantilla recién leída."""
+        celdas = {}
+        for posicion, celda in self.prototipo.items():
+            nueva = copy.copy(celda)
+            nueva._style = copy.copy(celda._style)
+            celdas[posicion] = nueva
+        self.ws._cells = celdas
+
+    def _llenar(self, ci, mes, year, reporte, docente, horario):
+        """Escribe el reporte del docente (resultado de generar_reporte) sobre la hoja restaurada."""
+        ws = self.ws
+        registros, total_horas, total_ganado, deducciones, neto_ganado = reporte
+
+        # Datos del docente
+        nombre_docente, pago_por_hora = docente
+        dias_trabajo = [dia.capitalize() for dia in horario.keys()]
+        ws["D6"].value = nombre_docente  # Nombre del docente
+        ws["D8"].value = pago_por_hora  # Pago por hora
+        ws["D10"].value = " - ".join(dias_trabajo)  # Días que viene a trabajar el docente
+        ws["J6"].value = ci  # CI del docente
+
+        # Período de declaración
+        fecha_fin = f"{calendar.monthrange(year, mes)[1]:02d}/{mes:02d}/{year}"
+        ws["J8"].value = f"01/{mes:02d}/{year} al {fecha_fin}"
+
+        # Las filas que no entran en la tabla se insertan todas juntas antes de los totales
+        filas_extra = len(registros) - (FILA_FIN - FILA_INICIO + 1)
+        if filas_extra > 0:
+            ws.insert_rows(FILA_FIN + 1, amount=filas_extra)
+
+        for i, registro in enumerate(registros):
+            fila = FILA_INICIO + i
+            for j, value in enumerate(registro):
+                celda = ws.cell(row=fila, column=2 + j, value=value)
+                celda._style = self.estilos_tabla[j]
+
+        # Tabla de deducciones (solo montos mayores a 0)
+        fila = FILA_DEDUCCIONES
+        for registro in registros:
+            if registro[5] > 0:
+                ws.cell(row=fila, column=COLUMNA_FECHA_DEDUCCION, value=registro[0])
+                ws.cell(row=fila, column=COLUMNA_MONTO_DEDUCCION, value=registro[5])
+                fila += 1
+
+    def exportar(self, ci, mes, year, output_path, datos=None):
+        """Genera el reporte del docente y lo guarda en output_path."""
+        if datos is None:
+            # Si el reporte ya se generó en la ventana y los datos no cambiaron, se reutiliza
+            reporte = generar_reporte(ci, mes, year)
+            indice = obtener_indice()
+            docente = (indice.nombre(ci), indice.pago(ci))
+            horario = obtener_horario(ci)
+        else:
+            reporte = generar_reporte(ci, mes, year, datos)
+            docente = datos["docentes"][ci]
+            horario = datos["horarios"].get(ci, {})
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        with self.lock:
+            self._restaurar()
+            self._llenar(ci, mes, year, reporte, docente, horario)
+            self.wb.save(output_path)
+        print(f"Reporte guardado en: {output_path}")
+        return output_path
+
+# Un exportador por plantilla y por proceso
+_exportadores = {}
+_lock = threading.Lock()
+
+def obtener_exportador(plantilla_path=plantilla_excel):
+    """Devuelve el exportador de la plantilla, leyéndola solo la primera vez."""
+    plantilla_path = os.path.abspath(plantilla_path)
+    with _lock:
+        if plantilla_path not in _exportadores:
+            _exportadores[plantilla_path] = ExportadorReportes(plantilla_path)
+        return _exportadores[plantilla_path]
+
+def exportar_a_excel(ci, mes, year, plantilla_path, output_path, datos=None):
+    """Escribe los datos del reporte en una plantilla de Excel y guarda el archivo resultante."""
+    obtener_exportador(plantilla_path).exportar(ci, mes, year, output_path, datos)
+
+def ruta_reporte(ci, mes, year, carpeta=carpeta_reportes):
+    """Devuelve la ruta del archivo de reporte de un docente para el mes dado."""
+    nombre_mes = list(meses_espanol)[mes - 1]
+    return os.path.join(carpeta, f'reporte_{ci}_{nombre_mes}_{year}.xlsx')
+
+def _exportar_docente(argumentos):
+    """Exporta el reporte de un docente; se ejecuta dentro de un proceso del pool."""
+    ci, mes, year, datos, output_path = argumentos
+    # Cada proceso del pool arma su prototipo de la plantilla una sola vez y lo reutiliza en sus reportes
+    obtener_exportador().exportar(ci, mes, year, output_path, datos)
+    return output_path
+
+def exportar_reportes_mes(mes, year, carpeta=carpeta_reportes, procesos=None, progreso=None):
+    """Genera los reportes de todos los docentes del mes leyendo cada archivo una sola vez.
+    Los reportes se escriben en paralelo con un pool de procesos (procesos=1 los hace en serie).
+    Si se pasa progreso, se llama con un texto después de cada reporte terminado."""
+    datos = cargar_datos_mes(mes, year)
+    tareas = []
+    for ci in datos["docentes"]:
+        if ci not in datos["horarios"] and ci not in datos["asistencia"]:
+            continue  # Docente sin horario ni asistencia en el mes
+        # Cada proceso recibe solo los datos de su docente
+        datos_docente = {
+            "docentes": {ci: datos["docentes"][ci]},
+            "horarios": {ci: datos["horarios"].get(ci, {})},
+            "asistencia": {ci: datos["asistencia"].get(ci, [])},
+            "feriados": datos["feriados"],
+        }
+        tareas.append((ci, mes, year, datos_docente, ruta_reporte(ci, mes, year, carpeta)))
+
+    rutas = []
+    if procesos == 1 or len(tareas) <= 1:
+        for tarea in tareas:
+            rutas.append(_exportar_docente(tarea))
+            if progreso:
+                progreso(f"Reportes generados: {len(rutas)} de {len(tareas)}")
+    else:
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            for futuro in as_completed([pool.submit(_exportar_docente, tarea) for tarea in tareas]):
+                rutas.append(futuro.result())
+                if progreso:
+                    progreso(f"Reportes generados: {len(rutas)} de {len(tareas)}")
+    print(f"Se generaron {len(rutas)} reportes de {mes:02d}/{year}.")
+    return rutas
@@ -0,0 +1,154 @@
+"""Archivo histórico de la asistencia en archivos Parquet particionados por año y mes.
+
+Los meses cerrados se sacan del archivo de asistencia y se guardan en
+data/historico/anio=AAAA/mes=MM/asistencia.parquet, así las lecturas diarias no pagan por los años pasados
+y los reportes leen solo la partición del mes que necesitan. Los años disponibles se obtienen de los
+nombres de las carpetas, sin abrir ningún archivo.
+
+El archivado se hace con la aplicación cerrada: python cli.py archive
+"""
+import os
+import re
+import threading
+from datetime import datetime
+from almacenamiento import obtener_backend, texto, carpeta_datos
+from indice_docentes import normalizar_ci
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow solo es necesario si se usa el archivo histórico
+    pa = pq = None
+
+carpeta_historico = os.path.join(carpeta_datos, 'historico')
+COLUMNAS = ["ci", "nombre", "fecha", "hora_entrada", "hora_salida"]
+
+# Particiones ya leídas: ruta -> (firma del archivo, filas). Los meses archivados casi nunca cambian.
+_cache = {}
+_lock = threading.Lock()
+
+def ruta_particion(mes, year, carpeta=carpeta_historico):
+    return os.path.join(carpeta, f"anio={year}", f"mes={mes:02d}", "asistencia.parquet")
+
+def particiones(carpeta=carpeta_historico):
+    """Devuelve [(año, mes)] de los meses archivados, leyendo solo los nombres de las carpetas."""
+    encontradas = []
+    if not os.path.isdir(carpeta):
+        return encontradas
+    for nombre_anio in os.listdir(carpeta):
+        coincidencia = re.fullmatch(r"anio=(\d{4})", nombre_anio)
+        if not coincidencia:
+            continue
+        for nombre_mes in os.listdir(os.path.join(carpeta, nombre_anio)):
+            coincidencia_mes = re.fullmatch(r"mes=(\d{2})", nombre_mes)
+            if coincidencia_mes and os.path.exists(os.path.join(carpeta, nombre_anio, nombre_mes, "asistencia.parquet")):
+                encontradas.append((int(coincidencia.group(1)), int(coincidencia_mes.group(1))))
+    return sorted(encontradas)
+
+def esta_archivado(mes, year, carpeta=carpeta_historico):
+    return os.path.exists(ruta_particion(mes, year, carpeta))
+
+def anios_archivados(carpeta=carpeta_historico):
+    return sorted({year for year, _ in particiones(carpeta)})
+
+def _requerir_pyarrow():
+    if pq is None:
+        raise RuntimeError("Para usar el archivo histórico instale pyarrow: pip install pyarrow")
+
+def version_mes(mes, year, carpeta=carpeta_historico):
+    """Identifica la versión de la partición del mes (None si el mes no está archivado)."""
+    ruta = ruta_particion(mes, year, carpeta)
+    if not os.path.exists(ruta):
+        return None
+    estado = os.stat(ruta)
+    return (estado.st_mtime_ns, estado.st_size)
+
+def leer_mes(mes, year, ci=None, carpeta=carpeta_historico):
+    """Devuelve las filas de asistencia archivadas del mes (de un docente si se indica ci), con valores de texto."""
+    firma = version_mes(mes, year, carpeta)
+    if firma is None:
+        return []
+    _requerir_pyarrow()
+    ruta = ruta_particion(mes, year, carpeta)
+    with _lock:
+        guardado = _cache.get(ruta)
+    if guardado is None or guardado[0] != firma:
+        columnas = pq.read_table(ruta, columns=COLUMNAS).to_pydict()
+        filas = [list(fila) for fila in zip(*(columnas[columna] for columna in COLUMNAS))]
+        with _lock:
+            _cache[ruta] = (firma, filas)
+    else:
+        filas = guardado[1]
+    if ci is not None:
+        return [list(fila) for fila in filas if fila[0] == normalizar_ci(ci)]
+    return [list(fila) for fila in filas]
+
+def firma_fila(fila):
+    """Identifica una fila de asistencia por C.I., fecha y hora de entrada."""
+    return normalizar_ci(fila[0]), texto(fila[2])[:10], texto(fila[3])
+
+def _escribir_particion(mes, year, filas, carpeta):
+    """Escribe la partición del mes uniendo las filas nuevas con las que ya estaban archivadas."""
+    existentes = leer_mes(mes, year, carpeta=carpeta)
+    vistas = {firma_fila(fila) for fila in existentes}
+    nuevas = []
+    for fila in filas:
+        valores = [texto(valor) or None for valor in list(fila[:5]) + [None] * (5 - len(fila[:5]))]
+        valores[0] = normalizar_ci(fila[0])
+        if firma_fila(valores) not in vistas:
+            vistas.add(firma_fila(valores))
+            nuevas.append(valores)
+    todas = existentes + nuevas
+    tabla = pa.table({columna: pa.array([fila[i] for fila in todas], type=pa.string())
+                      for i, columna in enumerate(COLUMNAS)})
+    ruta = ruta_particion(mes, year, carpeta)
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    # Se escribe a un temporal y se reemplaza de una vez para no dejar una partición a medias
+    temporal = ruta + ".tmp"
+    pq.write_table(tabla, temporal)
+    os.replace(temporal, ruta)
+    return len(nuevas)
+
+def _mes_de(fila):
+    fecha = fila[2]
+    if isinstance(fecha, str):
+        fecha = datetime.strptime(fecha.strip()[:10], "%Y-%m-%d")
+    return fecha.year, fecha.month
+
+def archivar_meses(hasta=None, carpeta=carpeta_historico):
+    """Pasa al archivo histórico los meses anteriores a hasta (el mes actual por defecto) y los quita del
+    archivo de asistencia. Devuelve {(año, mes): filas archivadas}."""
+    _requerir_pyarrow()
+    hasta = hasta or datetime.now()
+    limite = (hasta.year, hasta.month)
+    backend = obtener_backend()
+    backend.verificar("asistencia")
+
+    por_mes = {}
+    for fila in backend.leer("asistencia"):
+        if fila[0] is None or fila[2] is None:
+            continue
+        try:
+            clave = _mes_de(fila)
+        except ValueError as e:
+            print(f"Error procesando la fecha {fila[2]}: {e}")
+            continue
+        if clave < limite:
+            por_mes.setdefault(clave, []).append(fila)
+
+    # Primero se escriben las particiones y recién después se quitan las filas del archivo en uso;
+    # si algo falla entre medio, volver a archivar no duplica filas
+    archivados = {}
+    for (year, mes), filas in sorted(por_mes.items()):
+        _escribir_particion(mes, year, filas, carpeta)
+        archivados[(year, mes)] = len(filas)
+        print(f"{year}-{mes:02d}: {len(filas)} filas archivadas.")
+
+    if archivados:
+        def archivada(fila):
+            try:
+                return fila[0] is not None and fila[2] is not None and _mes_de(fila) in archivados
+            except ValueError:
+                return False
+        backend.eliminar_filas("asistencia", archivada)
+    return archivados
@@ -1,49 +1,26 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import openpyxl
-import os
-from datetime import datetime
-
-archivo_materias = os.path.join(os.path.dirname(__file__), '../data/materias.xlsx')
-archivo_horarios = os.path.join(os.path.dirname(__file__), '../data/horarios.xlsx')
-archivo_docentes = os.path.join(os.path.dirname(__file__), '../data/docentes.xlsx')
+from almacenamiento import obtener_backend
+from calculo_horarios import calcular_horas_trabajadas, validar_hora
+from calendario import DIAS_CLASE
+from indice_docentes import obtener_indice, normalizar_ci
+from intervalos import agregar_horario as guardar_horario, buscar_conflictos
+from tabla_virtual import TablaVirtual
+from tareas import obtener_ejecutor
+from ventana_importacion import importar_desde_archivo
 
 def verificar_archivo_horarios():
     """Verifica si el archivo de horarios existe, si no lo crea vacío con encabezados."""
-    if not os.path.exists(archivo_horarios):
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.append(["C.I.", "Nombre", "Materia", "Día", "Hora Inicio", "Hora Fin", "Horas Trabajadas"])
-        wb.save(archivo_horarios)
-
-def actualizar_lista_horarios(tree, filtro_ci=None):
-    """Actualiza la tabla de horarios en la ventana."""
-    for row in tree.get_children():
-        tree.delete(row)
-
-    wb = openpyxl.load_workbook(archivo_horarios)
-    ws = wb.active
-    for row in ws.iter_rows(min_row=2, values_only=True):
-        if filtro_ci and row[0] != filtro_ci:
-            continue
-        tree.insert("", "end", values=row)
-
-def calcular_horas_trabajadas(hora_inicio, hora_fin):
-    """Calcula las horas trabajadas dada la hora de inicio y la hora de fin."""
-    formato = "%H:%M"
-    h_inicio = datetime.strptime(hora_inicio, formato)
-    h_fin = datetime.strptime(hora_fin, formato)
-    diferencia = h_fin - h_inicio
-    horas_trabajadas = diferencia.total_seconds() / 3600
-    return horas_trabajadas
-
-def validar_hora(hora):
-    """Valida que la hora esté en el formato HH:MM."""
-    try:
-        datetime.strptime(hora, "%H:%M")
-        return True
-    except ValueError:
-        return False
+    obtener_backend().verificar("horarios")
+
+def actualizar_lista_horarios(tabla, filtro_ci=None, filas=None):
+    """Actualiza la tabla de horarios en la ventana (con las filas [(id, fila)] ya leídas, si se pasan).
+    Cada fila de la tabla usa como clave su id en el almacenamiento."""
+    if filas is None:
+        filas = obtener_backend().leer_con_id("horarios")
+    filas = [(id_fila, row) for id_fila, row in filas
+             if not filtro_ci or normalizar_ci(row[0]) == normalizar_ci(filtro_ci)]
+    tabla.cargar([row for _, row in filas], claves=[id_fila for id_fila, _ in filas])
 
 def abrir_gestion_horarios(root_menu):
     """Abre la ventana para gestionar los horarios de los docentes."""
@@ -83,18 +60,12 @@ def abrir_gestion_horarios(root_menu):
     labels = ["C.I. y Nombre", "Materia", "Día", "Hora Inicio (HH:MM)", "Hora Fin (HH:MM)"]
     entries = []
 
-    # Obtener lista de docentes y materias
-    wb_docentes = openpyxl.load_workbook(archivo_docentes)
-    ws_docentes = wb_docentes.active
-    docentes = [(row[0], row[1]) for row in ws_docentes.iter_rows(min_row=2, values_only=True)]
-    docentes_combo = [f"{docente[0]} - {docente[1]}" for docente in docentes]
-
-    wb_materias = openpyxl.load_workbook(archivo_materias)
-    ws_materias = wb_materias.active
-    materias = [row[0] for row in ws_materias.iter_rows(min_row=2, values_only=True)]
+    # La lista de docentes y materias se carga en segundo plano al final de esta función
+    docentes_combo = []
+    materias = []
 
     # Días disponibles
-    dias = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes"]
+    dias = DIAS_CLASE
 
     for i, label in enumerate(labels):
         tk.Label(frame_form, text=label + ":", bg='#e0e0e0', font=('Arial', 10)).grid(row=i, column=0, padx=5, pady=5, sticky="e")
@@ -103,7 +74,8 @@ def abrir_gestion_horarios(root_menu):
             combo_ci_nombre = ttk.Combobox(frame_form, values=docentes_combo, width=30)
             entry = combo_ci_nombre
         elif "Materia" in label:
-            entry = ttk.Combobox(frame_form, values=materias, width=30)
+            combo_materia = ttk.Combobox(frame_form, values=materias, width=30)
+            entry = combo_materia
         elif "Día" in label:
             entry = ttk.Combobox(frame_form, values=dias, width=30)
         else:
@@ -120,8 +92,11 @@ def abrir_gestion_horarios(root_menu):
             messagebox.showwarning("Campos incompletos", "Todos los campos son obligatorios.")
             return
 
-        ci = datos[0].split(" - ")[0]  # Extraer solo el C.I.
-        nombre = datos[0].split(" - ")[1]  # Extraer el nombre
+        ci = normalizar_ci(datos[0].split(" - ")[0])  # Extraer solo el C.I.
+        nombre = obtener_indice().nombre(ci)
+        if nombre is None:
+            messagebox.showerror("C.I. no encontrado", "El C.I. ingresado no corresponde a ningún docente.")
+            return
         datos[0] = ci
         datos.insert(1, nombre)  # Insertar el nombre en la posición correcta
 
@@ -135,43 +110,66 @@ def abrir_gestion_horarios(root_menu):
         horas_trabajadas = calcular_horas_trabajadas(hora_inicio, hora_fin)
         datos.append(str(horas_trabajadas))
 
-        wb = openpyxl.load_workbook(archivo_horarios)
-        ws = wb.active
-        ws.append(datos)
-        wb.save(archivo_horarios)
-
-        actualizar_lista_horarios(tree)
+        def mostrar_nuevo(id_fila):
+            # Solo se agrega la fila nueva a la tabla, sin volver a leer todo el archivo
+            filtro = normalizar_ci(filtro_ci_nombre.get().split(" - ")[0])
+            if not filtro or filtro == ci:
+                tabla.agregar_fila(datos, clave=id_fila)
+            # El formulario se limpia solo si se guardó; si falla, el usuario puede corregir y reintentar
+            for entry in entries:
+                entry.delete(0, tk.END)
 
-        for entry in entries:
-            entry.delete(0, tk.END)
+        # Se rechaza el bloque si el docente ya tiene otra clase que se superpone ese día
+        ejecutor.ejecutar(guardar_horario, datos, estado=lbl_estado, mensaje="Guardando horario...",
+                          al_terminar=mostrar_nuevo,
+                          al_fallar=lambda e: messagebox.showerror("No se pudo agregar el horario", str(e)))
 
     def eliminar_horario():
         """Elimina el horario seleccionado de la tabla y del archivo."""
-        selected_item = tree.selection()
-        if not selected_item:
+        clave = tabla.clave_seleccionada()
+        if clave is None:
             messagebox.showwarning("Seleccionar horario", "Debe seleccionar un horario para eliminar.")
             return
         
-        horario = tree.item(selected_item, "values")
+        horario = tabla.filas[tabla.posiciones[clave]][1]
 
-        wb = openpyxl.load_workbook(archivo_horarios)
-        ws = wb.active
-        for row in ws.iter_rows(min_row=2):
-            if all(row[i].value == horario[i] for i in range(len(horario))):
-                ws.delete_rows(row[0].row)
-                break
-        wb.save(archivo_horarios)
+        # La clave de la fila es su id: se marca como borrada sin buscarla ni reescribir el archivo
+        ejecutor.ejecutar(obtener_backend().eliminar_id, "horarios", clave, horario,
+                          estado=lbl_estado, mensaje="Eliminando horario...", al_terminar=lambda _: tabla.eliminar_fila(clave))
 
-        actualizar_lista_horarios(tree)
+    def mostrar_conflictos(conflictos):
+        """Muestra en una ventana los pares de bloques superpuestos de todo el horario."""
+        if not conflictos:
+            messagebox.showinfo("Conflictos de horario", "No hay bloques superpuestos en el horario.")
+            return
+        ventana = tk.Toplevel(root)
+        ventana.title(f"Conflictos de horario ({len(conflictos)})")
+        ventana.geometry("800x400")
+        lista = tk.Listbox(ventana, font=('Arial', 10))
+        lista.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        for primero, segundo in conflictos:
+            lista.insert(tk.END, f"{primero[0]} - {primero[1]} ({primero[3]}): {primero[2]} {primero[4]}-{primero[5]} "
+                                 f"se superpone con {segundo[2]} {segundo[4]}-{segundo[5]}")
+
+    def buscar_conflictos_horario():
+        """Busca en segundo plano todos los bloques superpuestos del horario."""
+        ejecutor.ejecutar(lambda: buscar_conflictos(obtener_backend().leer("horarios")), estado=lbl_estado,
+                          mensaje="Buscando conflictos...", al_terminar=mostrar_conflictos)
+
+    def importar_horarios():
+        """Agrega los bloques de horario de un archivo CSV o Excel."""
+        importar_desde_archivo(root, ejecutor, "horarios", lbl_estado, cargar_horarios)
 
     def filtrar_horarios():
         """Filtra los horarios por C.I. del docente seleccionado."""
         seleccion = filtro_ci_nombre.get()
         ci = seleccion.split(" - ")[0] if seleccion else None
-        actualizar_lista_horarios(tree, filtro_ci=ci)
+        actualizar_lista_horarios(tabla, filtro_ci=ci)
 
     tk.Button(frame_form, text="Agregar Horario", command=agregar_horario, bg='#212121', fg='white').grid(row=len(labels)+1, columnspan=2, pady=10)
     tk.Button(frame_form, text="Eliminar Horario", command=eliminar_horario, bg='#212121', fg='white').grid(row=len(labels)+2, columnspan=2, pady=10)
+    tk.Button(frame_form, text="Buscar Conflictos", command=buscar_conflictos_horario, bg='#212121', fg='white').grid(row=len(labels)+3, columnspan=2, pady=10)
+    tk.Button(frame_form, text="Importar desde Archivo", command=importar_horarios, bg='#212121', fg='white').grid(row=len(labels)+4, columnspan=2, pady=10)
 
     # Filtro de horarios
     filtro_frame = tk.Frame(frame_table, bg='#e0e0e0')
@@ -184,15 +182,30 @@ def abrir_gestion_horarios(root_menu):
 
     # Tabla de horarios
     columns = ["C.I.", "Nombre", "Materia", "Día", "Hora Inicio", "Hora Fin", "Horas Trabajadas"]
-    tree = ttk.Treeview(frame_table, columns=columns, show="headings", height=10)
-    
-    for col in columns:
-        tree.heading(col, text=col)
-        tree.column(col, width=110, anchor="center")
-    
-    tree.pack(pady=10, fill=tk.BOTH, expand=True)
-
-    actualizar_lista_horarios(tree)
+    tabla = TablaVirtual(frame_table, columns)
+
+    lbl_estado = tk.Label(frame_table, text="", bg='#e0e0e0', font=('Arial', 10))
+    lbl_estado.pack(anchor="w")
+
+    def cargar_datos():
+        """Lee docentes, materias y horarios fuera del hilo de la ventana."""
+        backend = obtener_backend()
+        return obtener_indice().nombres(), backend.leer("materias"), backend.leer_con_id("horarios")
+
+    def mostrar_datos(resultado):
+        nombres, filas_materias, filas_horarios = resultado
+        docentes_combo[:] = [f"{ci} - {nombre}" for ci, nombre in nombres.items()]
+        materias[:] = [row[0] for row in filas_materias]
+        combo_ci_nombre["values"] = docentes_combo
+        filtro_ci_nombre["values"] = docentes_combo
+        combo_materia["values"] = materias
+        actualizar_lista_horarios(tabla, filas=filas_horarios)
+
+    def cargar_horarios():
+        ejecutor.ejecutar(cargar_datos, estado=lbl_estado, mensaje="Cargando horarios...", al_terminar=mostrar_datos)
+
+    ejecutor = obtener_ejecutor(root_menu)
+    cargar_horarios()
 
     # Botón para volver al menú
     tk.Button(root, text="Volver al Menú", command=lambda: volver_al_menu(root, root_menu), 
@@ -0,0 +1,179 @@
+"""Importación masiva de docentes, materias y horarios desde un archivo CSV o Excel.
+
+Todas las filas se validan en una sola pasada contra lo que ya está guardado y contra las demás filas del
+archivo (C.I. repetidos, horas HH:MM, materias conocidas, bloques superpuestos) y los errores se informan
+juntos. Las filas válidas se guardan con una sola escritura del almacenamiento.
+
+Columnas esperadas (la fila de encabezados es opcional):
+    docentes: C.I., Nombre, Especialidad, Pago por Hora, Celular
+    materias: Materia
+    horarios: C.I., Materia, Día, Hora Inicio, Hora Fin
+              (también se acepta el formato de horarios.xlsx, con Nombre y Horas Trabajadas)
+"""
+import csv
+import os
+from datetime import datetime, time
+import openpyxl
+from almacenamiento import obtener_backend, texto, TABLAS
+from calculo_horarios import calcular_horas_trabajadas, validar_hora
+from calendario import DIAS_CLASE
+from indice_docentes import obtener_indice, normalizar_ci
+from intervalos import IndiceHorarios
+
+TABLAS_IMPORTABLES = ("docentes", "materias", "horarios")
+
+def leer_archivo(ruta):
+    """Devuelve las filas de un archivo .csv (separado por comas, punto y coma o tabulaciones) o .xlsx."""
+    if os.path.splitext(ruta)[1].lower() in (".xlsx", ".xlsm"):
+        wb = openpyxl.load_workbook(ruta, read_only=True, data_only=True)
+        try:
+            filas = [list(fila) for fila in wb.active.iter_rows(values_only=True)]
+        finally:
+            wb.close()
+    else:
+        with open(ruta, newline="", encoding="utf-8-sig") as archivo:
+            muestra = archivo.read(4096)
+            archivo.seek(0)
+            try:
+                dialecto = csv.Sniffer().sniff(muestra, delimiters=",;\t")
+            except csv.Error:
+                dialecto = csv.excel
+            filas = list(csv.reader(archivo, dialecto))
+    return filas
+
+def _valor(valor):
+    """Texto de una celda; las horas se dejan como HH:MM, igual que en el formulario."""
+    if isinstance(valor, (time, datetime)) and not (isinstance(valor, datetime) and valor.time() == time(0, 0)):
+        return valor.strftime("%H:%M")
+    return texto(valor)
+
+def validar(tabla, filas):
+    """Valida las filas del archivo y devuelve (aceptadas, errores). aceptadas tiene las filas listas para
+    guardar; errores es [(número de fila en el archivo, mensaje)]."""
+    if tabla not in TABLAS_IMPORTABLES:
+        raise ValueError(f"No se puede importar la tabla {tabla}.")
+    numerada = []
+    for numero, fila in enumerate(filas, start=1):
+        fila = [_valor(valor) for valor in fila]
+        while fila and not fila[-1]:
+            fila.pop()  # Celdas vacías del final (delimitador al final de la línea, columnas con formato)
+        if not fila:
+            continue
+        if numero == 1 and fila[0].lower() == TABLAS[tabla]["encabezados"][0].lower():
+            continue  # Fila de encabezados
+        numerada.append((numero, fila))
+    return {"docentes": _validar_docentes, "materias": _validar_materias, "horarios": _validar_horarios}[tabla](numerada)
+
+def _validar_docentes(numerada):
+    indice = obtener_indice()
+    vistos_ci = {}
+    vistos_nombre = {}
+    aceptadas, errores = [], []
+    for numero, fila in numerada:
+        fila = (fila + [""] * 5)[:5]
+        ci, nombre, _, pago, _ = fila
+        ci = normalizar_ci(ci)
+        problemas = []
+        if not all(fila):
+            problemas.append("todos los campos son obligatorios")
+        if ci and ci in indice:
+            problemas.append(f"ya existe un docente con el C.I. {ci}")
+        elif ci in vistos_ci:
+            problemas.append(f"el C.I. {ci} se repite en la fila {vistos_ci[ci]}")
+        if nombre and indice.ci_de(nombre) is not None:
+            problemas.append(f"ya existe un docente llamado {nombre}")
+        elif nombre in vistos_nombre:
+            problemas.append(f"el nombre se repite en la fila {vistos_nombre[nombre]}")
+        try:
+            if pago and float(pago.replace(",", ".")) < 0:
+                problemas.append("el pago por hora no puede ser negativo")
+        except ValueError:
+            problemas.append(f"el pago por hora '{pago}' no es un número")
+        if problemas:
+            errores.append((numero, "; ".join(problemas)))
+            continue
+        vistos_ci[ci] = numero
+        vistos_nombre[nombre] = numero
+        aceptadas.append([ci, nombre, fila[2], pago.replace(",", "."), fila[4]])
+    return aceptadas, errores
+
+def _validar_materias(numerada):
+    existentes = {texto(fila[0]).lower() for fila in obtener_backend().leer("materias")}
+    vistas = {}
+    aceptadas, errores = [], []
+    for numero, fila in numerada:
+        materia = fila[0] if fila else ""
+        if not materia:
+            errores.append((numero, "el campo de materia es obligatorio"))
+        elif materia.lower() in existentes:
+            errores.append((numero, f"la materia {materia} ya existe"))
+        elif materia.lower() in vistas:
+            errores.append((numero, f"la materia {materia} se repite en la fila {vistas[materia.lower()]}"))
+        else:
+            vistas[materia.lower()] = numero
+            aceptadas.append([materia])
+    return aceptadas, errores
+
+def _validar_horarios(numerada):
+    indice_docentes = obtener_indice()
+    materias = {texto(fila[0]).lower(): texto(fila[0]) for fila in obtener_backend().leer("materias")}
+    dias = {dia.lower(): dia for dia in DIAS_CLASE}
+    # Índice propio (no el compartido) para comparar también contra las filas aceptadas del archivo
+    horarios = IndiceHorarios(obtener_backend().leer("horarios"))
+    filas_aceptadas = {}  # Bloque aceptado -> número de fila en el archivo
+    aceptadas, errores = [], []
+    # El formato se elige una vez por archivo, con la primera fila: el de horarios.xlsx tiene el día en la
+    # cuarta columna (C.I., Nombre, Materia, Día, Inicio, Fin[, Horas]); el del formulario, en la tercera
+    formato_completo = bool(numerada) and len(numerada[0][1]) >= 6 and numerada[0][1][3].lower() in dias
+    for numero, fila in numerada:
+        if formato_completo:
+            fila = [fila[0]] + fila[2:6]
+        ci, materia, dia, hora_inicio, hora_fin = (fila + [""] * 5)[:5]
+        ci = normalizar_ci(ci)
+        problemas = []
+        if not all((ci, materia, dia, hora_inicio, hora_fin)):
+            problemas.append("todos los campos son obligatorios")
+        if ci and ci not in indice_docentes:
+            problemas.append(f"el C.I. {ci} no corresponde a ningún docente")
+        if materia and materia.lower() not in materias:
+            problemas.append(f"la materia {materia} no está registrada")
+        if dia and dia.lower() not in dias:
+            problemas.append(f"el día {dia} no es válido")
+        horas_validas = True
+        for hora in (hora_inicio, hora_fin):
+            if hora and not validar_hora(hora):
+                problemas.append(f"la hora {hora} debe estar en formato HH:MM")
+                horas_validas = False
+        if horas_validas and hora_inicio and hora_fin and calcular_horas_trabajadas(hora_inicio, hora_fin) <= 0:
+            problemas.append("la hora de fin debe ser posterior a la hora de inicio")
+        elif not problemas:
+            existente = horarios.conflicto(ci, dias[dia.lower()], hora_inicio, hora_fin)
+            if existente is not None:
+                numero_existente = filas_aceptadas.get(tuple(existente))
+                origen = (f"con la fila {numero_existente} del archivo" if numero_existente
+                          else "con un horario ya registrado")
+                problemas.append(f"se superpone {origen}: {existente[2]} de {existente[4]} a {existente[5]}")
+        if problemas:
+            errores.append((numero, "; ".join(problemas)))
+            continue
+        nueva = [ci, indice_docentes.nombre(ci), materias[materia.lower()], dias[dia.lower()], hora_inicio, hora_fin,
+                 str(calcular_horas_trabajadas(hora_inicio, hora_fin))]
+        horarios.agregar(nueva)
+        filas_aceptadas[tuple(nueva)] = numero
+        aceptadas.append(nueva)
+    return aceptadas, errores
+
+def importar(tabla, ruta, guardar=True):
+    """Lee y valida el archivo; si guardar es verdadero, guarda todas las filas válidas con una sola escritura.
+    Devuelve (aceptadas, errores)."""
+    aceptadas, errores = validar(tabla, leer_archivo(ruta))
+    if guardar and aceptadas:
+        obtener_backend().agregar(tabla, aceptadas)
+    return aceptadas, errores
+
+def describir_errores(errores, maximo=30):
+    """Texto con los errores de validación, uno por línea (los primeros maximo)."""
+    lineas = [f"Fila {numero}: {mensaje}" for numero, mensaje in errores[:maximo]]
+    if len(errores) > maximo:
+        lineas.append(f"... y {len(errores) - maximo} errores más.")
+    return "\n".join(lineas)
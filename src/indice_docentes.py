@@ -0,0 +1,126 @@
+import threading
+from almacenamiento import obtener_backend, TABLAS
+
+def normalizar_ci(valor):
+    """Devuelve el C.I. como texto comparable: sin espacios ni saltos de línea y sin el '.0'
+    que deja Excel cuando la celda es numérica."""
+    if valor is None:
+        return ""
+    if isinstance(valor, float) and valor.is_integer():
+        valor = int(valor)
+    ci = "".join(str(valor).split())
+    if ci.endswith(".0") and ci[:-2].isdigit():
+        ci = ci[:-2]
+    return ci
+
+def leer_pago(valor):
+    """Convierte el pago por hora de la celda a float (0.0 si está vacío)."""
+    return float(valor) if valor is not None and valor != "" else 0.0
+
+class IndiceDocentes:
+    """Docentes indexados por C.I. normalizado y por nombre, para buscarlos sin recorrer la lista."""
+
+    def __init__(self, filas=(), version=None):
+        self.version = version
+        self.por_ci = {}  # C.I. normalizado -> fila del archivo de docentes
+        self.por_nombre = {}  # Nombre -> C.I. normalizado
+        for fila in filas:
+            self.agregar(fila)
+
+    def agregar(self, fila):
+        """Agrega o reemplaza un docente en el índice."""
+        ci = normalizar_ci(fila[0])
+        if not ci:
+            return
+        anterior = self.por_ci.get(ci)
+        if anterior is not None:
+            self.por_nombre.pop(str(anterior[1]).strip(), None)
+        self.por_ci[ci] = list(fila)
+        self.por_nombre[str(fila[1]).strip()] = ci
+
+    def actualizar(self, ci_anterior, fila):
+        """Reemplaza los datos de un docente, también si cambió su C.I."""
+        anterior = self.por_ci.pop(normalizar_ci(ci_anterior), None)
+        if anterior is not None:
+            self.por_nombre.pop(str(anterior[1]).strip(), None)
+        self.agregar(fila)
+
+    def __contains__(self, ci):
+        return normalizar_ci(ci) in self.por_ci
+
+    def __len__(self):
+        return len(self.por_ci)
+
+    def fila(self, ci):
+        """Devuelve la fila del docente tal como está guardada, o None."""
+        return self.por_ci.get(normalizar_ci(ci))
+
+    def nombre(self, ci):
+        fila = self.fila(ci)
+        return str(fila[1]).strip() if fila is not None else None
+
+    def pago(self, ci):
+        """Devuelve el pago por hora del docente, o None si no existe."""
+        fila = self.fila(ci)
+        return leer_pago(fila[3]) if fila is not None else None
+
+    def ci_de(self, nombre):
+        """Devuelve el C.I. del docente con ese nombre, o None."""
+        return self.por_nombre.get(str(nombre).strip())
+
+    def nombres(self):
+        """Devuelve un diccionario C.I. -> nombre."""
+        return {ci: str(fila[1]).strip() for ci, fila in self.por_ci.items()}
+
+    def docentes(self):
+        """Devuelve un diccionario C.I. -> (nombre, pago por hora), como lo usan los reportes."""
+        docentes = {}
+        for ci, fila in self.por_ci.items():
+            try:
+                docentes[ci] = (str(fila[1]).strip(), leer_pago(fila[3]))  # Índice 3: "Pago por Hora"
+            except ValueError as e:
+                print(f"Error al procesar la fila {fila}: {e}")
+        return docentes
+
+_indice = None
+_lock = threading.Lock()
+
+def obtener_indice():
+    """Devuelve el índice de docentes, leyéndolo de nuevo solo si el archivo de docentes cambió."""
+    global _indice
+    backend = obtener_backend()
+    version = backend.version("docentes")
+    with _lock:
+        if _indice is not None and _indice.version == version:
+            return _indice
+    indice = IndiceDocentes(backend.leer("docentes"), version)
+    with _lock:
+        _indice = indice
+    return indice
+
+def agregar_docente(fila):
+    """Guarda un docente nuevo y lo agrega al índice sin volver a leer el archivo."""
+    backend = obtener_backend()
+    indice = obtener_indice()
+    backend.agregar("docentes", [fila])
+    with _lock:
+        indice.agregar(fila)
+        indice.version = backend.version("docentes")
+
+def actualizar_docente(ci_anterior, fila):
+    """Guarda los cambios de un docente y actualiza el índice. Devuelve False si el C.I. no existe; lanza
+    ValueError si el C.I. se cambió por el de otro docente."""
+    backend = obtener_backend()
+    indice = obtener_indice()
+    guardada = indice.fila(ci_anterior)
+    if guardada is None:
+        return False
+    if normalizar_ci(fila[0]) != normalizar_ci(ci_anterior) and normalizar_ci(fila[0]) in indice:
+        raise ValueError("Ya existe un docente registrado con ese C.I.")
+    # Se filtra con el C.I. tal como está guardado (número o texto) para que la fila coincida
+    columnas = TABLAS["docentes"]["columnas"]
+    backend.actualizar("docentes", {"ci": guardada[0]}, dict(zip(columnas, fila)))
+    with _lock:
+        indice.actualizar(ci_anterior, fila)
+        indice.version = backend.version("docentes")
+    return True
@@ -0,0 +1,118 @@
+import heapq
+import threading
+from bisect import bisect_left
+from almacenamiento import obtener_backend
+from calendario import convertir_hora_programada
+from indice_docentes import normalizar_ci
+
+def minutos(hora):
+    """Convierte una hora del horario (texto HH:MM o time) a minutos desde la medianoche."""
+    hora = convertir_hora_programada(hora)
+    return hora.hour * 60 + hora.minute
+
+def _bloque(fila):
+    """Devuelve ((C.I., día), inicio, fin) de una fila de horarios, con las horas en minutos."""
+    return (normalizar_ci(fila[0]), str(fila[3]).strip().lower()), minutos(fila[4]), minutos(fila[5])
+
+class IndiceHorarios:
+    """Bloques de clase de cada docente por día, ordenados por hora de inicio, para saber con una búsqueda
+    binaria si un bloque nuevo se superpone con otro. Dos bloques que solo se tocan (10:00-12:00 y
+    12:00-14:00) no se superponen."""
+
+    def __init__(self, filas=(), version=None):
+        self.version = version
+        # (C.I., día) -> ([inicios], [fines], [filas], [mayor fin hasta cada posición]), ordenados por inicio
+        self.bloques = {}
+        for fila in filas:
+            try:
+                self.agregar(fila)
+            except (ValueError, TypeError, AttributeError) as e:
+                print(f"Error al procesar el horario {fila}: {e}")
+
+    def agregar(self, fila):
+        clave, inicio, fin = _bloque(fila)
+        inicios, fines, filas, maximos = self.bloques.setdefault(clave, ([], [], [], []))
+        posicion = bisect_left(inicios, inicio)
+        inicios.insert(posicion, inicio)
+        fines.insert(posicion, fin)
+        filas.insert(posicion, list(fila))
+        # Solo cambia el mayor fin desde la posición insertada (cada docente tiene pocos bloques por día)
+        maximos.insert(posicion, 0)
+        for i in range(posicion, len(fines)):
+            maximos[i] = max(fines[i], maximos[i - 1] if i else fines[i])
+
+    def conflicto(self, ci, dia, hora_inicio, hora_fin):
+        """Devuelve la fila de un bloque del docente ese día que se superpone con el horario dado, o None."""
+        bloques = self.bloques.get((normalizar_ci(ci), str(dia).strip().lower()))
+        if not bloques:
+            return None
+        inicios, fines, filas, maximos = bloques
+        inicio, fin = minutos(hora_inicio), minutos(hora_fin)
+        # Los bloques que empiezan antes del fin nuevo son los de [0, hasta); alguno se superpone
+        # si el mayor de sus fines pasa del inicio nuevo
+        hasta = bisect_left(inicios, fin)
+        if hasta == 0 or maximos[hasta - 1] <= inicio:
+            return None
+        for i in range(hasta - 1, -1, -1):
+            if fines[i] > inicio:
+                return filas[i]
+        return None
+
+def buscar_conflictos(filas):
+    """Recorre todo el horario y devuelve [(fila, fila)] con cada par de bloques superpuestos del mismo
+    docente el mismo día. Ordena los bloques de cada docente y día y los barre una sola vez, guardando en
+    un montículo los que siguen abiertos: O(n log n + conflictos)."""
+    por_clave = {}
+    for fila in filas:
+        try:
+            clave, inicio, fin = _bloque(fila)
+        except (ValueError, TypeError, AttributeError) as e:
+            print(f"Error al procesar el horario {fila}: {e}")
+            continue
+        por_clave.setdefault(clave, []).append((inicio, fin, list(fila)))
+
+    conflictos = []
+    for bloques in por_clave.values():
+        bloques.sort(key=lambda bloque: (bloque[0], bloque[1]))
+        abiertos = []  # (fin, posición) de los bloques que todavía no terminaron
+        for posicion, (inicio, fin, fila) in enumerate(bloques):
+            while abiertos and abiertos[0][0] <= inicio:
+                heapq.heappop(abiertos)
+            for _, anterior in abiertos:
+                conflictos.append((bloques[anterior][2], fila))
+            heapq.heappush(abiertos, (fin, posicion))
+    return conflictos
+
+_indice = None
+_lock = threading.Lock()
+_lock_agregar = threading.Lock()  # Dos altas simultáneas no deben validar contra el mismo índice
+
+def obtener_indice_horarios():
+    """Devuelve el índice de horarios, armándolo de nuevo solo si cambió el archivo de horarios."""
+    global _indice
+    backend = obtener_backend()
+    version = backend.version("horarios")
+    with _lock:
+        if _indice is not None and _indice.version == version:
+            return _indice
+    indice = IndiceHorarios(backend.leer("horarios"), version)
+    with _lock:
+        _indice = indice
+    return indice
+
+def agregar_horario(fila):
+    """Guarda un bloque de horario si no se superpone con otro del docente ese día y devuelve el id de la fila;
+    si se superpone lanza ValueError con el bloque existente. El índice se actualiza sin volver a leer el archivo."""
+    if minutos(fila[5]) <= minutos(fila[4]):
+        raise ValueError("La hora de fin debe ser posterior a la hora de inicio.")
+    backend = obtener_backend()
+    with _lock_agregar:
+        indice = obtener_indice_horarios()
+        existente = indice.conflicto(fila[0], fila[3], fila[4], fila[5])
+        if existente is not None:
+            raise ValueError(f"El docente ya tiene {existente[2]} el {existente[3]} de {existente[4]} a {existente[5]}.")
+        id_fila, = backend.agregar("horarios", [fila])
+        with _lock:
+            indice.agregar(fila)
+            indice.version = backend.version("horarios")
+    return id_fila
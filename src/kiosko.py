@@ -0,0 +1,116 @@
+import tkinter as tk
+from asistencia import origen_asistencia, verificar_archivo_asistencia
+from cliente_asistencia import obtener_cliente
+from calendario import describir_clase
+from cola_escaneos import ColaEscaneos
+from indice_docentes import obtener_indice, normalizar_ci
+
+INTERVALO_REVISION = 50  # Milisegundos entre cada revisión de los escaneos terminados
+DURACION_AVISO = 4000  # Milisegundos que se muestra cada aviso
+MAXIMO_AVISOS = 6
+COLORES = {"entrada": '#2e7d32', "salida": '#1565c0', "error": '#c62828', "repetido": '#616161'}
+
+def registrar_escaneo(ci):
+    """Registra la entrada o salida del C.I. escaneado y devuelve (tipo, fila, aviso). Se ejecuta en el hilo
+    de la cola de escaneos; lanza ValueError si el C.I. no corresponde a ningún docente."""
+    remoto = obtener_cliente() is not None
+    nombre = None
+    if not remoto:
+        nombre = obtener_indice().nombre(ci)
+        if nombre is None:
+            raise ValueError("El C.I. ingresado no corresponde a ningún docente.")
+    # El registro queda en el diario al instante; el almacén lo guarda en el Excel en segundo plano
+    origen = origen_asistencia()
+    tipo, indice = origen.registrar(ci, nombre)
+    return tipo, origen.obtener_fila(indice), "" if remoto else describir_clase(ci)
+
+def abrir_kiosco(root_menu):
+    """Abre el modo kiosco: un campo siempre listo para el lector de credenciales, avisos que se cierran solos
+    y los escaneos por minuto y la latencia de cada registro."""
+    if obtener_cliente() is None:
+        verificar_archivo_asistencia()
+
+    if hasattr(abrir_kiosco, "ventana") and abrir_kiosco.ventana.winfo_exists():
+        abrir_kiosco.ventana.lift()
+        return
+
+    root_menu.withdraw()
+    root = tk.Toplevel()
+    abrir_kiosco.ventana = root
+    root.title("Registro de Asistencia - Kiosco")
+    root.geometry("1000x600")
+    root.state('zoomed')
+    root.configure(bg='#e0e0e0')
+
+    tk.Label(root, text="Escanee su credencial o escriba su C.I.", font=("Arial", 24), bg='#e0e0e0').pack(pady=30)
+    entry_ci = tk.Entry(root, width=20, justify='center', font=('Arial', 28))
+    entry_ci.pack(pady=10)
+    entry_ci.focus_set()
+
+    frame_avisos = tk.Frame(root, bg='#e0e0e0')
+    frame_avisos.pack(fill=tk.BOTH, expand=True, padx=40, pady=20)
+
+    lbl_estadisticas = tk.Label(root, text="", bg='#e0e0e0', font=('Arial', 11))
+    lbl_estadisticas.pack(pady=5)
+
+    # Cargar el índice de docentes antes del primer escaneo
+    if obtener_cliente() is None:
+        obtener_indice()
+    cola = ColaEscaneos(registrar_escaneo)
+
+    def mostrar_aviso(texto, tipo):
+        """Muestra un aviso que no bloquea la ventana y se quita solo."""
+        avisos = frame_avisos.winfo_children()
+        if len(avisos) >= MAXIMO_AVISOS:
+            avisos[0].destroy()
+        aviso = tk.Label(frame_avisos, text=texto, bg=COLORES[tipo], fg='white', font=('Arial', 16),
+                         anchor="w", justify=tk.LEFT, padx=15, pady=8)
+        aviso.pack(fill=tk.X, pady=4)
+        root.after(DURACION_AVISO, lambda: aviso.winfo_exists() and aviso.destroy())
+
+    def escanear(event=None):
+        """Pasa el C.I. a la cola y deja el campo listo para el siguiente enseguida."""
+        ci = normalizar_ci(entry_ci.get())
+        entry_ci.delete(0, tk.END)
+        if ci and not cola.escanear(ci):
+            mostrar_aviso(f"{ci}: escaneo repetido, ya se está registrando.", "repetido")
+
+    def revisar():
+        """Muestra los escaneos que terminó de registrar la cola y actualiza los contadores."""
+        if not root.winfo_exists():
+            return
+        for estado, ci, resultado, latencia in cola.obtener_resultados():
+            if estado == "error":
+                mostrar_aviso(f"{ci}: {resultado}", "error")
+                continue
+            tipo, fila, aviso = resultado
+            hora = fila[3] if tipo == "entrada" else fila[4]
+            mostrar_aviso(f"{fila[1]} - {tipo} a las {hora}\n{aviso}".strip(), tipo)
+        datos = cola.estadisticas()
+        lbl_estadisticas.config(text=f"Escaneos por minuto: {datos['por_minuto']}   "
+                                     f"Última latencia: {_milisegundos(datos['latencia_ms'])}   "
+                                     f"p50: {_milisegundos(datos['p50_ms'])}   p95: {_milisegundos(datos['p95_ms'])}   "
+                                     f"En cola: {datos['pendientes']}   Repetidos: {datos['repetidos']}")
+        root.after(INTERVALO_REVISION, revisar)
+
+    def cerrar():
+        cola.cerrar()
+        volver_al_menu(root, root_menu)
+
+    entry_ci.bind('<Return>', escanear)
+    # Si se hace clic en otro lugar, el foco vuelve al campo para no perder lecturas del lector
+    root.bind('<FocusIn>', lambda event: entry_ci.focus_set())
+    root.after(INTERVALO_REVISION, revisar)
+
+    tk.Button(root, text="Volver al Menú", command=cerrar, bg='#212121', fg='white', width=20).pack(pady=10)
+    root.protocol("WM_DELETE_WINDOW", cerrar)
+    root.mainloop()
+
+def _milisegundos(valor):
+    return "-" if valor is None else f"{valor:.0f} ms"
+
+def volver_al_menu(root_actual, root_menu):
+    """Cierra la ventana actual y muestra nuevamente el menú principal."""
+    root_actual.destroy()
+    root_menu.deiconify()
+    root_menu.state('zoomed')  # Maximiza la ventana del menú principal al volver
@@ -1,9 +1,34 @@
+import importlib
+import os
+import threading
 import tkinter as tk
-from registroDocente import abrir_lista_docentes
-from materias import abrir_lista_materias
-from horarios import abrir_gestion_horarios
-from asistencia import abrir_registro_asistencia
-from reporte_mensual import abrir_reporte
+
+# Módulo y función de cada ventana; se importan recién al usarlos para que el menú aparezca rápido
+VENTANAS = {
+    "docentes": ("registroDocente", "abrir_lista_docentes"),
+    "materias": ("materias", "abrir_lista_materias"),
+    "horarios": ("horarios", "abrir_gestion_horarios"),
+    "asistencia": ("asistencia", "abrir_registro_asistencia"),
+    "kiosco": ("kiosko", "abrir_kiosco"),
+    "reporte": ("reporte_mensual", "abrir_reporte"),
+}
+
+# Con ECOS_PRECARGA=0 los módulos se cargan solo al abrir cada ventana
+PRECARGAR = os.environ.get("ECOS_PRECARGA", "1") != "0"
+ESPERA_PRECARGA = 500  # Milisegundos después de mostrar el menú antes de precargar
+
+def abrir_ventana(nombre, root_menu):
+    """Importa el módulo de la ventana la primera vez y la abre."""
+    modulo, funcion = VENTANAS[nombre]
+    getattr(importlib.import_module(modulo), funcion)(root_menu)
+
+def precargar_modulos():
+    """Importa en segundo plano los módulos de las ventanas (y openpyxl) mientras el menú ya está visible."""
+    for modulo, _ in VENTANAS.values():
+        try:
+            importlib.import_module(modulo)
+        except Exception as e:
+            print(f"No se pudo precargar {modulo}: {e}")
 
 def main():
     """Inicializa la aplicación principal."""
@@ -16,28 +41,35 @@ def main():
     tk.Label(root_menu, text="Sistema de Gestión de Docentes", font=("Arial", 16), bg='#e0e0e0').pack(pady=20)
 
     # Botón para abrir la lista de docentes
-    tk.Button(root_menu, text="Lista de Docentes", command=lambda: abrir_lista_docentes(root_menu), 
+    tk.Button(root_menu, text="Lista de Docentes", command=lambda: abrir_ventana("docentes", root_menu), 
               bg='#d32f2f', fg='white', width=20).pack(pady=10)
     
     # Botón para abrir la lista de materias
-    tk.Button(root_menu, text="Lista de Materias", command=lambda: abrir_lista_materias(root_menu), 
+    tk.Button(root_menu, text="Lista de Materias", command=lambda: abrir_ventana("materias", root_menu), 
               bg='#d32f2f', fg='white', width=20).pack(pady=10)
 
     # Botón para abrir la gestión de horarios
-    tk.Button(root_menu, text="Gestión de Horarios", command=lambda: abrir_gestion_horarios(root_menu), 
+    tk.Button(root_menu, text="Gestión de Horarios", command=lambda: abrir_ventana("horarios", root_menu), 
               bg='#d32f2f', fg='white', width=20).pack(pady=10)
 
     # Botón para abrir el registro de asistencia
-    tk.Button(root_menu, text="Registro de Asistencia", command=lambda: abrir_registro_asistencia(root_menu), 
+    tk.Button(root_menu, text="Registro de Asistencia", command=lambda: abrir_ventana("asistencia", root_menu), 
               bg='#d32f2f', fg='white', width=20).pack(pady=10)
     
+    # Botón para abrir el modo kiosco (registro continuo con el lector de credenciales)
+    tk.Button(root_menu, text="Modo Kiosco", command=lambda: abrir_ventana("kiosco", root_menu),
+              bg='#d32f2f', fg='white', width=20).pack(pady=10)
+
     # Botón para abrir el reporte
-    tk.Button(root_menu, text="Generar Reporte", command=lambda: abrir_reporte(root_menu), 
+    tk.Button(root_menu, text="Generar Reporte", command=lambda: abrir_ventana("reporte", root_menu), 
               bg='#d32f2f', fg='white', width=20).pack(pady=10)
 
     # Botón para salir de la aplicación
     tk.Button(root_menu, text="Salir", command=root_menu.quit, bg='#b71c1c', fg='white', width=20).pack(pady=10)
 
+    if PRECARGAR:
+        root_menu.after(ESPERA_PRECARGA, lambda: threading.Thread(target=precargar_modulos, daemon=True).start())
+
     root_menu.mainloop()
 
 if __name__ == "__main__":
@@ -1,27 +1,23 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import openpyxl
-import os
-
-archivo_materias = os.path.join(os.path.dirname(__file__), '../data/materias.xlsx')
+from almacenamiento import obtener_backend
+from tareas import obtener_ejecutor
+from ventana_importacion import importar_desde_archivo
 
 def verificar_archivo_materias():
     """Verifica si el archivo de materias existe, si no lo crea vacío con encabezados."""
-    if not os.path.exists(archivo_materias):
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.append(["Materia"])
-        wb.save(archivo_materias)
-
-def actualizar_lista_materias(tree):
-    """Actualiza la tabla de materias en la ventana."""
+    obtener_backend().verificar("materias")
+
+def actualizar_lista_materias(tree, filas=None):
+    """Actualiza la tabla de materias en la ventana (con las filas [(id, fila)] ya leídas, si se pasan).
+    Cada ítem usa como iid el id de la fila en el almacenamiento."""
     for row in tree.get_children():
         tree.delete(row)
 
-    wb = openpyxl.load_workbook(archivo_materias)
-    ws = wb.active
-    for row in ws.iter_rows(min_row=2, values_only=True):
-        tree.insert("", "end", values=row)
+    if filas is None:
+        filas = obtener_backend().leer_con_id("materias")
+    for id_fila, row in filas:
+        tree.insert("", "end", iid=str(id_fila), values=row)
 
 def abrir_lista_materias(root_menu):
     """Abre la ventana con la lista de materias y el formulario de registro."""
@@ -70,12 +66,12 @@ def abrir_lista_materias(root_menu):
             messagebox.showwarning("Campo incompleto", "El campo de materia es obligatorio.")
             return
 
-        wb = openpyxl.load_workbook(archivo_materias)
-        ws = wb.active
-        ws.append([materia])
-        wb.save(archivo_materias)
+        def guardar():
+            obtener_backend().agregar("materias", [[materia]])
+            return obtener_backend().leer_con_id("materias")
 
-        actualizar_lista_materias(tree)
+        ejecutor.ejecutar(guardar, estado=lbl_estado, mensaje="Guardando materia...",
+                          al_terminar=lambda filas: actualizar_lista_materias(tree, filas))
         entry_materia.delete(0, tk.END)
 
     def eliminar_materia():
@@ -85,20 +81,27 @@ def abrir_lista_materias(root_menu):
             messagebox.showwarning("Seleccionar materia", "Debe seleccionar una materia para eliminar.")
             return
         
-        materia = tree.item(selected_item, "values")[0]
+        id_fila = int(selected_item[0])
+        valores = tree.item(selected_item, "values")
+
+        def eliminar():
+            obtener_backend().eliminar_id("materias", id_fila, valores)
+            return obtener_backend().leer_con_id("materias")
 
-        wb = openpyxl.load_workbook(archivo_materias)
-        ws = wb.active
-        for row in ws.iter_rows(min_row=2):
-            if row[0].value == materia:
-                ws.delete_rows(row[0].row)
-                break
-        wb.save(archivo_materias)
+        ejecutor.ejecutar(eliminar, estado=lbl_estado, mensaje="Eliminando materia...",
+                          al_terminar=lambda filas: actualizar_lista_materias(tree, filas))
 
-        actualizar_lista_materias(tree)
+    def importar_materias():
+        """Agrega las materias de un archivo CSV o Excel."""
+        importar_desde_archivo(root, ejecutor, "materias", lbl_estado, cargar_materias)
+
+    def cargar_materias():
+        ejecutor.ejecutar(obtener_backend().leer_con_id, "materias", estado=lbl_estado, mensaje="Cargando materias...",
+                          al_terminar=lambda filas: actualizar_lista_materias(tree, filas))
 
     tk.Button(frame_form, text="Agregar Materia", command=agregar_materia, bg='#212121', fg='white').grid(row=1, column=0, pady=10)
     tk.Button(frame_form, text="Eliminar Materia", command=eliminar_materia, bg='#212121', fg='white').grid(row=1, column=1, pady=10)
+    tk.Button(frame_form, text="Importar desde Archivo", command=importar_materias, bg='#212121', fg='white').grid(row=2, columnspan=2, pady=10)
 
     # Tabla de materias
     columns = ["Materia"]
@@ -110,7 +113,11 @@ def abrir_lista_materias(root_menu):
     
     tree.pack(pady=10, fill=tk.BOTH, expand=True)
 
-    actualizar_lista_materias(tree)
+    lbl_estado = tk.Label(frame_table, text="", bg='#e0e0e0', font=('Arial', 10))
+    lbl_estado.pack(anchor="w")
+
+    ejecutor = obtener_ejecutor(root_menu)
+    cargar_materias()
 
     # Botón para volver al menú
     tk.Button(root, text="Volver al Menú", command=lambda: volver_al_menu(root, root_menu), 
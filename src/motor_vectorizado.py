@@ -0,0 +1,145 @@
+import sys
+from datetime import datetime
+from calculo_reporte import (cargar_datos_mes, generar_reporte, convertir_hora, convertir_hora_programada,
+                             obtener_docentes)
+from calendario import DIAS_SEMANA
+
+try:
+    import numpy as np
+except ImportError:  # NumPy solo es necesario para este motor
+    np = None
+
+# Reglas de descuento, iguales a las de calcular_deduccion; se pueden cambiar para simular otras reglas
+REGLAS = {"tolerancia_minutos": 5, "descuento_leve": 5, "descuento_grave": 10}
+
+def _segundos(hora):
+    return hora.hour * 3600 + hora.minute * 60 + hora.second
+
+def cargar_columnas(datos):
+    """Convierte los datos de cargar_datos_mes en columnas de NumPy (marcas de tiempo en segundos int64)."""
+    cis = list(datos["docentes"])
+    codigos = {ci: codigo for codigo, ci in enumerate(cis)}
+
+    horario_ci, horario_dia, horario_inicio = [], [], []
+    for ci, horario in datos["horarios"].items():
+        if ci not in codigos:
+            continue
+        for dia, materias in horario.items():
+            for _, hora_inicio, _ in materias:
+                horario_ci.append(codigos[ci])
+                horario_dia.append(DIAS_SEMANA[dia.lower()])
+                horario_inicio.append(_segundos(convertir_hora_programada(hora_inicio)))
+
+    feriados = datos.get("feriados", {})
+    asistencia_ci, asistencia_dia, asistencia_entrada, asistencia_salida = [], [], [], []
+    for ci, filas in datos["asistencia"].items():
+        if ci not in codigos:
+            continue
+        for row in filas:
+            fecha = row[2]
+            if isinstance(fecha, str):
+                fecha = datetime.strptime(fecha.strip(), '%Y-%m-%d')
+            if isinstance(fecha, datetime):
+                fecha = fecha.date()
+            entrada = convertir_hora(fecha, row[3])
+            if entrada is None or fecha in feriados:  # Los feriados no tienen clases
+                continue
+            salida = convertir_hora(fecha, row[4])
+            asistencia_ci.append(codigos[ci])
+            asistencia_dia.append(fecha.toordinal())
+            asistencia_entrada.append(fecha.toordinal() * 86400 + _segundos(entrada))
+            asistencia_salida.append(fecha.toordinal() * 86400 + _segundos(salida) if salida else -1)
+
+    return {
+        "cis": cis,
+        "pago_por_hora": np.array([datos["docentes"][ci][1] for ci in cis], dtype=np.float64),
+        "horario_ci": np.array(horario_ci, dtype=np.int64),
+        "horario_dia": np.array(horario_dia, dtype=np.int64),
+        "horario_inicio": np.array(horario_inicio, dtype=np.int64),
+        "asistencia_ci": np.array(asistencia_ci, dtype=np.int64),
+        "asistencia_dia": np.array(asistencia_dia, dtype=np.int64),
+        "asistencia_entrada": np.array(asistencia_entrada, dtype=np.int64),
+        "asistencia_salida": np.array(asistencia_salida, dtype=np.int64),
+    }
+
+def calcular_planilla(columnas, reglas=REGLAS):
+    """Calcula retrasos, descuentos y horas por sesión y los totales por docente de forma vectorizada."""
+    cantidad_docentes = len(columnas["cis"])
+
+    # Unir cada asistencia con las clases de ese docente en ese día de la semana
+    clave_horario = columnas["horario_ci"] * 7 + columnas["horario_dia"]
+    orden = np.argsort(clave_horario, kind="stable")
+    clave_horario = clave_horario[orden]
+    inicio_horario = columnas["horario_inicio"][orden]
+
+    dia_semana = (columnas["asistencia_dia"] - 1) % 7  # toordinal(): el día 1 fue lunes
+    clave_asistencia = columnas["asistencia_ci"] * 7 + dia_semana
+    desde = np.searchsorted(clave_horario, clave_asistencia, side="left")
+    hasta = np.searchsorted(clave_horario, clave_asistencia, side="right")
+    clases = hasta - desde
+
+    # Las asistencias en días sin clase no cuentan, igual que en generar_reporte
+    con_clase = clases > 0
+    ci = columnas["asistencia_ci"][con_clase]
+    dia = columnas["asistencia_dia"][con_clase]
+    entrada = columnas["asistencia_entrada"][con_clase]
+    salida = columnas["asistencia_salida"][con_clase]
+    desde, clases = desde[con_clase], clases[con_clase]
+    cantidad = len(ci)
+
+    # Una fila por (asistencia, clase programada ese día) para sumar los retrasos de cada clase
+    fila = np.repeat(np.arange(cantidad), clases)
+    desplazamiento = np.arange(len(fila)) - np.repeat(np.cumsum(clases) - clases, clases)
+    programada = dia[fila] * 86400 + inicio_horario[np.repeat(desde, clases) + desplazamiento]
+    diferencia = entrada[fila] - programada
+    retraso_clase = np.where(diferencia > 0, diferencia // 60, 0)
+    retraso = np.bincount(fila, weights=retraso_clase, minlength=cantidad).astype(np.int64)
+
+    deduccion = np.where(retraso <= reglas["tolerancia_minutos"], reglas["descuento_leve"], reglas["descuento_grave"])
+    horas = np.where(salida >= 0, np.round(((salida - entrada) % 86400) / 3600, 2), 0.0)
+
+    total_horas = np.bincount(ci, weights=horas, minlength=cantidad_docentes)
+    total_deducciones = np.bincount(ci, weights=deduccion, minlength=cantidad_docentes)
+    total_retraso = np.bincount(ci, weights=retraso, minlength=cantidad_docentes)
+    total_ganado = np.round(total_horas * columnas["pago_por_hora"], 2)
+    neto_ganado = np.round(total_ganado - total_deducciones, 2)
+
+    return {
+        "sesiones": {"ci": ci, "dia": dia, "retraso_minutos": retraso, "deduccion": deduccion, "horas": horas},
+        "totales": {
+            columnas["cis"][codigo]: (round(float(total_horas[codigo]), 2), float(total_ganado[codigo]),
+                                      round(float(total_deducciones[codigo]), 2), float(neto_ganado[codigo]),
+                                      int(total_retraso[codigo]))
+            for codigo in range(cantidad_docentes)
+        },
+    }
+
+def planilla_mes(mes, year, reglas=REGLAS):
+    """Calcula la planilla de toda la institución para el mes dado."""
+    if np is None:
+        raise RuntimeError("El motor vectorizado necesita NumPy (pip install numpy).")
+    return calcular_planilla(cargar_columnas(cargar_datos_mes(mes, year)), reglas)
+
+def verificar_motor(mes, year, tolerancia=0.011):
+    """Compara los totales del motor vectorizado con generar_reporte y devuelve los C.I. que difieren."""
+    datos = cargar_datos_mes(mes, year)
+    totales = calcular_planilla(cargar_columnas(datos))["totales"]
+    diferencias = []
+    for ci in datos["docentes"]:
+        _, total_horas, total_ganado, deducciones, neto_ganado = generar_reporte(ci, mes, year, datos)
+        esperado = (total_horas, total_ganado, deducciones, neto_ganado)
+        if any(abs(a - b) > tolerancia for a, b in zip(esperado, totales[ci][:4])):
+            diferencias.append((ci, esperado, totales[ci][:4]))
+    return diferencias
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Uso: python motor_vectorizado.py <mes> <año>")
+        sys.exit(1)
+    mes, year = int(sys.argv[1]), int(sys.argv[2])
+    docentes = obtener_docentes()
+    for ci, (total_horas, total_ganado, deducciones, neto_ganado, retraso) in planilla_mes(mes, year)["totales"].items():
+        print(f"{ci}\t{docentes[ci][0]}\tHoras: {total_horas}\tGanado: {total_ganado}\t"
+              f"Deducciones: {deducciones}\tNeto: {neto_ganado}\tRetraso: {retraso} min")
+    diferencias = verificar_motor(mes, year)
+    print("Coincide con generar_reporte." if not diferencias else f"Diferencias: {diferencias}")
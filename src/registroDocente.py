@@ -1,27 +1,22 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import openpyxl
-import os
-from datetime import datetime
-
-archivo_docentes = os.path.join(os.path.dirname(__file__), '../data/docentes.xlsx')
+from almacenamiento import obtener_backend
+from indice_docentes import obtener_indice, agregar_docente, actualizar_docente, normalizar_ci
+from tareas import obtener_ejecutor
+from ventana_importacion import importar_desde_archivo
 
 def verificar_archivo():
     """Verifica si el archivo de docentes existe, si no lo crea vacío con encabezados."""
-    if not os.path.exists(archivo_docentes):
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.append(["C.I.", "Nombre", "Especialidad", "Pago por Hora", "Celular"])
-        wb.save(archivo_docentes)
-
-def actualizar_lista(tree):
-    """Actualiza la tabla de docentes en la ventana."""
+    obtener_backend().verificar("docentes")
+
+def actualizar_lista(tree, filas=None):
+    """Actualiza la tabla de docentes en la ventana (con las filas ya leídas, si se pasan)."""
     for row in tree.get_children():
         tree.delete(row)
 
-    wb = openpyxl.load_workbook(archivo_docentes)
-    ws = wb.active
-    for row in ws.iter_rows(min_row=2, values_only=True):
+    if filas is None:
+        filas = obtener_backend().leer("docentes")
+    for row in filas:
         tree.insert("", "end", values=row)
 
 def abrir_lista_docentes(root_menu):
@@ -67,6 +62,12 @@ def abrir_lista_docentes(root_menu):
         entry.grid(row=i, column=1, padx=5, pady=5)
         entries.append(entry)
 
+    def mostrar_guardado(filas):
+        """Muestra la lista guardada y limpia el formulario; si el guardado falla, los datos quedan para corregirlos."""
+        actualizar_lista(tree, filas)
+        for entry in entries:
+            entry.delete(0, tk.END)
+
     def agregar_docente():
         """Agrega un nuevo docente al archivo y actualiza la lista."""
         datos = [entry.get() for entry in entries]
@@ -75,15 +76,17 @@ def abrir_lista_docentes(root_menu):
             messagebox.showwarning("Campos incompletos", "Todos los campos son obligatorios.")
             return
 
-        wb = openpyxl.load_workbook(archivo_docentes)
-        ws = wb.active
-        ws.append(datos)
-        wb.save(archivo_docentes)
+        datos[0] = normalizar_ci(datos[0])
+        if datos[0] in obtener_indice():
+            messagebox.showwarning("C.I. duplicado", "Ya existe un docente registrado con ese C.I.")
+            return
 
-        actualizar_lista(tree)
+        def guardar():
+            agregar_docente(datos)
+            return obtener_backend().leer("docentes")
 
-        for entry in entries:
-            entry.delete(0, tk.END)
+        # El guardado y la relectura se hacen en segundo plano; la tabla se actualiza al terminar
+        ejecutor.ejecutar(guardar, estado=lbl_estado, mensaje="Guardando docente...", al_terminar=mostrar_guardado)
 
     def editar_docente():
         """Permite editar los datos de un docente seleccionado."""
@@ -112,24 +115,31 @@ def abrir_lista_docentes(root_menu):
             messagebox.showwarning("Campos incompletos", "Todos los campos son obligatorios.")
             return
 
-        wb = openpyxl.load_workbook(archivo_docentes)
-        ws = wb.active
+        # El docente se busca en el índice por el C.I. de la fila seleccionada, así también se puede corregir el C.I.
+        ci_anterior = tree.item(selected_item, "values")[0]
+        datos[0] = normalizar_ci(datos[0])
+        if datos[0] != normalizar_ci(ci_anterior) and datos[0] in obtener_indice():
+            messagebox.showwarning("C.I. duplicado", "Ya existe un docente registrado con ese C.I.")
+            return
+        def guardar():
+            if not actualizar_docente(ci_anterior, datos):
+                raise ValueError("El docente seleccionado ya no está registrado.")
+            return obtener_backend().leer("docentes")
 
-        for row in ws.iter_rows(min_row=2):
-            if row[0].value == datos[0]:
-                for i, cell in enumerate(row):
-                    if i < len(datos):
-                        cell.value = datos[i]
-                break
+        ejecutor.ejecutar(guardar, estado=lbl_estado, mensaje="Guardando cambios...", al_terminar=mostrar_guardado,
+                          al_fallar=lambda e: messagebox.showerror("Error", str(e)))
 
-        wb.save(archivo_docentes)
-        actualizar_lista(tree)
+    def importar_docentes():
+        """Agrega los docentes de un archivo CSV o Excel."""
+        importar_desde_archivo(root, ejecutor, "docentes", lbl_estado, cargar_docentes)
 
-        for entry in entries:
-            entry.delete(0, tk.END)
+    def cargar_docentes():
+        ejecutor.ejecutar(obtener_backend().leer, "docentes", estado=lbl_estado, mensaje="Cargando docentes...",
+                          al_terminar=lambda filas: actualizar_lista(tree, filas))
 
     tk.Button(frame_form, text="Agregar Docente", command=agregar_docente, bg='#212121', fg='white').grid(row=len(labels)+1, columnspan=2, pady=10)
     tk.Button(frame_form, text="Editar Docente", command=editar_docente, bg='#212121', fg='white').grid(row=len(labels)+2, columnspan=2, pady=10)
+    tk.Button(frame_form, text="Importar desde Archivo", command=importar_docentes, bg='#212121', fg='white').grid(row=len(labels)+3, columnspan=2, pady=10)
 
     # Tabla de docentes
     columns = ["C.I.", "Nombre", "Especialidad", "Pago por Hora", "Celular"]
@@ -141,7 +151,11 @@ def abrir_lista_docentes(root_menu):
     
     tree.pack(pady=10, fill=tk.BOTH, expand=True)
 
-    actualizar_lista(tree)
+    lbl_estado = tk.Label(frame_table, text="", bg='#e0e0e0', font=('Arial', 10))
+    lbl_estado.pack(anchor="w")
+
+    ejecutor = obtener_ejecutor(root_menu)
+    cargar_docentes()
 
     # Botón para volver al menú
     tk.Button(root, text="Volver al Menú", command=lambda: volver_al_menu(root, root_menu), 
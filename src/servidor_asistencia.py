@@ -0,0 +1,183 @@
+"""Servidor HTTP de asistencia para que varios kioscos registren contra un mismo almacén.
+
+Los pedidos se atienden con asyncio y todos los registros pasan por una cola con un único escritor,
+que los aplica en lote sobre AlmacenAsistencia (diario + guardado agrupado en segundo plano).
+
+Uso: python servidor_asistencia.py --host 0.0.0.0 --puerto 8765
+Por defecto escucha solo en 127.0.0.1: el servidor no pide autenticación, así que exponerlo a la red
+(--host 0.0.0.0) debe hacerse solo en una red de confianza.
+En cada kiosco: ECOS_SERVIDOR=http://<servidor>:8765 python main.py
+
+Rutas (las respuestas son JSON):
+    POST /scan      {"ci": ...}  entrada o salida según corresponda
+    POST /entrada   {"ci": ...}
+    POST /salida    {"ci": ...}
+    GET  /hoy                                  registros de hoy
+    GET  /asistencia?desde=AAAA-MM-DD&hasta=AAAA-MM-DD
+    GET  /asistencia/<índice>
+"""
+import argparse
+import asyncio
+import json
+from datetime import datetime
+from urllib.parse import urlsplit, parse_qs
+from almacenamiento import texto
+from almacen_asistencia import obtener_almacen
+from indice_docentes import obtener_indice, normalizar_ci
+
+PUERTO = 8765
+MOTIVOS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 409: "Conflict",
+           500: "Internal Server Error"}
+
+def fila_json(fila):
+    """Convierte una fila de asistencia a texto para enviarla como JSON."""
+    return [texto(valor) for valor in fila]
+
+class ServidorAsistencia:
+    """Atiende los pedidos HTTP y serializa los registros en una sola cola de escritura."""
+
+    def __init__(self, almacen=None):
+        self.almacen = almacen or obtener_almacen()
+        self.cola = None  # Se crea dentro del bucle de asyncio
+
+    async def iniciar(self, host, puerto):
+        self.cola = asyncio.Queue()
+        asyncio.get_running_loop().create_task(self._escritor())
+        servidor = await asyncio.start_server(self._atender, host, puerto)
+        print(f"Servidor de asistencia escuchando en {host}:{puerto}")
+        async with servidor:
+            await servidor.serve_forever()
+
+    async def _escritor(self):
+        """Único escritor: junta los registros que esperan en la cola y los aplica de una vez fuera del bucle."""
+        while True:
+            lote = [await self.cola.get()]
+            while not self.cola.empty():
+                lote.append(self.cola.get_nowait())
+            try:
+                resultados = await asyncio.to_thread(self._aplicar_lote, [(tipo, ci) for tipo, ci, _ in lote])
+            except Exception as e:
+                # El escritor no debe terminar nunca: si falla el lote, se responde con error a cada pedido
+                print(f"Error al aplicar un lote de registros: {e}")
+                resultados = [(500, {"error": str(e)})] * len(lote)
+            for (_, _, futuro), resultado in zip(lote, resultados):
+                if not futuro.done():
+                    futuro.set_result(resultado)
+
+    def _aplicar_lote(self, registros):
+        """Aplica en orden cada registro del lote y devuelve (estado HTTP, respuesta) de cada uno."""
+        return [self._aplicar(tipo, ci) for tipo, ci in registros]
+
+    def _aplicar(self, tipo, ci):
+        try:
+            # El índice se vuelve a leer solo si cambió el archivo de docentes (por ejemplo, un docente recién
+            # agregado); si el archivo está bloqueado, el error se responde solo a este pedido
+            ci = normalizar_ci(ci)
+            nombre = obtener_indice().nombre(ci)
+            if nombre is None:
+                return 404, {"error": "El C.I. ingresado no corresponde a ningún docente."}
+            if tipo == "scan":
+                tipo, indice = self.almacen.registrar(ci, nombre)
+            elif tipo == "entrada":
+                if self.almacen.entrada_abierta(ci) is not None:
+                    return 409, {"error": "El docente ya tiene una entrada abierta hoy."}
+                indice = self.almacen.registrar_entrada(ci, nombre)
+            else:
+                indice = self.almacen.registrar_salida(ci)
+                if indice is None:
+                    return 409, {"error": "El docente no tiene una entrada abierta hoy."}
+            fila = fila_json(self.almacen.obtener_fila(indice))
+        except Exception as e:
+            print(f"Error al registrar {tipo} de {ci}: {e}")
+            return 500, {"error": str(e)}
+        print(f"Hora de {tipo} registrada para {ci} - {nombre}")
+        return 200, {"tipo": tipo, "indice": indice, "fila": fila}
+
+    async def _registrar(self, tipo, cuerpo):
+        try:
+            ci = str(json.loads(cuerpo or b"{}")["ci"]).strip()
+        except (ValueError, KeyError, TypeError):
+            return 400, {"error": "Se esperaba un JSON con el campo ci."}
+        if not ci:
+            return 400, {"error": "El campo C.I. es obligatorio."}
+        futuro = asyncio.get_running_loop().create_future()
+        await self.cola.put((tipo, ci, futuro))
+        return await futuro
+
+    async def _listar(self, desde, hasta):
+        # filas_entre recorre todo el almacén y puede leer el archivo histórico: se hace fuera del bucle
+        filas = await asyncio.to_thread(self.almacen.filas_entre, desde, hasta)
+        return 200, {"filas": [{"indice": indice, "fila": fila_json(fila)} for indice, fila in filas]}
+
+    async def _obtener(self, indice):
+        try:
+            fila = await asyncio.to_thread(self.almacen.obtener_fila, indice)
+        except IndexError:
+            return 404, {"error": "No existe ese registro."}
+        return 200, {"indice": indice, "fila": fila_json(fila)}
+
+    async def _despachar(self, metodo, ruta, cuerpo):
+        """Elige la acción según el método y la ruta del pedido."""
+        url = urlsplit(ruta)
+        partes = [parte for parte in url.path.split("/") if parte]
+        hoy = datetime.now().strftime("%Y-%m-%d")
+
+        if len(partes) == 1 and partes[0] in ("scan", "entrada", "salida"):
+            if metodo != "POST":
+                return 405, {"error": "Use POST."}
+            return await self._registrar(partes[0], cuerpo)
+        if metodo != "GET":
+            return (405, {"error": "Use GET."}) if partes in (["hoy"], ["asistencia"]) else (404, {"error": "Ruta desconocida."})
+        if partes == ["hoy"]:
+            return await self._listar(hoy, hoy)
+        if partes == ["asistencia"]:
+            consulta = parse_qs(url.query)
+            return await self._listar(consulta.get("desde", [hoy])[0], consulta.get("hasta", [hoy])[0])
+        if len(partes) == 2 and partes[0] == "asistencia" and partes[1].isdigit():
+            return await self._obtener(int(partes[1]))
+        return 404, {"error": "Ruta desconocida."}
+
+    async def _atender(self, lector, escritor):
+        """Lee pedidos HTTP/1.1 de una conexión (con keep-alive) y responde cada uno."""
+        try:
+            while True:
+                linea = await lector.readline()
+                if not linea.strip():
+                    break
+                metodo, ruta, _ = linea.decode("latin-1").split(" ", 2)
+                encabezados = {}
+                while True:
+                    encabezado = await lector.readline()
+                    if encabezado in (b"\r\n", b"\n", b""):
+                        break
+                    nombre, _, valor = encabezado.decode("latin-1").partition(":")
+                    encabezados[nombre.strip().lower()] = valor.strip()
+                cuerpo = await lector.readexactly(int(encabezados.get("content-length") or 0))
+
+                estado, respuesta = await self._despachar(metodo.upper(), ruta, cuerpo)
+                datos = json.dumps(respuesta, ensure_ascii=False).encode("utf-8")
+                cerrar = encabezados.get("connection", "").lower() == "close"
+                cabecera = (f"HTTP/1.1 {estado} {MOTIVOS[estado]}\r\n"
+                            "Content-Type: application/json; charset=utf-8\r\n"
+                            f"Content-Length: {len(datos)}\r\n")
+                if cerrar:
+                    cabecera += "Connection: close\r\n"
+                escritor.write(cabecera.encode("latin-1") + b"\r\n" + datos)
+                await escritor.drain()
+                if cerrar:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            escritor.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servidor HTTP de registro de asistencia.")
+    parser.add_argument("--host", default="127.0.0.1",
+                        help="Dirección donde escuchar; use 0.0.0.0 para aceptar kioscos de otras PCs")
+    parser.add_argument("--puerto", type=int, default=PUERTO)
+    args = parser.parse_args()
+    try:
+        asyncio.run(ServidorAsistencia().iniciar(args.host, args.puerto))
+    except KeyboardInterrupt:
+        print("Servidor detenido.")
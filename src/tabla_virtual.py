@@ -0,0 +1,134 @@
+import tkinter as tk
+from tkinter import ttk
+
+TAMANO_PAGINA = 200  # Filas que se crean en el Treeview de una vez
+
+class TablaVirtual:
+    """Treeview que guarda todas las filas en una lista y solo crea los ítems de la parte visible.
+    Al llegar al final del scroll carga la siguiente porción, y permite agregar, modificar o quitar
+    una sola fila sin reconstruir toda la tabla. Cada fila se identifica con una clave entera."""
+
+    def __init__(self, parent, columnas, ancho=110, alto=10, tamano_pagina=TAMANO_PAGINA):
+        self.tamano_pagina = tamano_pagina
+        self.filas = []  # [clave, valores, tag]
+        self.posiciones = {}  # clave -> posición en self.filas
+        self.inicio = 0  # Primera fila creada en el Treeview
+        self.fin = 0  # Posición siguiente a la última fila creada
+        self._siguiente_clave = 0
+
+        self.frame = tk.Frame(parent, bg='#e0e0e0')
+        self.frame.pack(pady=10, fill=tk.BOTH, expand=True)
+
+        frame_tabla = tk.Frame(self.frame, bg='#e0e0e0')
+        frame_tabla.pack(fill=tk.BOTH, expand=True)
+        self.tree = ttk.Treeview(frame_tabla, columns=columnas, show="headings", height=alto)
+        for col in columnas:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=ancho, anchor="center")
+        self.scroll = ttk.Scrollbar(frame_tabla, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self._al_desplazar)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scroll.pack(side=tk.RIGHT, fill=tk.Y)
+
+        # Controles de paginación
+        frame_paginas = tk.Frame(self.frame, bg='#e0e0e0')
+        frame_paginas.pack(fill=tk.X)
+        tk.Button(frame_paginas, text="<< Anterior", command=self.pagina_anterior, bg='#212121', fg='white').pack(side=tk.LEFT, padx=5)
+        tk.Button(frame_paginas, text="Siguiente >>", command=self.pagina_siguiente, bg='#212121', fg='white').pack(side=tk.LEFT, padx=5)
+        self.lbl_paginas = tk.Label(frame_paginas, text="", bg='#e0e0e0', font=('Arial', 10))
+        self.lbl_paginas.pack(side=tk.LEFT, padx=10)
+
+    def cargar(self, filas, etiquetas=None, claves=None, mostrar_final=False):
+        """Reemplaza todas las filas de la tabla y muestra la primera página (o la última si se pide)."""
+        etiquetas = etiquetas or [''] * len(filas)
+        if claves is None:
+            claves = range(self._siguiente_clave, self._siguiente_clave + len(filas))
+        self.filas = [[clave, list(valores), tag] for clave, valores, tag in zip(claves, filas, etiquetas)]
+        self._reindexar()
+        self.mostrar_pagina(max(0, len(self.filas) - self.tamano_pagina) if mostrar_final else 0)
+
+    def mostrar_pagina(self, inicio):
+        """Crea en el Treeview solo las filas de la página que empieza en la posición dada."""
+        self.tree.delete(*self.tree.get_children())
+        self.inicio = max(0, min(inicio, len(self.filas)))
+        self.fin = self.inicio
+        self._materializar(min(len(self.filas), self.inicio + self.tamano_pagina))
+
+    def pagina_anterior(self):
+        """Muestra la página anterior."""
+        self.mostrar_pagina(self.inicio - self.tamano_pagina)
+
+    def pagina_siguiente(self):
+        """Muestra la página siguiente si existe."""
+        if self.inicio + self.tamano_pagina < len(self.filas):
+            self.mostrar_pagina(self.inicio + self.tamano_pagina)
+
+    def agregar_fila(self, valores, tag='', clave=None):
+        """Agrega una fila al final; solo se crea el ítem si la página visible llega hasta el final."""
+        if clave is None:
+            clave = self._siguiente_clave
+        self._siguiente_clave = max(self._siguiente_clave, clave + 1)
+        mostrada_hasta_el_final = self.fin == len(self.filas)
+        self.posiciones[clave] = len(self.filas)
+        self.filas.append([clave, list(valores), tag])
+        if mostrada_hasta_el_final:
+            self._materializar(len(self.filas))
+            self.tree.see(str(clave))
+        else:
+            self._actualizar_etiqueta()
+        return clave
+
+    def actualizar_fila(self, clave, valores, tag=''):
+        """Modifica los valores de una fila; si está visible solo se actualiza ese ítem."""
+        posicion = self.posiciones.get(clave)
+        if posicion is None:
+            return
+        self.filas[posicion][1:] = [list(valores), tag]
+        if self.tree.exists(str(clave)):
+            self.tree.item(str(clave), values=valores, tags=(tag,))
+
+    def eliminar_fila(self, clave):
+        """Quita una fila de la tabla y, si estaba visible, solo su ítem."""
+        posicion = self.posiciones.pop(clave, None)
+        if posicion is None:
+            return
+        del self.filas[posicion]
+        self._reindexar()
+        if self.tree.exists(str(clave)):
+            self.tree.delete(str(clave))
+        if posicion < self.fin:
+            self.fin -= 1
+        if posicion < self.inicio:
+            self.inicio -= 1
+        self._actualizar_etiqueta()
+
+    def clave_seleccionada(self):
+        """Devuelve la clave de la fila seleccionada o None."""
+        seleccion = self.tree.selection()
+        if not seleccion:
+            return None
+        return int(seleccion[0])
+
+    def _materializar(self, hasta):
+        """Crea los ítems entre self.fin y la posición indicada."""
+        for clave, valores, tag in self.filas[self.fin:hasta]:
+            self.tree.insert("", "end", iid=str(clave), values=valores, tags=(tag,))
+        self.fin = max(self.fin, hasta)
+        self._actualizar_etiqueta()
+
+    def _al_desplazar(self, primero, ultimo):
+        """Al llegar al final del scroll se crea la siguiente porción de filas."""
+        self.scroll.set(primero, ultimo)
+        if float(ultimo) >= 1.0 and self.fin < len(self.filas):
+            self.tree.after_idle(lambda: self._materializar(min(len(self.filas), self.fin + self.tamano_pagina)))
+
+    def _reindexar(self):
+        """Recalcula la posición de cada clave después de cargar o quitar filas."""
+        self.posiciones = {fila[0]: posicion for posicion, fila in enumerate(self.filas)}
+        self._siguiente_clave = max(self.posiciones, default=-1) + 1
+
+    def _actualizar_etiqueta(self):
+        """Muestra qué filas están cargadas en el Treeview."""
+        total = len(self.filas)
+        desde = self.inicio + 1 if total else 0
+        self.lbl_paginas.config(text=f"Filas {desde}-{self.fin} de {total}")
@@ -0,0 +1,91 @@
+import queue
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import messagebox
+
+INTERVALO_REVISION = 50  # Milisegundos entre cada revisión de la cola de resultados
+
+class EjecutorTareas:
+    """Ejecuta la lectura y escritura de archivos en hilos de fondo para que la ventana no se congele.
+    Los resultados se entregan en el hilo de Tk revisando una cola con root.after, y las escrituras
+    sobre un mismo archivo se hacen de a una."""
+
+    def __init__(self, root, hilos=4):
+        self.root = root
+        self.pool = ThreadPoolExecutor(max_workers=hilos, thread_name_prefix="tarea")
+        self.resultados = queue.Queue()
+        self.bloqueos = {}  # archivo -> Lock para serializar las escrituras
+        self._lock = threading.Lock()
+        self.pendientes = 0
+        self.root.after(INTERVALO_REVISION, self._revisar_resultados)
+
+    def ejecutar(self, funcion, *args, al_terminar=None, al_fallar=None, archivo=None, estado=None,
+                 mensaje="Procesando...", con_progreso=False):
+        """Ejecuta funcion(*args) en segundo plano.
+
+        al_terminar(resultado) y al_fallar(error) se llaman en el hilo de Tk. Si se indica archivo,
+        la tarea espera a que terminen las demás escrituras sobre ese archivo. estado es un Label donde
+        se muestra el mensaje mientras la tarea corre; con con_progreso la función recibe un argumento
+        progreso(texto) para ir actualizándolo."""
+        self.pendientes += 1
+        if estado is not None:
+            estado.config(text=mensaje)
+        kwargs = {}
+        if con_progreso:
+            kwargs["progreso"] = lambda texto: self.resultados.put(("progreso", estado, texto))
+
+        def tarea():
+            try:
+                if archivo is not None:
+                    with self._bloqueo(archivo):
+                        resultado = funcion(*args, **kwargs)
+                else:
+                    resultado = funcion(*args, **kwargs)
+                self.resultados.put(("ok", (al_terminar, estado), resultado))
+            except Exception as e:
+                traceback.print_exc()
+                self.resultados.put(("error", (al_fallar, estado), e))
+
+        return self.pool.submit(tarea)
+
+    def _bloqueo(self, archivo):
+        with self._lock:
+            return self.bloqueos.setdefault(archivo, threading.Lock())
+
+    def _revisar_resultados(self):
+        """Entrega en el hilo de Tk los resultados de las tareas terminadas."""
+        while True:
+            try:
+                tipo, destino, valor = self.resultados.get_nowait()
+            except queue.Empty:
+                break
+            if tipo == "progreso":
+                if destino is not None and destino.winfo_exists():
+                    destino.config(text=valor)
+                continue
+
+            self.pendientes -= 1
+            funcion, estado = destino
+            if estado is not None and estado.winfo_exists():
+                estado.config(text="")
+            try:
+                if tipo == "ok" and funcion is not None:
+                    funcion(valor)
+                elif tipo == "error":
+                    if funcion is not None:
+                        funcion(valor)
+                    else:
+                        messagebox.showerror("Error", f"No se pudo completar la operación: {valor}")
+            except Exception:
+                traceback.print_exc()
+        self.root.after(INTERVALO_REVISION, self._revisar_resultados)
+
+_ejecutor = None
+
+def obtener_ejecutor(root):
+    """Devuelve el ejecutor compartido; se crea sobre la ventana principal, que vive toda la sesión."""
+    global _ejecutor
+    if _ejecutor is None:
+        _ejecutor = EjecutorTareas(root)
+    return _ejecutor
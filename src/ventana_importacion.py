@@ -0,0 +1,35 @@
+from tkinter import filedialog, messagebox
+from importacion import importar, describir_errores
+
+def importar_desde_archivo(ventana, ejecutor, tabla, estado, al_importar):
+    """Pide un archivo CSV o Excel, lo valida en segundo plano, muestra todos los errores juntos y, si se
+    confirma, guarda las filas válidas con una sola escritura. al_importar() se llama después de guardar."""
+    ruta = filedialog.askopenfilename(parent=ventana, title=f"Importar {tabla}",
+                                      filetypes=[("CSV o Excel", "*.csv *.xlsx"), ("Todos los archivos", "*.*")])
+    if not ruta:
+        return
+
+    def confirmar(resultado):
+        aceptadas, errores = resultado
+        if not aceptadas:
+            messagebox.showerror("Importar", "No hay filas válidas para importar.\n\n" + describir_errores(errores),
+                                 parent=ventana)
+            return
+        mensaje = f"Se importarán {len(aceptadas)} filas."
+        if errores:
+            mensaje += f"\nSe omitirán {len(errores)} filas con errores:\n\n" + describir_errores(errores)
+        if not messagebox.askyesno("Importar", mensaje + "\n\n¿Desea continuar?", parent=ventana):
+            return
+        # Se vuelve a validar al guardar por si los datos cambiaron mientras se confirmaba
+        ejecutor.ejecutar(importar, tabla, ruta, estado=estado, mensaje="Importando...",
+                          al_terminar=terminar,
+                          al_fallar=lambda e: messagebox.showerror("Importar", str(e), parent=ventana))
+
+    def terminar(resultado):
+        aceptadas, _ = resultado
+        messagebox.showinfo("Importar", f"Se importaron {len(aceptadas)} filas.", parent=ventana)
+        al_importar()
+
+    ejecutor.ejecutar(importar, tabla, ruta, False, estado=estado, mensaje="Validando archivo...",
+                      al_terminar=confirmar,
+                      al_fallar=lambda e: messagebox.showerror("Importar", f"No se pudo leer el archivo: {e}", parent=ventana))